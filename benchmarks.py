@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+MP3 Album Tool - Benchmarks
+Runs against a synthetic corpus: python benchmarks.py <name> [--files N] [--names N]
+"""
+
+import argparse
+import io
+import os
+import random
+import re
+import shutil
+import tempfile
+import time
+
+from mutagen.id3 import ID3, APIC, TALB, TCON, TIT2, TPE1, TRCK
+from mutagen.mp3 import MP3
+from PIL import Image
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz)
+MPEG_FRAME = b'\xff\xfb\x90\x00' + b'\x00' * 413
+
+
+def make_corpus(folder, count, frames=600, cover_size=500):
+    """Create count tagged MP3 files in album folders of 10 tracks"""
+    paths = []
+    for n in range(count):
+        album = f"Album {n // 10:04d}"
+        album_dir = os.path.join(folder, album)
+        os.makedirs(album_dir, exist_ok=True)
+        path = os.path.join(album_dir, f"{n % 10 + 1:02d} Artist {n // 10} - Song {n} (Official Video).mp3")
+        with open(path, 'wb') as f:
+            f.write(MPEG_FRAME * frames)
+
+        tags = ID3()
+        tags.add(TPE1(encoding=3, text=[f"Artist {n // 10}"]))
+        tags.add(TIT2(encoding=3, text=[f"Song {n}"]))
+        tags.add(TALB(encoding=3, text=[album]))
+        tags.add(TRCK(encoding=3, text=[str(n % 10 + 1)]))
+        tags.add(TCON(encoding=3, text=["Pop"]))
+        if n % 3:
+            cover = io.BytesIO()
+            Image.new('RGB', (cover_size, cover_size), (n % 255, 80, 160)).save(cover, 'JPEG', quality=90)
+            tags.add(APIC(encoding=3, mime='image/jpeg', type=3, desc='Front cover', data=cover.getvalue()))
+        # Mix of ID3v2.3 (what the tool writes) and v2.4 files
+        tags.save(path, v2_version=4 if n % 4 == 0 else 3)
+        paths.append(path)
+    return paths
+
+
+def timed(label, func, paths, baseline=None):
+    """Run func over every path and print files/s (and speedup vs baseline)"""
+    start = time.perf_counter()
+    for path in paths:
+        func(path)
+    elapsed = time.perf_counter() - start
+    line = f"  {label:<28} {elapsed:8.3f}s  {len(paths) / elapsed:10.0f} files/s"
+    if baseline:
+        line += f"  x{baseline / elapsed:.2f}"
+    print(line)
+    return elapsed
+
+
+def legacy_two_pass(path):
+    """What loading did before single-pass ingest: tags, then covers"""
+    audio = MP3(path, ID3=ID3)
+    if audio.tags:
+        audio.tags.get('TPE1')
+        audio.tags.get('TIT2')
+    audio = MP3(path, ID3=ID3)
+    if audio.tags:
+        for frame in audio.tags.values():
+            if isinstance(frame, APIC):
+                return frame.data
+    return None
+
+
+def bench_ingest(paths):
+    from track_reader import read_track_info
+
+    print("Load-time parsing (tags + embedded cover)")
+    baseline = timed("two MP3() parses per file", legacy_two_pass, paths)
+    timed("read_track_info", read_track_info, paths, baseline)
+
+
+def legacy_extract_existing_metadata(path):
+    """extract_existing_metadata before the header-only reader"""
+    try:
+        audio = MP3(path, ID3=ID3)
+        if audio.tags:
+            artist = audio.tags.get('TPE1', [''])[0] if 'TPE1' in audio.tags else ''
+            title = audio.tags.get('TIT2', [''])[0] if 'TIT2' in audio.tags else ''
+            return artist, title
+    except Exception:
+        pass
+    return None, None
+
+
+def bench_id3(paths):
+    from id3_reader import read_id3_fast
+    from track_reader import read_track_info_full
+
+    mismatches = 0
+    for path in paths:
+        fast = read_id3_fast(path)
+        full = read_track_info_full(path)
+        fields = ('artist', 'title', 'album', 'track', 'cover_hash', 'cover_mime')
+        if any(fast[field] != full[field] for field in fields):
+            mismatches += 1
+    print(f"Header-only ID3 reader ({mismatches} mismatches vs mutagen)")
+    baseline = timed("extract_existing_metadata", legacy_extract_existing_metadata, paths)
+    timed("read_id3_fast", read_id3_fast, paths, baseline)
+
+
+def legacy_clean_filename(filename):
+    """MP3Engine.clean_filename before filename_cleaner (without the log line)"""
+    # Remover números no início
+    filename = re.sub(r'^\d+\.?\s*', '', filename)
+    
+    # Remover padrões comuns
+    patterns_to_remove = [
+        r'\s*\(?DVD\)?.*',
+        r'\s*\(?DIREITOS\s*AUTORAIS\)?.*',
+        # Variações de "Video Oficial"
+        r'\s*\(?VIDEO\s*OFICIAL\)?.*',
+        r'\s*\(?OFICIAL\s*VIDEO\)?.*',
+        r'\s*\(?OFFICIAL\s*VIDEO\)?.*',
+        r'\s*\(?VIDEO\s*OFFICIAL\)?.*',
+        r'\s*\(?CLIPE\s*OFICIAL\)?.*',
+        r'\s*\(?OFICIAL\s*CLIPE\)?.*',
+        r'\s*\(?VIDEO\s*CLIPE\)?.*',
+        r'\s*\(?CLIPE\s*VIDEO\)?.*',
+        r'\s*\(?VIDEOCLIP\)?.*',
+        r'\s*\(?VIDEO\s*CLIP\)?.*',
+        r'\s*\(?CLIP\s*VIDEO\)?.*',
+        # Outras variações de vídeo
+        r'\s*\(?LYRIC\s*VIDEO\)?.*',
+        r'\s*\(?VIDEO\s*LYRIC\)?.*',
+        r'\s*\(?LYRICS\s*VIDEO\)?.*',
+        r'\s*\(?VIDEO\s*LYRICS\)?.*',
+        r'\s*\(?MUSIC\s*VIDEO\)?.*',
+        r'\s*\(?VIDEO\s*MUSIC\)?.*',
+        r'\s*\(?OFFICIAL\s*AUDIO\)?.*',
+        r'\s*\(?AUDIO\s*OFICIAL\)?.*',
+        r'\s*\(?LYRICS?\)?.*',
+        r'\s*\(?LETRA\)?.*',
+        # Qualidade e formato
+        r'\s*\(?MV\)?.*',
+        r'\s*\(?HD\)?.*',
+        r'\s*\(?FULL\s*HD\)?.*',
+        r'\s*\(?4K\)?.*',
+        r'\s*\(?1080P\)?.*',
+        r'\s*\(?720P\)?.*',
+        r'\s*\(?480P\)?.*',
+        # Tipos de performance
+        r'\s*\(?LIVE\)?.*',
+        r'\s*\(?AO\s*VIVO\)?.*',
+        r'\s*\(?COVER\)?.*',
+        r'\s*\(?REMIX\)?.*',
+        r'\s*\(?VERSION\)?.*',
+        r'\s*\(?VERSAO\)?.*',
+        r'\s*\(?VERSÃO\)?.*',
+        r'\s*\(?EXPLICIT\)?.*',
+        r'\s*\(?CLEAN\)?.*',
+        r'\s*\(?ACOUSTIC\)?.*',
+        r'\s*\(?ACUSTICO\)?.*',
+        r'\s*\(?ACÚSTICO\)?.*',
+        r'\s*\(?INSTRUMENTAL\)?.*',
+        r'\s*\(?KARAOKE\)?.*',
+        r'\s*\(?RADIO\s*EDIT\)?.*',
+        r'\s*\(?EXTENDED\)?.*',
+        r'\s*\(?REMASTERED\)?.*',
+        r'\s*\(?REMASTERIZADO\)?.*',
+        r'\s*\(?DELUXE\)?.*',
+        r'\s*\(?BONUS\s*TRACK\)?.*',
+        r'\s*\(?FAIXA\s*BONUS\)?.*',
+        # Símbolos e caracteres especiais
+        r'\s*\[.*\]',  # Qualquer coisa entre colchetes
+        r'\s*\(.*\)',  # Qualquer coisa entre parênteses
+        r'\s*\{.*\}',  # Qualquer coisa entre chaves
+        r'\s*_+\s*',   # Múltiplos underscores
+        r'\s*-+\s*$',  # Hífens no final
+        r'\s*\|.*',    # Pipe e tudo depois
+        r'\s*#.*'      # Hashtag e tudo depois
+    ]
+    
+    for pattern in patterns_to_remove:
+        filename = re.sub(pattern, '', filename, flags=re.IGNORECASE)
+    
+    # Limpeza adicional para casos com underscores e separadores
+    # Remover palavras problemáticas que podem estar separadas por underscores
+    problematic_words = [
+        'video', 'oficial', 'official', 'clipe', 'clip', 'videoclip',
+        'lyric', 'lyrics', 'letra', 'music', 'audio', 'mv', 'hd', 'fullhd',
+        '4k', '1080p', '720p', '480p', 'live', 'aovivo', 'cover', 'remix',
+        'version', 'versao', 'versão', 'explicit', 'clean', 'acoustic',
+        'acustico', 'acústico', 'instrumental', 'karaoke', 'radioedit',
+        'extended', 'remastered', 'remasterizado', 'deluxe', 'bonus',
+        'bonustrack', 'faixabonus'
+    ]
+    
+    # Remover palavras problemáticas separadas por underscores ou hífens
+    for word in problematic_words:
+        # Padrões com underscores
+        filename = re.sub(rf'_{word}_?', '_', filename, flags=re.IGNORECASE)
+        filename = re.sub(rf'_{word}$', '', filename, flags=re.IGNORECASE)
+        filename = re.sub(rf'^{word}_', '', filename, flags=re.IGNORECASE)
+        # Padrões com hífens
+        filename = re.sub(rf'-{word}-?', '-', filename, flags=re.IGNORECASE)
+        filename = re.sub(rf'-{word}$', '', filename, flags=re.IGNORECASE)
+        filename = re.sub(rf'^{word}-', '', filename, flags=re.IGNORECASE)
+        # Padrões com espaços
+        filename = re.sub(rf'\s+{word}\s+', ' ', filename, flags=re.IGNORECASE)
+        filename = re.sub(rf'\s+{word}$', '', filename, flags=re.IGNORECASE)
+        filename = re.sub(rf'^{word}\s+', '', filename, flags=re.IGNORECASE)
+    
+    # Limpar múltiplos separadores consecutivos
+    filename = re.sub(r'_+', '_', filename)  # Múltiplos underscores
+    filename = re.sub(r'-+', '-', filename)  # Múltiplos hífens
+    filename = re.sub(r'\s+', ' ', filename)  # Múltiplos espaços
+    
+    # Remover separadores no início e fim
+    filename = filename.strip('_-. ')
+    
+    return filename.strip()
+
+
+NAME_PREFIXES = ["", "", "01 ", "1. ", "07. ", "003-", "12_", "2024 "]
+NAME_ARTISTS = ["Queen", "Anitta", "Zé Neto & Cristiano", "MC Livinho", "Olivia Rodrigo",
+                "Shadow Hunters", "Discovery Band", "AC/DC", "İlkay Şencan", "Clean Bandit",
+                "Audioslave", "Jorge & Mateus", "Coverdale", "The Music", "Bonus Boys"]
+NAME_SEPARATORS = [" - ", "_-_", "-", " – ", "_", "  -  ", " | ", "\t-\t"]
+NAME_TITLES = ["Bohemian Rhapsody", "Envolver", "Largado às Traças", "Oliver's Army",
+               "Hardcore Love", "Versão Brasileira", "mv_intro", "Deluxe Life", "Lyrical",
+               "HDMI Blues", "Video Killed the Radio Star", "Clip Art", "Faixa 1",
+               "Ao Vivo e a Cores", "Remixed Feelings", "Música Boa", "Acústico Total"]
+NAME_TAGS = ["", "", "", " (Official Video)", " [HD]", "_videoclip_", "-lyrics", " ao vivo",
+             " | Canal Oficial", " #shorts", " {Live}", " (Versão Acústica)", " feat. Someone",
+             "_official_audio", " - Video Oficial", " (Clipe Oficial) [4K]", "-video-",
+             " (Remastered 2011)", " [1080p]", " Letra", "_bonus", " audio", " (DVD)",
+             "__oficial__", " - ", " (Karaoke Version)", " MV", " (Radio Edit)", "_music_"]
+
+
+def make_names(count, seed=1):
+    """Synthetic file names (no extension) mixing the tags clean_filename removes"""
+    rng = random.Random(seed)
+    return [rng.choice(NAME_PREFIXES) + rng.choice(NAME_ARTISTS) + rng.choice(NAME_SEPARATORS)
+            + rng.choice(NAME_TITLES) + rng.choice(NAME_TAGS) + rng.choice(NAME_TAGS)
+            for _ in range(count)]
+
+
+def bench_clean(names):
+    from filename_cleaner import clean_filename
+
+    mismatches = sum(legacy_clean_filename(name) != clean_filename(name) for name in names)
+    print(f"Filename cleaning ({mismatches} mismatches vs the original rules)")
+    baseline = timed("re.sub per rule", legacy_clean_filename, names)
+    timed("filename_cleaner", clean_filename, names, baseline)
+
+
+def bench_normalize(names):
+    import text_normalizer
+
+    def uncached(name):
+        # Every derived field, without memoization
+        clean = text_normalizer.clean_filename.__wrapped__(name)
+        artist, title = text_normalizer.extract_artist_title.__wrapped__(clean)
+        if artist and title:
+            capitalize = text_normalizer.smart_capitalize.__wrapped__
+            new = f"{capitalize(artist)} - {capitalize(title)}"
+        else:
+            new = clean
+        text_normalizer.sanitize_filename.__wrapped__(new)
+
+    def batch(label, baseline=None):
+        start = time.perf_counter()
+        text_normalizer.normalize_names(names)
+        elapsed = time.perf_counter() - start
+        line = f"  {label:<28} {elapsed:8.3f}s  {len(names) / elapsed:10.0f} names/s"
+        if baseline:
+            line += f"  x{baseline / elapsed:.2f}"
+        print(line)
+
+    print(f"Name normalization ({len(set(names))} distinct of {len(names)} names)")
+    baseline = timed("one call per field", uncached, names)
+    text_normalizer.clear_caches()
+    batch("normalize_names (cold)", baseline)
+    batch("normalize_names (re-clean)", baseline)
+    for name, stats in text_normalizer.cache_stats().items():
+        if stats['hits'] + stats['misses']:
+            print(f"    {name:<14} {100 * stats['hit_rate']:5.1f}% hits ({stats['size']} cached)")
+
+
+def bytes_written():
+    """Bytes this process passed to write() so far (Linux), or None"""
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('wchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+SAVE_REMOVED_FRAMES = ['TPE3', 'TPE4', 'TCOM', 'TCON', 'TPOS', 'TPUB', 'TCOP', 'TENC', 'TSSE', 'TLAN', 'TIPL', 'TMCL']
+
+
+def legacy_save(path, dest, image):
+    """File writes of save_file before the single-write path (copy, tags, recheck, cover, verify)"""
+    if dest:
+        target = os.path.join(dest, os.path.basename(path))
+        shutil.copy2(path, target)
+        path = target
+    tags = ID3(path)
+    for frame in SAVE_REMOVED_FRAMES:
+        tags.delall(frame)
+    tags.add(TPE1(encoding=1, text=["Artist"]))
+    tags.add(TIT2(encoding=1, text=["Title"]))
+    tags.add(TALB(encoding=1, text=["Album"]))
+    tags.save(path, v2_version=3)
+    final_tags = ID3(path)
+    if any(frame in final_tags for frame in SAVE_REMOVED_FRAMES):
+        final_tags.save(path, v2_version=3)
+    encoded = io.BytesIO()
+    image.save(encoded, format='JPEG', quality=95, optimize=True)
+    cover = encoded.getvalue()
+    audio = MP3(path, ID3=ID3)
+    audio.tags.delall('APIC')
+    audio.tags.add(APIC(encoding=3, mime='image/jpeg', type=3, desc='Front cover', data=cover))
+    audio.save(v2_version=3)
+    MP3(path, ID3=ID3)
+
+
+def bench_save(paths):
+    from mp3_engine import MP3Engine
+
+    image = Image.effect_noise((1000, 1000), 64).convert('RGB')
+    engine = MP3Engine()
+    file_size = sum(os.path.getsize(path) for path in paths) / len(paths)
+
+    def single_write(path, dest):
+        file_data = engine.new_file_data(path)
+        file_data.update(artist="Artist", title="Title", album="Album", new=os.path.splitext(file_data['original'])[0])
+        file_data['cover'] = image.copy()
+        file_data['path_key'] = path
+        engine.save_file(file_data, dest)
+
+    print(f"Saving tags + a 1000x1000 cover ({file_size / 1024:.0f} KB per file)")
+    work = tempfile.mkdtemp(prefix='mp3tool_save_')
+    try:
+        for mode in ('copy to folder', 'in place'):
+            for label, save in (("legacy (up to 4 rewrites)", lambda p, d: legacy_save(p, d, image)),
+                                ("save_file (one write)", single_write)):
+                run = tempfile.mkdtemp(dir=work)
+                if mode == 'in place':
+                    sources = [shutil.copy2(path, os.path.join(run, f"{n}.mp3")) for n, path in enumerate(paths)]
+                    dest = None
+                else:
+                    sources, dest = paths, run
+                before = bytes_written()
+                start = time.perf_counter()
+                for path in sources:
+                    save(path, dest)
+                elapsed = time.perf_counter() - start
+                written = bytes_written()
+                per_track = f"{(written - before) / len(paths) / 1024:8.0f} KB written/track" if before is not None else "n/a"
+                print(f"  {mode + ', ' + label:<44} {elapsed:8.3f}s  {per_track}")
+                shutil.rmtree(run, ignore_errors=True)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def bench_retag(paths):
+    from mp3_engine import MP3Engine
+
+    engine = MP3Engine()
+    covers = [Image.effect_noise((1000, 1000), sigma).convert('RGB') for sigma in (48, 64)]
+    file_size = sum(os.path.getsize(path) for path in paths) / len(paths)
+
+    def save(path, title, cover):
+        file_data = engine.new_file_data(path)
+        file_data.update(artist="Artist", title=title, album="Album", new=os.path.splitext(file_data['original'])[0])
+        file_data['cover'] = cover.copy()
+        file_data['path_key'] = path
+        engine.save_file(file_data)
+
+    print(f"Saving tags twice in place, the 2nd time with a bigger cover ({file_size / 1024:.0f} KB per file)")
+    work = tempfile.mkdtemp(prefix='mp3tool_retag_')
+    try:
+        for label, padding in (("mutagen default padding", None), ("tag_padding 64 KB", 64)):
+            if padding is None:
+                engine.tag_padding_for = lambda info: info.get_default_padding()
+            else:
+                del engine.tag_padding_for
+                engine.tag_padding.set(padding)
+            run = tempfile.mkdtemp(dir=work)
+            sources = [shutil.copy2(path, os.path.join(run, f"{n}.mp3")) for n, path in enumerate(paths)]
+            for edit, (title, cover) in enumerate((("Title", covers[0]), ("Title (edited)", covers[1])), 1):
+                engine.reset_save_stats()
+                before = bytes_written()
+                start = time.perf_counter()
+                for path in sources:
+                    save(path, title, cover)
+                elapsed = time.perf_counter() - start
+                written = bytes_written()
+                per_track = f"{(written - before) / len(paths) / 1024:8.0f} KB written/track" if before is not None else "n/a"
+                stats = engine.save_stats
+                print(f"  {label + ', save #' + str(edit):<44} {elapsed:8.3f}s  {per_track}  "
+                      f"in place {stats['in_place']}, rewritten {stats['rewritten']}")
+            shutil.rmtree(run, ignore_errors=True)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def bench_parallel_save(paths):
+    from mp3_engine import MP3Engine
+
+    engine = MP3Engine()
+    image = Image.effect_noise((1000, 1000), 64).convert('RGB')
+    workers = sorted({1, 2, 4, os.cpu_count() or 1})
+    print(f"Saving {len(paths)} files with a cover into one folder ({os.cpu_count()} CPUs)")
+    work = tempfile.mkdtemp(prefix='mp3tool_parallel_')
+    try:
+        for count in workers:
+            engine.configure_save_workers({'local': count, 'removable': count, 'network': count})
+            files = []
+            for path in paths:
+                file_data = engine.new_file_data(path)
+                file_data.update(artist="Artist", title="Title", album="Album", new=os.path.splitext(file_data['original'])[0])
+                file_data['cover'] = image
+                file_data['path_key'] = engine.path_key(path)
+                files.append(file_data)
+            dest = tempfile.mkdtemp(dir=work)
+            start = time.perf_counter()
+            saved = engine.save_files(files, dest)
+            elapsed = time.perf_counter() - start
+            print(f"  {count:>2} worker(s): {elapsed:8.3f}s  {saved / elapsed:8.1f} files/s")
+            shutil.rmtree(dest, ignore_errors=True)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def bench_album_covers(paths):
+    from mp3_engine import MP3Engine
+
+    engine = MP3Engine()
+    tracks = paths[:20]
+    encoded = io.BytesIO()
+    Image.effect_noise((1400, 1400), 64).convert('RGB').save(encoded, format='JPEG', quality=90)
+    cover_bytes = encoded.getvalue()
+    shared = Image.open(io.BytesIO(cover_bytes))
+    shared.load()
+
+    def album(per_track_copies):
+        files = []
+        for path in tracks:
+            file_data = engine.new_file_data(path)
+            file_data.update(artist="Artist", title="Title", album="Album", new=os.path.splitext(file_data['original'])[0])
+            # Same picture downloaded per track (same pixels, different objects) or one shared object
+            file_data['cover'] = Image.open(io.BytesIO(cover_bytes)) if per_track_copies else shared
+            file_data['path_key'] = engine.path_key(path)
+            files.append(file_data)
+        return files
+
+    def per_track(files, dest):
+        for file_data in files:
+            engine.save_file(file_data, dest)
+
+    print(f"Saving a {len(tracks)}-track album with one 1400x1400 cover (CPU time)")
+    work = tempfile.mkdtemp(prefix='mp3tool_album_')
+    try:
+        for label, save, copies in (("encode per track", per_track, False),
+                                    ("save_files, shared cover object", engine.save_files, False),
+                                    ("save_files, same pixels per track", engine.save_files, True)):
+            files = album(copies)
+            dest = tempfile.mkdtemp(dir=work)
+            engine.reset_save_stats()
+            start = time.process_time()
+            save(files, dest)
+            elapsed = time.process_time() - start
+            stats = engine.save_stats
+            print(f"  {label:<36} {elapsed:8.3f}s CPU  encoded {stats['encoded']}, reused {stats['reused']}")
+            shutil.rmtree(dest, ignore_errors=True)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+BENCHMARKS = {
+    'ingest': bench_ingest,
+    'id3': bench_id3,
+    'clean': bench_clean,
+    'normalize': bench_normalize,
+    'save': bench_save,
+    'retag': bench_retag,
+    'parallel_save': bench_parallel_save,
+    'album_covers': bench_album_covers,
+}
+
+# These run over make_names() instead of MP3 files
+NAME_BENCHMARKS = {'clean', 'normalize'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MP3 Album Tool benchmarks")
+    parser.add_argument('name', choices=sorted(BENCHMARKS) + ['all'])
+    parser.add_argument('--files', type=int, default=500, help="synthetic corpus size")
+    parser.add_argument('--frames', type=int, default=600,
+                        help="MPEG frames per synthetic file (24000 is about 10 MB)")
+    parser.add_argument('--names', type=int, default=100000, help="synthetic file names for name benchmarks")
+    args = parser.parse_args()
+
+    selected = sorted(BENCHMARKS) if args.name == 'all' else [args.name]
+    folder = tempfile.mkdtemp(prefix='mp3tool_bench_')
+    try:
+        paths = []
+        if any(name not in NAME_BENCHMARKS for name in selected):
+            print(f"Creating {args.files} synthetic MP3 files...")
+            paths = make_corpus(folder, args.files, frames=args.frames)
+        for name in selected:
+            BENCHMARKS[name](make_names(args.names) if name in NAME_BENCHMARKS else paths)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+MP3 Album Tool - Circuit breaker
+Skips a metadata/cover source for a cooldown after repeated failures
+"""
+
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` failures in a row.
+
+    While open, allow() is False until the cooldown ends; then the breaker is
+    half-open and lets a single probe through. A successful probe closes it,
+    a failed one opens it again with the cooldown doubled (up to
+    ``max_cooldown``). ``on_change(name, state)`` is called on every
+    transition, from whichever thread caused it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 60.0,
+                 max_cooldown: float = 600.0, on_change=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.on_change = on_change
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at = 0.0
+        self.skipped = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        """May a request go to this source now?"""
+        with self._lock:
+            if self.state == OPEN and self.retry_in == 0:
+                changed = self._set_state(HALF_OPEN)
+            else:
+                changed = None
+            if self.state == CLOSED:
+                allowed = True
+            elif self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                allowed = True
+            else:
+                self.skipped += 1
+                allowed = False
+        self._notify(changed)
+        return allowed
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self.cooldown = self.base_cooldown
+            changed = self._set_state(CLOSED)
+        self._notify(changed)
+
+    def record_no_request(self):
+        """The allowed call returned without asking the source: not a probe"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            changed = None
+            if self.state == HALF_OPEN:
+                # The probe failed: back off longer before the next one
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                changed = self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                changed = self._open()
+        self._notify(changed)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self._probing = False
+        return self._set_state(OPEN)
+
+    def _set_state(self, state):
+        if state == self.state:
+            return None
+        self.state = state
+        return state
+
+    def _notify(self, state):
+        if state and self.on_change:
+            self.on_change(self.name, state)
@@ -0,0 +1,118 @@
+"""
+MP3 Album Tool - Client pool
+A few API clients (YouTube Music) shared by the lookup workers, one per worker
+"""
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+class ClientPool:
+    """Up to ``size`` clients made by ``factory()``, lent out one per thread.
+
+    Clients are created on first use, and the rest of the pool is warmed up
+    in the background so later workers don't wait. There is no health
+    probe: a client whose call raises is dropped and replaced in the
+    background, while the other workers keep using theirs. factory() errors
+    reach the caller of client() only when no client is available.
+    """
+
+    def __init__(self, factory, size: int = 4, log=None):
+        self.factory = factory
+        self.size = max(1, size)
+        self.log = log or (lambda message: None)
+        self.created = 0
+        self.replaced = 0
+        self._idle = deque()
+        self._count = 0  # idle + lent out + being created
+        self._warming = False
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def client(self):
+        """Borrow a client; it is discarded if the with block raises"""
+        client = self._acquire()
+        try:
+            yield client
+        except Exception:
+            self._discard()
+            raise
+        self._release(client)
+
+    def _acquire(self):
+        with self._cond:
+            while not self._idle and self._count >= self.size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._count += 1
+        try:
+            client = self._create()
+        except Exception:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+        self._warm_up()
+        return client
+
+    def _release(self, client):
+        with self._cond:
+            if self._count > self.size:
+                self._count -= 1  # the pool shrank while it was lent out
+            else:
+                self._idle.append(client)
+            self._cond.notify()
+
+    def _discard(self):
+        with self._cond:
+            self._count -= 1
+            self.replaced += 1
+            self._cond.notify()
+        self._warm_up()
+
+    def _create(self):
+        client = self.factory()
+        with self._cond:
+            self.created += 1
+        return client
+
+    def _warm_up(self):
+        """Fill the pool up to size on a background thread"""
+        with self._cond:
+            if self._warming or self._count >= self.size:
+                return
+            self._warming = True
+        threading.Thread(target=self._fill, daemon=True).start()
+
+    def _fill(self):
+        try:
+            while True:
+                with self._cond:
+                    if self._count >= self.size:
+                        return
+                    self._count += 1
+                try:
+                    client = self._create()
+                except Exception as e:
+                    with self._cond:
+                        self._count -= 1
+                        # A caller waiting for capacity can now create a client itself
+                        self._cond.notify()
+                    # Callers get the error (and retry) when they need a client
+                    self.log(f"⚠️ Cliente não criado em segundo plano: {e}")
+                    return
+                self._release(client)
+        finally:
+            with self._cond:
+                self._warming = False
+
+    def resize(self, size: int):
+        """Change the number of clients (idle extras are dropped now)"""
+        with self._cond:
+            self.size = max(1, size)
+            while self._idle and self._count > self.size:
+                self._idle.popleft()
+                self._count -= 1
+            self._cond.notify_all()
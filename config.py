@@ -44,4 +44,11 @@ def load_config() -> dict:
 def save_config(cfg: dict) -> None:
     path = _config_path()
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+        json.dump(cfg, f, indent=2, ensure_ascii=False)
+
+def app_data_path(filename: str) -> str:
+    """Path for a per-user data file (library index, caches)"""
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    folder = os.path.join(base, "MP3AlbumTool")
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, filename)
@@ -0,0 +1,88 @@
+"""
+MP3 Album Tool - Drive info
+Which drive a folder is on and what kind it is, to pick the save concurrency
+"""
+
+import os
+
+LOCAL = 'local'
+REMOVABLE = 'removable'
+NETWORK = 'network'
+
+# Files saved at the same time per drive; pen drives and SD cards slow down
+# (a lot) with parallel writes, SSDs need several to reach full bandwidth
+DEFAULT_SAVE_WORKERS = {
+    LOCAL: min(16, os.cpu_count() or 4),
+    REMOVABLE: 1,
+    NETWORK: 4,
+}
+
+# GetDriveTypeW results
+_DRIVE_REMOVABLE = 2
+_DRIVE_REMOTE = 4
+_DRIVE_CDROM = 5
+
+_NETWORK_FILESYSTEMS = {'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'sshfs', 'fuse.sshfs', '9p', 'afs'}
+
+
+def drive_of(path: str):
+    """Key that is the same for every folder on one drive"""
+    if os.name == 'nt':
+        drive = os.path.splitdrive(os.path.abspath(path))[0]
+        return drive.upper()
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
+def drive_type(path: str) -> str:
+    """LOCAL, REMOVABLE or NETWORK for the drive holding path (LOCAL if unknown)"""
+    try:
+        if os.name == 'nt':
+            return _windows_drive_type(path)
+        if os.path.isdir('/sys/dev/block'):
+            return _linux_drive_type(path)
+    except (OSError, AttributeError, ValueError):
+        pass
+    return LOCAL
+
+
+def _windows_drive_type(path):
+    import ctypes
+    drive = os.path.splitdrive(os.path.abspath(path))[0]
+    if drive.startswith('\\\\'):
+        return NETWORK  # UNC path (\\server\share)
+    kind = ctypes.windll.kernel32.GetDriveTypeW(drive + '\\')
+    if kind in (_DRIVE_REMOVABLE, _DRIVE_CDROM):
+        return REMOVABLE
+    if kind == _DRIVE_REMOTE:
+        return NETWORK
+    # USB hard disks report DRIVE_FIXED: they are fine with a few writers
+    return LOCAL
+
+
+def _linux_drive_type(path):
+    path = os.path.realpath(path)
+    # Mount point with the longest prefix of path -> its filesystem type
+    mount, fstype = '', ''
+    with open('/proc/mounts', encoding='utf-8') as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 3:
+                continue
+            point = fields[1].replace('\\040', ' ')
+            if (path == point or path.startswith(point.rstrip('/') + '/')) and len(point) > len(mount):
+                mount, fstype = point, fields[2]
+    if fstype in _NETWORK_FILESYSTEMS:
+        return NETWORK
+
+    device = os.stat(path).st_dev
+    block = os.path.realpath(f'/sys/dev/block/{os.major(device)}:{os.minor(device)}')
+    # The flag is on the disk, the device may be one of its partitions
+    for folder in (block, os.path.dirname(block)):
+        flag = os.path.join(folder, 'removable')
+        if os.path.exists(flag):
+            with open(flag) as f:
+                return REMOVABLE if f.read().strip() == '1' else LOCAL
+    return LOCAL
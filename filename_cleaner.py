@@ -0,0 +1,146 @@
+"""
+MP3 Album Tool - Filename cleaner
+The rules of MP3Engine.clean_filename, precompiled and only run where they can match
+"""
+
+import re
+
+_LEADING_NUMBER = re.compile(r'^\d+\.?\s*')
+
+# Tags removed together with everything after them, in order. Each rule is
+# (keyword the pattern starts with, pattern); it can only match if the
+# keyword is in the name.
+_CUT_TAGS = [
+    ('dvd', r'DVD'),
+    ('direitos', r'DIREITOS\s*AUTORAIS'),
+    # Variações de "Video Oficial"
+    ('video', r'VIDEO\s*OFICIAL'),
+    ('oficial', r'OFICIAL\s*VIDEO'),
+    ('official', r'OFFICIAL\s*VIDEO'),
+    ('video', r'VIDEO\s*OFFICIAL'),
+    ('clipe', r'CLIPE\s*OFICIAL'),
+    ('oficial', r'OFICIAL\s*CLIPE'),
+    ('video', r'VIDEO\s*CLIPE'),
+    ('clipe', r'CLIPE\s*VIDEO'),
+    ('videoclip', r'VIDEOCLIP'),
+    ('video', r'VIDEO\s*CLIP'),
+    ('clip', r'CLIP\s*VIDEO'),
+    # Outras variações de vídeo
+    ('lyric', r'LYRIC\s*VIDEO'),
+    ('video', r'VIDEO\s*LYRIC'),
+    ('lyrics', r'LYRICS\s*VIDEO'),
+    ('video', r'VIDEO\s*LYRICS'),
+    ('music', r'MUSIC\s*VIDEO'),
+    ('video', r'VIDEO\s*MUSIC'),
+    ('official', r'OFFICIAL\s*AUDIO'),
+    ('audio', r'AUDIO\s*OFICIAL'),
+    ('lyric', r'LYRICS?'),
+    ('letra', r'LETRA'),
+    # Qualidade e formato
+    ('mv', r'MV'),
+    ('hd', r'HD'),
+    ('full', r'FULL\s*HD'),
+    ('4k', r'4K'),
+    ('1080p', r'1080P'),
+    ('720p', r'720P'),
+    ('480p', r'480P'),
+    # Tipos de performance
+    ('live', r'LIVE'),
+    ('ao', r'AO\s*VIVO'),
+    ('cover', r'COVER'),
+    ('remix', r'REMIX'),
+    ('version', r'VERSION'),
+    ('versao', r'VERSAO'),
+    ('versão', r'VERSÃO'),
+    ('explicit', r'EXPLICIT'),
+    ('clean', r'CLEAN'),
+    ('acoustic', r'ACOUSTIC'),
+    ('acustico', r'ACUSTICO'),
+    ('acústico', r'ACÚSTICO'),
+    ('instrumental', r'INSTRUMENTAL'),
+    ('karaoke', r'KARAOKE'),
+    ('radio', r'RADIO\s*EDIT'),
+    ('extended', r'EXTENDED'),
+    ('remastered', r'REMASTERED'),
+    ('remasterizado', r'REMASTERIZADO'),
+    ('deluxe', r'DELUXE'),
+    ('bonus', r'BONUS\s*TRACK'),
+    ('faixa', r'FAIXA\s*BONUS'),
+]
+_CUT_RULES = [(keyword, re.compile(rf'\s*\(?{tag}\)?.*', re.IGNORECASE))
+              for keyword, tag in _CUT_TAGS]
+
+# Símbolos e caracteres especiais: (character the pattern needs, pattern)
+_SYMBOL_RULES = [
+    ('[', re.compile(r'\s*\[.*\]', re.IGNORECASE)),  # Qualquer coisa entre colchetes
+    ('(', re.compile(r'\s*\(.*\)', re.IGNORECASE)),  # Qualquer coisa entre parênteses
+    ('{', re.compile(r'\s*\{.*\}', re.IGNORECASE)),  # Qualquer coisa entre chaves
+    ('_', re.compile(r'\s*_+\s*', re.IGNORECASE)),   # Múltiplos underscores
+    ('-', re.compile(r'\s*-+\s*$', re.IGNORECASE)),  # Hífens no final
+    ('|', re.compile(r'\s*\|.*', re.IGNORECASE)),    # Pipe e tudo depois
+    ('#', re.compile(r'\s*#.*', re.IGNORECASE)),     # Hashtag e tudo depois
+]
+
+# Palavras problemáticas separadas por underscores, hífens ou espaços
+_PROBLEMATIC_WORDS = [
+    'video', 'oficial', 'official', 'clipe', 'clip', 'videoclip',
+    'lyric', 'lyrics', 'letra', 'music', 'audio', 'mv', 'hd', 'fullhd',
+    '4k', '1080p', '720p', '480p', 'live', 'aovivo', 'cover', 'remix',
+    'version', 'versao', 'versão', 'explicit', 'clean', 'acoustic',
+    'acustico', 'acústico', 'instrumental', 'karaoke', 'radioedit',
+    'extended', 'remastered', 'remasterizado', 'deluxe', 'bonus',
+    'bonustrack', 'faixabonus'
+]
+_WORD_RULES = [
+    (word, [(re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in (
+        (rf'_{word}_?', '_'), (rf'_{word}$', ''), (rf'^{word}_', ''),
+        (rf'-{word}-?', '-'), (rf'-{word}$', ''), (rf'^{word}-', ''),
+        (rf'\s+{word}\s+', ' '), (rf'\s+{word}$', ''), (rf'^{word}\s+', ''),
+    )])
+    for word in _PROBLEMATIC_WORDS
+]
+
+_MULTIPLE_UNDERSCORES = re.compile(r'_+')
+_MULTIPLE_HYPHENS = re.compile(r'-+')
+_MULTIPLE_SPACES = re.compile(r'\s+')
+
+# Besides the characters that casefold to it, re.IGNORECASE matches 'i' to these
+_FOLD_EXTRA = str.maketrans({'İ': 'i', 'ı': 'i'})
+
+
+def _fold(text: str) -> str:
+    """Text in which every case-insensitive keyword match shows up as a plain substring"""
+    return text.translate(_FOLD_EXTRA).casefold()
+
+
+def clean_filename(filename: str) -> str:
+    """Strip track numbers, video/quality/version tags and stray separators.
+
+    Same result as running every rule in order: rules are skipped only
+    when the keyword or character they need isn't in the name, and no
+    rule can introduce one (they only cut text or join it with a
+    separator).
+    """
+    filename = _LEADING_NUMBER.sub('', filename)
+
+    folded = _fold(filename)
+    for keyword, pattern in _CUT_RULES:
+        if keyword in folded:
+            filename = pattern.sub('', filename)
+    for char, pattern in _SYMBOL_RULES:
+        if char in filename:
+            filename = pattern.sub('', filename)
+
+    folded = _fold(filename)
+    for word, patterns in _WORD_RULES:
+        if word in folded:
+            for pattern, replacement in patterns:
+                filename = pattern.sub(replacement, filename)
+
+    # Limpar múltiplos separadores consecutivos
+    filename = _MULTIPLE_UNDERSCORES.sub('_', filename)
+    filename = _MULTIPLE_HYPHENS.sub('-', filename)
+    filename = _MULTIPLE_SPACES.sub(' ', filename)
+
+    # Remover separadores no início e fim
+    return filename.strip('_-. ').strip()
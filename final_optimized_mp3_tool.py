@@ -5,25 +5,26 @@ Multi-source metadata retrieval with modern UI
 """
 
 import os
-import re
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
 import threading
-from unidecode import unidecode
-from mutagen.easyid3 import EasyID3
-from mutagen.id3 import ID3, APIC
-from mutagen.mp3 import MP3
-import requests
 import webbrowser
 from PIL import Image, ImageTk
 import io
 import json
-from ytmusicapi import YTMusic
-import time
 import urllib.parse
 from rapidfuzz import fuzz
+from library_scanner import TagScanner, iter_mp3_paths
+from circuit_breaker import CLOSED
+from drive_info import DEFAULT_SAVE_WORKERS
+from mp3_engine import SOURCE_NAMES, MP3Engine
+from rate_limiter import DEFAULT_RATE_LIMITS
+from virtual_tree import VirtualTreeview
 
-class FinalMP3Tool:
+class FinalMP3Tool(MP3Engine):
+    # Decoded cover previews kept in memory (oldest are evicted first)
+    COVERS_CACHE_SIZE = 2000
+    
     def init_translations(self):
         """Initialize translation system"""
         self.translations = {
@@ -214,7 +215,15 @@ class FinalMP3Tool:
             'language': 'en',
             'sort_files_default': False,
             'include_subfolders_default': True,
-            'last_playlist_name': 'My_Playlist'
+            'last_playlist_name': 'My_Playlist',
+            'scan_workers': 8,
+            'lookup_workers': 4,
+            'hedged_lookups': False,
+            'tag_padding_kb': 64,
+            # files saved at the same time per drive type (local, removable, network)
+            'save_workers': dict(DEFAULT_SAVE_WORKERS),
+            # requests per second and burst for each metadata source
+            'rate_limits': {source: list(limit) for source, limit in DEFAULT_RATE_LIMITS.items()}
         }
         
         try:
@@ -291,37 +300,22 @@ class FinalMP3Tool:
         # Configure modern styling
         self.setup_styles()
         
-        # Variáveis
+        # Variáveis (as opções do motor viram variáveis Tk, ver option())
+        MP3Engine.__init__(self)
+        self.lookup_workers.set(self.settings['lookup_workers'])
+        self.hedged_lookups.set(self.settings['hedged_lookups'])
+        self.tag_padding.set(self.settings['tag_padding_kb'])
+        self.configure_save_workers(self.settings['save_workers'])
+        self.configure_rate_limits(self.settings['rate_limits'])
         self.selected_folder = tk.StringVar()
-        self.recursive_var = tk.BooleanVar(value=True)
-        self.force_cover_var = tk.BooleanVar(value=False)
-        self.capitalize_names_var = tk.BooleanVar(value=True)
-        self.fuzzy_threshold = tk.IntVar(value=80)
-        
-        # Fontes separadas para renomeação e capas
-        self.use_deezer_rename = tk.BooleanVar(value=True)
-        self.use_theaudiodb_rename = tk.BooleanVar(value=True)
-        self.use_ytmusic_rename = tk.BooleanVar(value=True)
-        self.use_deezer_cover = tk.BooleanVar(value=True)
-        self.use_theaudiodb_cover = tk.BooleanVar(value=True)
-        self.use_ytmusic_cover = tk.BooleanVar(value=True)
-        self.use_google_covers = tk.BooleanVar(value=True)
-        
-        # Configurações de metadados para gravação (para resolver problema do carro)
-        self.save_artist_tag = tk.BooleanVar(value=True)
-        self.save_title_tag = tk.BooleanVar(value=True)
-        self.save_album_tag = tk.BooleanVar(value=True)
-        self.save_albumartist_tag = tk.BooleanVar(value=True)
-        self.save_year_tag = tk.BooleanVar(value=False)
-        self.save_track_tag = tk.BooleanVar(value=False)
         
-        self.files_data = []
-        self.covers_cache = {}
+        self.covers_cache = {}  # cover hash -> decoded preview
+        self.visible_covers_job = None
+        self.cover_photos = {}  # cover hash -> PhotoImage for the file list
+        self.session_cover_photos = {}  # id(image) -> (image, PhotoImage)
         self.editing_item = None
         self.processed = False
-        
-        # YouTube Music API instance (reutilizar para evitar conflitos)
-        self.ytmusic_instance = None
+        self.scanner = None
         
         # Progress tracking variables
         self.current_progress = 0
@@ -334,44 +328,13 @@ class FinalMP3Tool:
         
         self.setup_ui()
         
-    def get_ytmusic_instance(self):
-        """Obtém instância do YTMusic com retry e tratamento robusto"""
-        if self.ytmusic_instance is not None:
-            return self.ytmusic_instance
-        
-        max_attempts = 3
-        for attempt in range(1, max_attempts + 1):
-            try:
-                self.log_message(f"📡 Tentativa {attempt}/{max_attempts} - Inicializando YouTube Music...")
-                
-                # Importar aqui para evitar problemas de inicialização
-                from ytmusicapi import YTMusic
-                
-                # Criar instância
-                self.ytmusic_instance = YTMusic()
-                
-                # Teste rápido para verificar se está funcionando
-                test_results = self.ytmusic_instance.search("test", filter="songs", limit=1)
-                
-                self.log_message(f"✅ YouTube Music inicializado com sucesso (tentativa {attempt})")
-                return self.ytmusic_instance
-                
-            except Exception as e:
-                self.log_message(f"❌ Tentativa {attempt} falhou: {e}")
-                
-                if attempt < max_attempts:
-                    wait_time = attempt * 2  # Backoff progressivo
-                    self.log_message(f"⏳ Aguardando {wait_time}s antes da próxima tentativa...")
-                    time.sleep(wait_time)
-                else:
-                    self.log_message("❌ Todas as tentativas de inicialização do YouTube Music falharam")
-        
-        return None
-    
-    def reset_ytmusic_instance(self):
-        """Reseta a instância do YouTube Music para forçar uma nova inicialização"""
-        self.log_message("🔄 Resetando instância do YouTube Music...")
-        self.ytmusic_instance = None
+    def option(self, value):
+        """Engine options are Tk variables so the settings dialogs can bind to them"""
+        if isinstance(value, bool):
+            return tk.BooleanVar(value=value)
+        if isinstance(value, int):
+            return tk.IntVar(value=value)
+        return tk.StringVar(value=value)
         
     def setup_styles(self):
         """Configure modern professional styling"""
@@ -600,6 +563,10 @@ class FinalMP3Tool:
                                      style='Status.TLabel')
         self.status_label.pack(side=tk.RIGHT)
         
+        # Sources currently skipped by their circuit breaker
+        self.sources_label = ttk.Label(title_frame, text="", style='Warning.TLabel')
+        self.sources_label.pack(side=tk.RIGHT, padx=(0, 15))
+        
         # Compact configuration section
         config_frame = ttk.LabelFrame(main_frame, text="⚙️ Config", 
                                      padding="10", style='Modern.TLabelframe')
@@ -762,10 +729,19 @@ class FinalMP3Tool:
         self.files_tree.column("Status", width=100)
         
         # Modern scrollbars
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.files_tree.yview)
+        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
         h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.files_tree.xview)
         
-        self.files_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.files_tree.configure(xscrollcommand=h_scrollbar.set)
+        
+        # Virtualized list: only the visible rows (plus overscan) exist as items,
+        # and covers are decoded lazily as rows scroll into view
+        self.file_list = VirtualTreeview(self.files_tree, v_scrollbar,
+                                         row_count=lambda: len(self.files_data),
+                                         row_values=self.file_row_values,
+                                         row_image=self.file_row_image,
+                                         overscan=2,
+                                         on_render=lambda start, end: self.schedule_visible_covers())
         
         # Grid layout for treeview and scrollbars
         self.files_tree.grid(row=0, column=0, sticky="nsew")
@@ -810,7 +786,7 @@ class FinalMP3Tool:
         """Abre janela de configurações de metadados"""
         settings_window = tk.Toplevel(self.root)
         settings_window.title(f"⚙️ {self.t('metadata_settings')}")
-        settings_window.geometry("500x400")
+        settings_window.geometry("500x450")
         settings_window.configure(bg=self.colors['background'])
         settings_window.transient(self.root)
         settings_window.grab_set()
@@ -866,6 +842,25 @@ class FinalMP3Tool:
         ttk.Checkbutton(right_frame, text=f"🔢 {self.t('track')}", 
                        variable=self.save_track_tag).pack(anchor=tk.W, pady=5)
         
+        # Espaço livre reservado na tag: edições futuras gravam sem reescrever o arquivo
+        padding_frame = ttk.Frame(main_frame)
+        padding_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        ttk.Label(padding_frame, text="Tag padding (KB, lets later edits skip rewriting the file):").pack(side=tk.LEFT)
+        ttk.Spinbox(padding_frame, from_=0, to=1024, increment=16, width=6,
+                    textvariable=self.tag_padding).pack(side=tk.LEFT, padx=(10, 0))
+        
+        def close_metadata_settings():
+            try:
+                self.settings['tag_padding_kb'] = max(0, self.tag_padding.get())
+            except tk.TclError:
+                pass
+            self.tag_padding.set(self.settings['tag_padding_kb'])
+            self.save_settings()
+            settings_window.destroy()
+        
+        settings_window.protocol("WM_DELETE_WINDOW", close_metadata_settings)
+        
         # Info sobre compatibilidade com carros
         info_frame = ttk.LabelFrame(main_frame, text=f"💡 {self.t('tip_for_cars')}", padding="15")
         info_frame.pack(fill=tk.X, pady=(0, 20))
@@ -881,7 +876,7 @@ class FinalMP3Tool:
         buttons_frame.pack(fill=tk.X)
         
         ttk.Button(buttons_frame, text=f"✅ {self.t('ok')}", 
-                  command=settings_window.destroy).pack(side=tk.RIGHT, padx=(10, 0))
+                  command=close_metadata_settings).pack(side=tk.RIGHT, padx=(10, 0))
         
         ttk.Button(buttons_frame, text=f"🔄 {self.t('restore_defaults')}", 
                   command=self.restore_metadata_defaults).pack(side=tk.RIGHT)
@@ -890,7 +885,7 @@ class FinalMP3Tool:
         """Abre janela de configurações de fontes"""
         sources_window = tk.Toplevel(self.root)
         sources_window.title(f"🔍 {self.t('source_settings')}")
-        sources_window.geometry("600x500")
+        sources_window.geometry("600x600")
         sources_window.configure(bg=self.colors['background'])
         sources_window.transient(self.root)
         sources_window.grab_set()
@@ -959,12 +954,34 @@ class FinalMP3Tool:
         
         threshold_scale.configure(command=update_threshold_display)
         
+        # Concorrência do processamento
+        workers_inner = ttk.Frame(threshold_frame)
+        workers_inner.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Label(workers_inner, text="Parallel lookups:").pack(side=tk.LEFT)
+        ttk.Spinbox(workers_inner, from_=1, to=16, width=5,
+                    textvariable=self.lookup_workers).pack(side=tk.LEFT, padx=(10, 0))
+        
+        ttk.Checkbutton(threshold_frame, text="Query all rename sources at once (first match above threshold wins)",
+                       variable=self.hedged_lookups).pack(anchor=tk.W, pady=(10, 0))
+        
+        def close_sources_settings():
+            try:
+                self.settings['lookup_workers'] = max(1, self.lookup_workers.get())
+            except tk.TclError:
+                self.lookup_workers.set(self.settings['lookup_workers'])
+            self.settings['hedged_lookups'] = self.hedged_lookups.get()
+            self.save_settings()
+            sources_window.destroy()
+        
+        sources_window.protocol("WM_DELETE_WINDOW", close_sources_settings)
+        
         # Botões
         buttons_frame = ttk.Frame(main_frame)
         buttons_frame.pack(fill=tk.X)
         
         ttk.Button(buttons_frame, text=f"✅ {self.t('ok')}", 
-                  command=sources_window.destroy).pack(side=tk.RIGHT, padx=(10, 0))
+                  command=close_sources_settings).pack(side=tk.RIGHT, padx=(10, 0))
         
         ttk.Button(buttons_frame, text=f"🔄 {self.t('restore_defaults')}", 
                   command=self.restore_sources_defaults).pack(side=tk.RIGHT)
@@ -1154,6 +1171,7 @@ class FinalMP3Tool:
         self.save_albumartist_tag.set(True)
         self.save_year_tag.set(False)
         self.save_track_tag.set(False)
+        self.tag_padding.set(self.default_settings['tag_padding_kb'])
     
     def restore_sources_defaults(self):
         """Restaura configurações padrão de fontes"""
@@ -1165,6 +1183,8 @@ class FinalMP3Tool:
         self.use_ytmusic_cover.set(True)
         self.use_google_covers.set(True)
         self.fuzzy_threshold.set(80)
+        self.lookup_workers.set(self.default_settings['lookup_workers'])
+        self.hedged_lookups.set(self.default_settings['hedged_lookups'])
     
     def add_folder_to_playlist(self):
         """Adiciona uma pasta à lista de pastas da playlist"""
@@ -1436,36 +1456,28 @@ class FinalMP3Tool:
                 
                 for mp3_file in all_mp3_files:
                     try:
-                        # Extrair metadados incluindo álbum
-                        artist, title = self.extract_existing_metadata(mp3_file)
+                        # Artista, título e álbum vêm do índice (só relê ficheiros alterados)
+                        record = self.read_track(mp3_file)
+                        artist = record['artist'] or None
+                        title = record['title'] or None
                         
-                        # Tentar extrair álbum usando mutagen
-                        try:
-                            from mutagen.mp3 import MP3
-                            from mutagen.id3 import ID3NoHeaderError
-                            
-                            audio = MP3(mp3_file)
-                            album = None
-                            
-                            # Tentar diferentes tags de álbum
-                            if 'TALB' in audio:
-                                album = str(audio['TALB'][0]).strip()
-                            elif 'TIT2' in audio:  # Se não há álbum, usar título como fallback
-                                album = "Singles"
-                            
-                            if album and album != "":
-                                if album not in albums:
-                                    albums[album] = []
-                                albums[album].append((mp3_file, artist, title))
-                            else:
-                                files_without_album.append((mp3_file, artist, title))
-                                
-                        except:
+                        album = record['album']
+                        if not album and title:  # Se não há álbum, usar título como fallback
+                            album = "Singles"
+                        
+                        if album:
+                            if album not in albums:
+                                albums[album] = []
+                            albums[album].append((mp3_file, artist, title))
+                        else:
                             files_without_album.append((mp3_file, artist, title))
                             
                     except:
                         files_without_album.append((mp3_file, None, None))
                 
+                if self.library_index:
+                    self.library_index.flush()
+                
                 # Escrever arquivos agrupados por álbum usando tags #EXTALB
                 for album_name in sorted(albums.keys()):
                     for mp3_file, artist, title in albums[album_name]:
@@ -1590,44 +1602,32 @@ class FinalMP3Tool:
         added_count = 0
         
         for file_path in file_paths:
-            # Check if file is already in the list
-            already_exists = any(data['path'] == file_path for data in self.files_data)
+            # Check if file is already in the list (any spelling of its path)
+            key = self.path_key(file_path)
+            already_exists = key in self.files_by_path
             
             if not already_exists and file_path.lower().endswith('.mp3'):
                 try:
-                    # Extract metadata - returns tuple (artist, title)
-                    artist, title = self.extract_existing_metadata(file_path)
-                    
-                    # Get album name from folder
-                    album_name = os.path.basename(os.path.dirname(file_path))
-                    
-                    # Add to files_data
-                    filename = os.path.basename(file_path)
-                    file_data = {
-                        'index': len(self.files_data) + 1,  # Índice baseado na posição atual
-                        'path': file_path,
-                        'album': album_name,
-                        'original': filename,  # Nome original do arquivo
-                        'new': '',  # Campo para novo nome do arquivo
-                        'artist': artist or '',
-                        'title': title or '',
-                        'status': 'Pending',
-                        'cover': None  # Para compatibilidade com load_mp3_files
-                    }
+                    # Tags and embedded cover in a single read of the file
+                    try:
+                        record = self.ingest_file(file_path)
+                    except Exception:
+                        record = None
                     
-                    self.files_data.append(file_data)
+                    # Add to files_data (album name comes from the folder)
+                    self.add_file(file_path, record, key)
                     added_count += 1
                     
                 except Exception as e:
                     self.log_message(f"❌ {self.t('error_loading_file')} {os.path.basename(file_path)}: {e}")
         
+        if self.library_index:
+            self.library_index.flush()
+        
         if added_count > 0:
             # Refresh the tree view
             self.refresh_tree_view()
             self.log_message(f"📁 {self.t('files_added').format(added_count)}")
-            
-            # Load covers for new files
-            self.load_existing_covers()
         else:
              self.log_message(f"⚠️ {self.t('no_new_files_added')}")
              
@@ -1638,120 +1638,151 @@ class FinalMP3Tool:
         self.log_message(f"💡 {self.t('tip_add_files')}")
             
     def load_mp3_files(self, folder_path):
-        """Load MP3 files into the list"""
-        # Clear previous list
-        for item in self.files_tree.get_children():
-            self.files_tree.delete(item)
-        # Clear stored thumbnails
-        self.cover_thumbnails = {}
+        """Load MP3 files into the list (tags are read in the background)"""
+        # Cancel a scan that is still running for a previous folder
+        if getattr(self, 'scanner', None):
+            self.scanner.cancel()
         
+        # Clear previous list
         self.files_data = []
+        self.files_by_path = {}
+        self.file_list.reset()
         self.processed = False
         self.save_btn.config(state="disabled")
+        self.process_btn.config(state="disabled")
+        self.stop_btn.config(state="normal")
+        self.status_label.config(text="Scanning...", style='Warning.TLabel')
+        self.progress_text.set("0 files")
+        self.covers_found = 0
+        
+        # Find MP3 files with os.scandir and read tags on a thread pool
+        if self.library_index:
+            self.library_index.reset_stats()
+        scanner = TagScanner(self.ingest_file,
+                             workers=self.settings['scan_workers'],
+                             path_key=self.path_key)
+        self.scanner = scanner
+        paths = iter_mp3_paths(folder_path, self.recursive_var.get())
+        scanner.start(paths,
+                      lambda batch, stats: self.root.after(0, self.add_scanned_batch, scanner, batch, stats),
+                      lambda stats: self.root.after(0, self.scan_finished, scanner, stats))
+        
+    def add_scanned_batch(self, scanner, batch, stats):
+        """Append a batch of scanned files to the list (runs on the Tk thread)"""
+        if scanner is not self.scanner:
+            return
         
-        # Find MP3 files
-        mp3_files = []
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                if file.lower().endswith('.mp3'):
-                    mp3_files.append(os.path.join(root, file))
-            
-            if not self.recursive_var.get():
-                break
-        
-        # Add to list with numbering
-        for i, file_path in enumerate(mp3_files):
-            album_name = os.path.basename(os.path.dirname(file_path))
-            filename = os.path.basename(file_path)
-            
-            # Try to extract existing metadata
-            artist, title = self.extract_existing_metadata(file_path)
-            
-            self.files_data.append({
-                'index': i + 1,
-                'path': file_path,
-                'album': album_name,
-                'original': filename,
-                'new': '',
-                'artist': artist or '',
-                'title': title or '',
-                'status': 'Pending',
-                'cover': None
-            })
-            
-            # Insert into treeview
-            # Columns order: ("#", "Album", "Original", "New", "Artist", "Title", "Status")
-            self.files_tree.insert("", "end", values=(
-                i + 1,  # #
-                album_name,  # Album
-                filename,  # Original
-                '',  # New
-                artist or '',  # Artist
-                title or '',  # Title
-                'Pending'  # Status
-            ))
-        
-        self.log_message(f"📁 Loaded {len(mp3_files)} MP3 files")
-        
-        # Load existing covers
-        self.load_existing_covers()
-        
-    def extract_existing_metadata(self, file_path):
-        """Extract existing metadata from file"""
-        try:
-            audio = MP3(file_path, ID3=ID3)
-            if audio.tags:
-                artist = audio.tags.get('TPE1', [''])[0] if 'TPE1' in audio.tags else ''
-                title = audio.tags.get('TIT2', [''])[0] if 'TIT2' in audio.tags else ''
-                return artist, title
-        except Exception:
-            pass
-        return None, None
+        for file_path, key, record in batch:
+            # The key was computed on the scanner worker: only dict lookups here
+            file_data = self.add_file(file_path, record, key)
+            if file_data and file_data['cover_ref']:
+                self.covers_found += 1
         
-    def load_existing_covers(self):
-        """Load existing covers from files"""
-        self.log_message("🔍 Checking embedded covers in files...")
-        covers_found = 0
+        self.file_list.refresh()
+        self.progress_text.set(f"{stats.files} files ({stats.files_per_second:.0f} files/s)")
         
-        for i, file_data in enumerate(self.files_data):
-            try:
-                cover_image = self.extract_cover_from_file(file_data['path'])
-                if cover_image:
-                    file_data['cover'] = cover_image
-                    covers_found += 1
-                    # Update treeview with immediate preview
-                    self.update_file_in_tree(i, file_data)
-            except Exception as e:
-                self.log_message(f"❌ Error loading cover {file_data['original']}: {e}")
+    def scan_finished(self, scanner, stats):
+        """Called on the Tk thread when a folder scan ends or is cancelled"""
+        if scanner is not self.scanner:
+            return
+        self.scanner = None
         
-        self.log_message(f"✅ Check completed: {covers_found} embedded covers found")
-                
-    def extract_cover_from_file(self, file_path):
-        """Extrai capa do arquivo MP3"""
+        self.process_btn.config(state="normal")
+        self.stop_btn.config(state="disabled")
+        self.status_label.config(text="Ready", style='Status.TLabel')
+        self.progress_text.set(f"{stats.files} files")
+        
+        if stats.cancelled:
+            self.log_message(f"⏹️ Scan cancelled: {stats.files} MP3 files loaded")
+        self.log_message(f"📁 Loaded {len(self.files_data)} MP3 files "
+                         f"in {stats.elapsed:.1f}s ({stats.files_per_second:.0f} files/s)")
+        if self.library_index:
+            self.library_index.flush()
+            self.log_message(f"🗂️ Library index: {self.library_index.hits} unchanged, "
+                             f"{self.library_index.misses} read from disk")
+        self.log_message(f"✅ {self.covers_found} embedded covers found")
+        
+    def make_cover_thumbnail(self, data):
+        """Decode embedded cover bytes into an 80x80 preview"""
         try:
-            audio = MP3(file_path, ID3=ID3)
-            if audio.tags:
-                for frame in audio.tags.values():
-                    if isinstance(frame, APIC):
-                        # Resize image for preview
-                        image = Image.open(io.BytesIO(frame.data))
-                        image.thumbnail((80, 80), Image.Resampling.LANCZOS)
-                        # Debug log
-                        filename = os.path.basename(file_path)
-                        self.log_message(f"🖼️ Embedded cover found in: {filename}")
-                        return image
-        except Exception as e:
-            # Debug log
-            filename = os.path.basename(file_path)
-            self.log_message(f"❌ Error extracting cover from {filename}: {e}")
-        return None
+            image = Image.open(io.BytesIO(data))
+            # JPEG can be decoded directly at a reduced scale
+            image.draft('RGB', (80, 80))
+            image.thumbnail((80, 80), Image.Resampling.LANCZOS)
+            return image
+        except Exception:
+            return None
+                
+    def get_cover_preview(self, file_data):
+        """Cover preview for a row: a new cover, or the embedded one decoded on demand"""
+        if file_data.get('cover'):
+            return file_data['cover']
+        ref = file_data.get('cover_ref')
+        if not ref:
+            return None
         
-    def log_message(self, message):
+        # Tracks of the same album usually share one cover: decode it once
+        preview = self.covers_cache.get(ref['hash'])
+        if preview is None:
+            try:
+                data = self.read_cover_bytes(file_data)
+                preview = self.make_cover_thumbnail(data) if data else None
+            except Exception:
+                preview = None
+            if preview is None:
+                return None
+            self.remember(self.covers_cache, ref['hash'], preview)
+        return preview
+        
+    def remember(self, cache, key, value):
+        """Insert into a bounded cache dict, evicting the oldest entry"""
+        cache[key] = value
+        if len(cache) > self.COVERS_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        
+    def schedule_visible_covers(self):
+        """Decode covers for visible rows once scrolling settles"""
+        if self.visible_covers_job:
+            self.root.after_cancel(self.visible_covers_job)
+        self.visible_covers_job = self.root.after(50, self.load_visible_covers)
+        
+    def load_visible_covers(self):
+        """Decode embedded covers for the rows materialized in files_tree"""
+        self.visible_covers_job = None
+        start, end = self.file_list.materialized_range()
+        decoded = False
+        
+        for i in range(start, end):
+            file_data = self.files_data[i]
+            ref = file_data.get('cover_ref')
+            if file_data.get('cover') or not ref or ref['hash'] in self.cover_photos:
+                continue
+            preview = self.get_cover_preview(file_data)
+            # '' marks covers that failed to decode so they aren't retried on every scroll
+            photo = ImageTk.PhotoImage(preview) if preview else ''
+            self.remember(self.cover_photos, ref['hash'], photo)
+            decoded = True
+        
+        if decoded:
+            for i in range(start, end):
+                self.file_list.update_row(i)
+        
+    def write_log(self, message):
         """Add message to log"""
         self.log_text.insert(tk.END, message + "\n")
         self.log_text.see(tk.END)
         self.root.update_idletasks()
         
+    def on_breaker_change(self, source, state):
+        """Breaker transitions come from lookup threads: hand them to the Tk thread"""
+        self.root.after(0, self.show_breaker_change, source, state)
+        
+    def show_breaker_change(self, source, state):
+        MP3Engine.on_breaker_change(self, source, state)
+        unavailable = [f"{SOURCE_NAMES[name]} ({breaker.state})"
+                       for name, breaker in self.breakers.items() if breaker.state != CLOSED]
+        self.sources_label.config(text=("⛔ " + ", ".join(unavailable)) if unavailable else "")
+        
     def start_processing(self):
         """Start processing with real metadata"""
         if not self.files_data:
@@ -1782,126 +1813,26 @@ class FinalMP3Tool:
             self.log_message("🚀 Starting processing with real metadata")
             self.log_message("=" * 70)
             
-            for i, file_data in enumerate(self.files_data):
-                try:
-                    # Update progress
-                    self.current_progress = i
-                    self.update_progress(i + 1, self.total_files)
-                    
-                    # Stop if requested
-                    if self.stop_requested:
-                        self.log_message("⏹️ Processing stopped by user")
-                        break
-                    # Pause if requested
-                    while self.pause_requested and not self.stop_requested:
-                        time.sleep(0.1)
-                        
-                    original_name = os.path.splitext(file_data['original'])[0]
-                    self.log_message(f"Processing ({i+1}/{self.total_files}): {original_name}")
-                    
-                    # Clean filename
-                    cleaned_name = self.clean_filename(original_name)
-                    
-                    # Try to extract artist and title from name
-                    artist_from_filename, title_from_filename = self.extract_artist_title(cleaned_name)
-                    
-                    # Search for real metadata
-                    real_artist = None
-                    real_title = None
-                    source = "None"
-                    
-                    # Try Deezer first (if enabled for renaming)
-                    if self.use_deezer_rename.get():
-                        self.log_message(f"  🔍 Searching Deezer: {cleaned_name}")
-                        real_artist, real_title = self.search_deezer(cleaned_name)
-                        
-                        if real_artist and real_title:
-                            source = "Deezer"
-                            self.log_message(f"  ✅ Deezer found: {real_artist} - {real_title}")
-                        else:
-                            self.log_message(f"  ❌ Deezer not found")
-                    
-                    # If Deezer didn't find, try TheAudioDB (if enabled for renaming)
-                    if not real_artist or not real_title:
-                        if self.use_theaudiodb_rename.get():
-                            self.log_message(f"  🔍 Searching TheAudioDB: {cleaned_name}")
-                            real_artist, real_title = self.search_theaudiodb(cleaned_name)
-                            
-                            if real_artist and real_title:
-                                source = "TheAudioDB"
-                                self.log_message(f"  ✅ TheAudioDB found: {real_artist} - {real_title}")
-                            else:
-                                self.log_message(f"  ❌ TheAudioDB not found")
-                    
-                    # If still not found, try YouTube Music (if enabled for renaming)
-                    if not real_artist or not real_title:
-                        if self.use_ytmusic_rename.get():
-                            self.log_message(f"  🔍 Searching YouTube Music: {cleaned_name}")
-                            real_artist, real_title = self.search_ytmusic(cleaned_name)
-                            
-                            if real_artist and real_title:
-                                source = "YouTube Music"
-                                self.log_message(f"  ✅ YouTube Music encontrou: {real_artist} - {real_title}")
-                            else:
-                                self.log_message(f"  ❌ YouTube Music não encontrou")
-                    
-                    # Se não encontrou em nenhuma fonte, usar do nome do arquivo
-                    if not real_artist or not real_title:
-                        if artist_from_filename and title_from_filename:
-                            real_artist = artist_from_filename
-                            real_title = title_from_filename
-                            source = "Nome do Arquivo"
-                            self.log_message(f"  📁 Usando do nome do arquivo: {real_artist} - {real_title}")
-                        else:
-                            real_artist = "Artista Desconhecido"
-                            real_title = cleaned_name
-                            source = "Desconhecido"
-                            self.log_message(f"  ❌ Usando fallback: {real_artist} - {real_title}")
-                    
-                    # Formatar nomes
-                    if self.capitalize_names_var.get():
-                        real_artist = self.smart_capitalize(real_artist)
-                        real_title = self.smart_capitalize(real_title)
-                    
-                    # Criar novo nome baseado nos metadados reais
-                    new_name = f"{real_artist} - {real_title}"
-                    
-                    # Atualizar dados
-                    file_data['new'] = new_name
-                    file_data['artist'] = real_artist
-                    file_data['title'] = real_title
-                    file_data['status'] = source
-                    
-                    # Atualizar interface
-                    self.root.after(0, self.update_file_in_tree, i, file_data)
-                    
-                    self.log_message(f"  → {new_name} (Fonte: {source})")
-                    
-                    # Buscar capa se encontrar artista e título
-                    if file_data['artist'] and file_data['title']:
-                        self.log_message(f"  🖼️ Buscando capa: {file_data['artist']} - {file_data['title']}")
-                        
-                        # Verificar se já tem capa
-                        if not self.force_cover_var.get() and file_data['cover']:
-                            self.log_message("    ✅ Capa já existe")
-                        else:
-                            # Buscar capa
-                            cover_image = self.search_cover_all_sources(file_data['artist'], file_data['title'])
-                            
-                            if cover_image:
-                                file_data['cover'] = cover_image
-                                self.log_message("    ✅ Capa encontrada")
-                                
-                                # Atualizar preview na tabela imediatamente
-                                self.root.after(0, self.update_file_in_tree, i, file_data)
-                            else:
-                                self.log_message("    ❌ Capa não encontrada")
-                    
-                except Exception as e:
-                    self.log_message(f"  ❌ Error: {e}")
-                    file_data['status'] = "Error"
-                    self.root.after(0, self.update_file_in_tree, i, file_data)
-            
+            workers = max(1, self.lookup_workers.get())
+            self.log_message(f"⚡ {workers} files looked up at a time")
+            
+            def apply_result(i, file_data, cover_found, error):
+                # Results arrive in list order, on this thread
+                self.current_progress = i
+                self.update_progress(i + 1, self.total_files)
+                self.root.after(0, self.update_file_in_tree, i, file_data)
+            
+            self.process_files(self.files_data, apply_result, workers,
+                               should_stop=lambda: self.stop_requested,
+                               is_paused=lambda: self.pause_requested)
+            if self.stop_requested:
+                self.log_message("⏹️ Processing stopped by user")
+            
+            self.log_cache_stats()
+            self.log_http_stats()
+            self.log_flight_stats()
+            self.log_normalization_stats()
+            self.log_source_health()
             self.log_message("=" * 70)
             if not self.stop_requested:
                 self.log_message("✅ Processing completed! Click 'Save Changes' to save.")
@@ -1927,530 +1858,10 @@ class FinalMP3Tool:
     def request_stop(self):
         """Solicita parar processamento"""
         self.stop_requested = True
+        # Also cancels a folder scan in progress
+        if self.scanner:
+            self.scanner.cancel()
             
-    def search_deezer(self, search_term):
-        """Busca no Deezer"""
-        try:
-            # Limpar termo de busca
-            clean_term = re.sub(r'[^\w\s]', ' ', search_term)
-            clean_term = re.sub(r'\s+', ' ', clean_term).strip()
-            
-            # Buscar no Deezer
-            api_url = f"https://api.deezer.com/search?q={clean_term}"
-            
-            response = requests.get(api_url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'data' in data and len(data['data']) > 0:
-                    track = data['data'][0]
-                    
-                    artist = track.get('artist', {}).get('name', '')
-                    title = track.get('title', '')
-                    
-                    if artist and title:
-                        return artist, title
-            
-            return None, None
-            
-        except Exception as e:
-            self.log_message(f"  Erro na busca Deezer: {e}")
-            return None, None
-            
-    def search_theaudiodb(self, search_term):
-        """Busca simples e rápida no TheAudioDB - apenas artista/título"""
-        try:
-            # Extrair artista e título
-            artist_guess, title_guess = self.extract_artist_title(search_term)
-            
-            if not artist_guess or not title_guess:
-                return None, None
-            
-            # Busca direta por track específico - mais rápida
-            api_url = "https://theaudiodb.com/api/v1/json/2/searchtrack.php"
-            params = {'s': artist_guess, 't': title_guess}
-            
-            response = requests.get(api_url, params=params, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if 'track' in data and data['track'] and len(data['track']) > 0:
-                    track = data['track'][0]
-                    artist = track.get('strArtist', '').strip()
-                    title = track.get('strTrack', '').strip()
-                    
-                    if artist and title:
-                        return artist, title
-            
-            return None, None
-            
-        except Exception:
-            return None, None
-    
-    def search_ytmusic(self, filename):
-        """Busca informações no YouTube Music com retry automático"""
-        max_attempts = 2
-        
-        for attempt in range(1, max_attempts + 1):
-            try:
-                artist_guess, title_guess = self.extract_artist_title(filename)
-                
-                if not artist_guess or not title_guess:
-                    return None, None
-                
-                # Obter instância reutilizável do YouTube Music API
-                ytmusic = self.get_ytmusic_instance()
-                if not ytmusic:
-                    return None, None
-                
-                # Buscar por artista e título
-                search_query = f"{artist_guess} {title_guess}"
-                self.log_message(f"🔍 YouTube Music: Buscando '{search_query}' (tentativa {attempt})")
-                
-                results = ytmusic.search(search_query, filter="songs", limit=5)
-                
-                if results:
-                    for result in results:
-                        if result.get('resultType') == 'song':
-                            # Extrair artista
-                            artists = result.get('artists', [])
-                            if artists:
-                                artist = artists[0].get('name', '').strip()
-                            else:
-                                artist = None
-                            
-                            # Extrair título
-                            title = result.get('title', '').strip()
-                            
-                            if artist and title:
-                                self.log_message(f"✅ YouTube Music: Encontrado '{artist} - {title}'")
-                                return artist, title
-                
-                self.log_message(f"⚠️ YouTube Music: Nenhum resultado encontrado para '{search_query}'")
-                return None, None
-                
-            except Exception as e:
-                self.log_message(f"❌ YouTube Music tentativa {attempt} falhou: {e}")
-                
-                if attempt < max_attempts:
-                    # Reset da instância para tentar novamente
-                    self.reset_ytmusic_instance()
-                    time.sleep(1)
-                else:
-                    self.log_message("❌ YouTube Music: Todas as tentativas falharam")
-        
-        return None, None
-
-            
-    def search_cover_all_sources(self, artist, title):
-        """Busca capa em todas as fontes habilitadas"""
-        # Deezer (se habilitado para capas)
-        if self.use_deezer_cover.get():
-            try:
-                cover_image = self.search_cover_deezer(artist, title)
-                if cover_image:
-                    return cover_image
-            except Exception:
-                pass
-            
-        # TheAudioDB (se habilitado para capas)
-        if self.use_theaudiodb_cover.get():
-            try:
-                cover_image = self.search_cover_theaudiodb(artist, title)
-                if cover_image:
-                    return cover_image
-            except Exception:
-                pass
-            
-        # YouTube Music (se habilitado para capas)
-        if self.use_ytmusic_cover.get():
-            try:
-                cover_image = self.search_cover_ytmusic(artist, title)
-                if cover_image:
-                    return cover_image
-            except Exception:
-                pass
-            
-        # Google (só para capas)
-        if self.use_google_covers.get():
-            try:
-                cover_image = self.search_cover_google(artist, title)
-                if cover_image:
-                    return cover_image
-            except Exception:
-                pass
-            
-        return None
-            
-    def search_cover_deezer(self, artist, title):
-        """Busca capa no Deezer com alta resolução"""
-        try:
-            query = f'artist:"{artist}" track:"{title}"'
-            api_url = f"https://api.deezer.com/search?q={query}"
-            
-            response = requests.get(api_url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'data' in data and len(data['data']) > 0:
-                    track = data['data'][0]
-                    
-                    if 'album' in track:
-                        album = track['album']
-                        
-                        # Tentar diferentes resoluções em ordem de preferência (maior para menor)
-                        cover_sizes = [
-                            ('cover_xl', 'XL (1000x1000)'),      # 1000x1000
-                            ('cover_big', 'Big (500x500)'),      # 500x500  
-                            ('cover_medium', 'Medium (250x250)'), # 250x250
-                            ('cover', 'Standard (120x120)'),     # 120x120
-                            ('cover_small', 'Small (56x56)')     # 56x56
-                        ]
-                        
-                        for cover_key, size_desc in cover_sizes:
-                            if cover_key in album:
-                                cover_url = album[cover_key]
-                                
-                                try:
-                                    img_response = requests.get(cover_url, timeout=10)
-                                    if img_response.status_code == 200:
-                                        image = Image.open(io.BytesIO(img_response.content))
-                                        self.log_message(f"   🖼️ Capa Deezer encontrada: {size_desc} - {image.size[0]}x{image.size[1]}")
-                                        
-                                        # Não redimensionar aqui - deixar para embed_cover_art fazer isso
-                                        return image
-                                except Exception as e:
-                                    self.log_message(f"   ⚠️ Erro ao baixar capa {size_desc}: {e}")
-                                    continue
-            
-            return None
-            
-        except Exception as e:
-            self.log_message(f"Erro ao buscar capa Deezer: {e}")
-            return None
-            
-    def search_cover_theaudiodb(self, artist, title):
-        """Busca capa no TheAudioDB - CORRIGIDO"""
-        try:
-            # Buscar track específico
-            api_url = "https://theaudiodb.com/api/v1/json/2/searchtrack.php"
-            params = {
-                's': artist,
-                't': title
-            }
-            
-            response = requests.get(api_url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'track' in data and len(data['track']) > 0:
-                    track = data['track'][0]
-                    album_id = track.get('idAlbum')
-                    
-                    if album_id:
-                        # Buscar capa do álbum
-                        cover_url = f"https://theaudiodb.com/api/v1/json/2/album.php?m={album_id}"
-                        cover_response = requests.get(cover_url, timeout=10)
-                        
-                        if cover_response.status_code == 200:
-                            cover_data = cover_response.json()
-                            
-                            if 'album' in cover_data and len(cover_data['album']) > 0:
-                                album = cover_data['album'][0]
-                                cover_url = album.get('strAlbumThumb')
-                                
-                                if cover_url and cover_url != "":
-                                    img_response = requests.get(cover_url, timeout=10)
-                                    if img_response.status_code == 200:
-                                        image = Image.open(io.BytesIO(img_response.content))
-                                        self.log_message(f"   🖼️ Capa TheAudioDB encontrada: {image.size[0]}x{image.size[1]}")
-                                        # Não redimensionar aqui - deixar para embed_cover_art fazer isso
-                                        return image
-            
-            return None
-            
-        except Exception as e:
-            self.log_message(f"Erro ao buscar capa TheAudioDB: {e}")
-            return None
-            
-    def search_cover_ytmusic(self, artist, title):
-        """Busca capa no YouTube Music com retry automático"""
-        max_attempts = 2
-        
-        for attempt in range(1, max_attempts + 1):
-            try:
-                # Obter instância reutilizável do YouTube Music API
-                ytmusic = self.get_ytmusic_instance()
-                if not ytmusic:
-                    return None
-                
-                # Buscar por artista e título
-                search_query = f"{artist} {title}"
-                self.log_message(f"🖼️ YouTube Music: Buscando capa para '{search_query}' (tentativa {attempt})")
-                
-                results = ytmusic.search(search_query, filter="songs", limit=5)
-                
-                if results:
-                    for result in results:
-                        if result.get('resultType') == 'song':
-                            # Verificar se há thumbnail
-                            thumbnails = result.get('thumbnails', [])
-                            if thumbnails:
-                                # Pegar a thumbnail de maior resolução
-                                thumbnail_url = thumbnails[-1].get('url', '')
-                                if thumbnail_url:
-                                    # Baixar a imagem
-                                    response = requests.get(thumbnail_url, timeout=10)
-                                    if response.status_code == 200:
-                                        # Converter para PIL Image
-                                        image = Image.open(io.BytesIO(response.content))
-                                        
-                                        # Log das dimensões encontradas
-                                        self.log_message(f"✅ YouTube Music: Capa encontrada {image.size[0]}x{image.size[1]}")
-                                        
-                                        return image
-                
-                self.log_message(f"⚠️ YouTube Music: Nenhuma capa encontrada para '{search_query}'")
-                return None
-                
-            except Exception as e:
-                self.log_message(f"❌ YouTube Music capa tentativa {attempt} falhou: {e}")
-                
-                if attempt < max_attempts:
-                    # Reset da instância para tentar novamente
-                    self.reset_ytmusic_instance()
-                    time.sleep(1)
-                else:
-                    self.log_message("❌ YouTube Music capa: Todas as tentativas falharam")
-        
-        return None
-            
-    def search_cover_google(self, artist, title):
-        """Busca capa no Google (só para capas)"""
-        try:
-            query = f"{artist} {title} album cover"
-            search_url = f"https://www.google.com/search?q={query}&tbm=isch"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                self.log_message("⚠️ Google Images requer implementação de scraping")
-                return None
-            
-            return None
-        except Exception as e:
-            self.log_message(f"Erro Google: {e}")
-            return None
-            
-    def clean_filename(self, filename):
-        """Limpa nome do arquivo"""
-        original_filename = filename
-        
-        # Remover números no início
-        filename = re.sub(r'^\d+\.?\s*', '', filename)
-        
-        # Remover padrões comuns
-        patterns_to_remove = [
-            r'\s*\(?DVD\)?.*',
-            r'\s*\(?DIREITOS\s*AUTORAIS\)?.*',
-            # Variações de "Video Oficial"
-            r'\s*\(?VIDEO\s*OFICIAL\)?.*',
-            r'\s*\(?OFICIAL\s*VIDEO\)?.*',
-            r'\s*\(?OFFICIAL\s*VIDEO\)?.*',
-            r'\s*\(?VIDEO\s*OFFICIAL\)?.*',
-            r'\s*\(?CLIPE\s*OFICIAL\)?.*',
-            r'\s*\(?OFICIAL\s*CLIPE\)?.*',
-            r'\s*\(?VIDEO\s*CLIPE\)?.*',
-            r'\s*\(?CLIPE\s*VIDEO\)?.*',
-            r'\s*\(?VIDEOCLIP\)?.*',
-            r'\s*\(?VIDEO\s*CLIP\)?.*',
-            r'\s*\(?CLIP\s*VIDEO\)?.*',
-            # Outras variações de vídeo
-            r'\s*\(?LYRIC\s*VIDEO\)?.*',
-            r'\s*\(?VIDEO\s*LYRIC\)?.*',
-            r'\s*\(?LYRICS\s*VIDEO\)?.*',
-            r'\s*\(?VIDEO\s*LYRICS\)?.*',
-            r'\s*\(?MUSIC\s*VIDEO\)?.*',
-            r'\s*\(?VIDEO\s*MUSIC\)?.*',
-            r'\s*\(?OFFICIAL\s*AUDIO\)?.*',
-            r'\s*\(?AUDIO\s*OFICIAL\)?.*',
-            r'\s*\(?LYRICS?\)?.*',
-            r'\s*\(?LETRA\)?.*',
-            # Qualidade e formato
-            r'\s*\(?MV\)?.*',
-            r'\s*\(?HD\)?.*',
-            r'\s*\(?FULL\s*HD\)?.*',
-            r'\s*\(?4K\)?.*',
-            r'\s*\(?1080P\)?.*',
-            r'\s*\(?720P\)?.*',
-            r'\s*\(?480P\)?.*',
-            # Tipos de performance
-            r'\s*\(?LIVE\)?.*',
-            r'\s*\(?AO\s*VIVO\)?.*',
-            r'\s*\(?COVER\)?.*',
-            r'\s*\(?REMIX\)?.*',
-            r'\s*\(?VERSION\)?.*',
-            r'\s*\(?VERSAO\)?.*',
-            r'\s*\(?VERSÃO\)?.*',
-            r'\s*\(?EXPLICIT\)?.*',
-            r'\s*\(?CLEAN\)?.*',
-            r'\s*\(?ACOUSTIC\)?.*',
-            r'\s*\(?ACUSTICO\)?.*',
-            r'\s*\(?ACÚSTICO\)?.*',
-            r'\s*\(?INSTRUMENTAL\)?.*',
-            r'\s*\(?KARAOKE\)?.*',
-            r'\s*\(?RADIO\s*EDIT\)?.*',
-            r'\s*\(?EXTENDED\)?.*',
-            r'\s*\(?REMASTERED\)?.*',
-            r'\s*\(?REMASTERIZADO\)?.*',
-            r'\s*\(?DELUXE\)?.*',
-            r'\s*\(?BONUS\s*TRACK\)?.*',
-            r'\s*\(?FAIXA\s*BONUS\)?.*',
-            # Símbolos e caracteres especiais
-            r'\s*\[.*\]',  # Qualquer coisa entre colchetes
-            r'\s*\(.*\)',  # Qualquer coisa entre parênteses
-            r'\s*\{.*\}',  # Qualquer coisa entre chaves
-            r'\s*_+\s*',   # Múltiplos underscores
-            r'\s*-+\s*$',  # Hífens no final
-            r'\s*\|.*',    # Pipe e tudo depois
-            r'\s*#.*'      # Hashtag e tudo depois
-        ]
-        
-        for pattern in patterns_to_remove:
-            filename = re.sub(pattern, '', filename, flags=re.IGNORECASE)
-        
-        # Limpeza adicional para casos com underscores e separadores
-        # Remover palavras problemáticas que podem estar separadas por underscores
-        problematic_words = [
-            'video', 'oficial', 'official', 'clipe', 'clip', 'videoclip',
-            'lyric', 'lyrics', 'letra', 'music', 'audio', 'mv', 'hd', 'fullhd',
-            '4k', '1080p', '720p', '480p', 'live', 'aovivo', 'cover', 'remix',
-            'version', 'versao', 'versão', 'explicit', 'clean', 'acoustic',
-            'acustico', 'acústico', 'instrumental', 'karaoke', 'radioedit',
-            'extended', 'remastered', 'remasterizado', 'deluxe', 'bonus',
-            'bonustrack', 'faixabonus'
-        ]
-        
-        # Remover palavras problemáticas separadas por underscores ou hífens
-        for word in problematic_words:
-            # Padrões com underscores
-            filename = re.sub(rf'_{word}_?', '_', filename, flags=re.IGNORECASE)
-            filename = re.sub(rf'_{word}$', '', filename, flags=re.IGNORECASE)
-            filename = re.sub(rf'^{word}_', '', filename, flags=re.IGNORECASE)
-            # Padrões com hífens
-            filename = re.sub(rf'-{word}-?', '-', filename, flags=re.IGNORECASE)
-            filename = re.sub(rf'-{word}$', '', filename, flags=re.IGNORECASE)
-            filename = re.sub(rf'^{word}-', '', filename, flags=re.IGNORECASE)
-            # Padrões com espaços
-            filename = re.sub(rf'\s+{word}\s+', ' ', filename, flags=re.IGNORECASE)
-            filename = re.sub(rf'\s+{word}$', '', filename, flags=re.IGNORECASE)
-            filename = re.sub(rf'^{word}\s+', '', filename, flags=re.IGNORECASE)
-        
-        # Limpar múltiplos separadores consecutivos
-        filename = re.sub(r'_+', '_', filename)  # Múltiplos underscores
-        filename = re.sub(r'-+', '-', filename)  # Múltiplos hífens
-        filename = re.sub(r'\s+', ' ', filename)  # Múltiplos espaços
-        
-        # Remover separadores no início e fim
-        filename = filename.strip('_-. ')
-        
-        # Log da limpeza se houve mudança significativa
-        if original_filename != filename and len(filename) > 0:
-            self.log_message(f"🧹 Limpeza: '{original_filename}' → '{filename}'")
-        
-        return filename.strip()
-        
-    def sanitize_filename(self, filename):
-        """Remove caracteres especiais que causam problemas no Windows"""
-        if not filename:
-            return filename
-            
-        # Caracteres proibidos no Windows: < > : " | ? * \
-        # Também remover / que pode causar problemas
-        forbidden_chars = ['<', '>', ':', '"', '|', '?', '*', '\\', '/']
-        
-        # Substituir caracteres proibidos por equivalentes seguros ou remover
-        replacements = {
-            '<': '(',
-            '>': ')',
-            ':': ' -',
-            '"': "'",
-            '|': '-',
-            '?': '',
-            '*': '',
-            '\\': '-',
-            '/': '-'
-        }
-        
-        sanitized = filename
-        for char in forbidden_chars:
-            if char in replacements:
-                sanitized = sanitized.replace(char, replacements[char])
-            else:
-                sanitized = sanitized.replace(char, '')
-        
-        # Limpar espaços múltiplos e caracteres no início/fim
-        sanitized = re.sub(r'\s+', ' ', sanitized).strip()
-        
-        # Remover pontos no final (problemático no Windows)
-        sanitized = sanitized.rstrip('.')
-        
-        # Garantir que não está vazio
-        if not sanitized.strip():
-            sanitized = "arquivo_sem_nome"
-            
-        return sanitized
-        
-    def extract_artist_title(self, filename):
-        """Extrai artista e título do nome do arquivo"""
-        # Padrões simples de separação
-        separators = [" - ", " – ", " — ", " _ ", " by ", " BY "]
-        
-        for sep in separators:
-            if sep in filename:
-                parts = filename.split(sep, 1)
-                if len(parts) == 2:
-                    artist = parts[0].strip()
-                    title = parts[1].strip()
-                    
-                    if len(artist) >= 2 and len(title) >= 2:
-                        return artist, title
-        
-        # Se não encontrou separador, tentar dividir no meio
-        words = filename.split()
-        if len(words) >= 4:
-            mid = len(words) // 2
-            artist = ' '.join(words[:mid])
-            title = ' '.join(words[mid:])
-            return artist, title
-        
-        return None, None
-        
-    def smart_capitalize(self, text):
-        """Capitalização inteligente"""
-        if not text:
-            return text
-        
-        words = text.split(' ')
-        small_words = {
-            'de', 'do', 'da', 'dos', 'das', 'e', 'ou', 'com', 
-            'sem', 'para', 'por', 'em', 'no', 'na', 'um', 'uma',
-            'o', 'a', 'os', 'as'
-        }
-        
-        for i, word in enumerate(words):
-            if word:
-                if i == 0 or word.lower() not in small_words:
-                    # Manter siglas (todas maiúsculas)
-                    if not word.isupper():
-                        words[i] = word[0].upper() + word[1:].lower()
-                else:
-                    words[i] = word.lower()
-        
-        return ' '.join(words)
-        
     def start_manual_processing(self):
         """Inicia edição manual"""
         if not self.selected_folder.get():
@@ -2480,10 +1891,9 @@ class FinalMP3Tool:
             
     def start_manual_edit(self, event):
         """Inicia edição manual de uma linha"""
-        item = self.files_tree.selection()[0]
-        index = int(self.files_tree.item(item, "values")[0]) - 1
+        index = self.file_list.selected_index()
         
-        if 0 <= index < len(self.files_data):
+        if index is not None and 0 <= index < len(self.files_data):
             self.edit_file_manual(index)
             
     def edit_file_manual(self, index):
@@ -2523,8 +1933,9 @@ class FinalMP3Tool:
         
         # Mostrar capa atual se existir
         cover_label = None
-        if file_data['cover']:
-            cover_image = file_data['cover'].copy()
+        preview = self.get_cover_preview(file_data)
+        if preview:
+            cover_image = preview.copy()
             cover_image.thumbnail((150, 150), Image.Resampling.LANCZOS)
             photo = ImageTk.PhotoImage(cover_image)
             cover_label = ttk.Label(cover_frame, image=photo)
@@ -2637,11 +2048,11 @@ class FinalMP3Tool:
         file_data = self.files_data[index]
         
         try:
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             if response.status_code == 200:
                 image = Image.open(io.BytesIO(response.content))
-                image.thumbnail((80, 80), Image.Resampling.LANCZOS)
-                
+                image.load()
+                # Tamanho original: a lista e a janela de edição fazem suas próprias miniaturas
                 file_data['cover'] = image
                 self.update_file_in_tree(index, file_data)
                 
@@ -2662,10 +2073,11 @@ class FinalMP3Tool:
             
     def show_context_menu(self, event):
         """Mostra menu de contexto"""
-        item = self.files_tree.selection()[0]
-        index = int(self.files_tree.item(item, "values")[0]) - 1
+        index = self.file_list.index_of(self.files_tree.identify_row(event.y))
+        if index is None:
+            index = self.file_list.selected_index()
         
-        if 0 <= index < len(self.files_data):
+        if index is not None and 0 <= index < len(self.files_data):
             context_menu = tk.Menu(self.root, tearoff=0)
             context_menu.add_command(label="Edit", command=lambda: self.edit_file_manual(index))
             context_menu.add_command(label="Search Cover", command=lambda: self.search_cover_for_file(index, None))
@@ -2683,13 +2095,9 @@ class FinalMP3Tool:
     
     def on_double_click(self, event):
         """Função chamada quando há duplo clique na TreeView para editar arquivo"""
-        if not self.files_tree.selection():
-            return
-            
-        item = self.files_tree.selection()[0]
-        index = int(self.files_tree.item(item, "values")[0]) - 1
+        index = self.file_list.selected_index()
         
-        if 0 <= index < len(self.files_data):
+        if index is not None and 0 <= index < len(self.files_data):
             self.edit_file_manual(index)
                 
     def open_file_folder(self, index):
@@ -2711,6 +2119,7 @@ class FinalMP3Tool:
             if result:
                 # Remove from data list
                 self.files_data.pop(index)
+                self.files_by_path.pop(file_data['path_key'], None)
                 
                 # Refresh the tree view
                 self.refresh_tree_view()
@@ -2719,58 +2128,41 @@ class FinalMP3Tool:
                 
     def refresh_tree_view(self):
         """Refresh the tree view with current files data"""
-        # Clear existing items
-        for item in self.files_tree.get_children():
-            self.files_tree.delete(item)
-            
-        # Clear cover thumbnails cache
-        if hasattr(self, 'cover_thumbnails'):
-            self.cover_thumbnails.clear()
-        else:
-            self.cover_thumbnails = {}
-            
-        # Re-populate with current data
+        self.file_list.refresh()
+    
+    def file_row_values(self, i):
+        """Column values for row i of the file list"""
+        file_data = self.files_data[i]
         # Columns order: ("#", "Album", "Original", "New", "Artist", "Title", "Status")
-        for i, file_data in enumerate(self.files_data):
-            filename = os.path.basename(file_data['path'])
-            artist = file_data.get('artist', '')
-            title = file_data.get('title', '')
-            album = file_data.get('album', '')
-            status = file_data.get('status', 'Pending')
-            # Usar 'new' ou 'new_name' dependendo da estrutura
-            new_name = file_data.get('new', file_data.get('new_name', ''))
-            
-            # Inserir item com ou sem capa
-            if file_data.get('cover'):
-                # Criar preview da capa
-                cover_image = file_data['cover'].copy()
-                cover_image.thumbnail((80, 80), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(cover_image)
-                
-                # Inserir item com imagem
-                item = self.files_tree.insert('', 'end', image=photo, values=(
-                    i + 1,      # #
-                    album,      # Album
-                    filename,   # Original Name
-                    new_name,   # New Name
-                    artist,     # Artist
-                    title,      # Title
-                    status      # Status
-                ))
-                
-                # Manter referência da imagem para evitar GC
-                self.cover_thumbnails[item] = photo
-            else:
-                # Inserir item sem imagem
-                self.files_tree.insert('', 'end', values=(
-                    i + 1,      # #
-                    album,      # Album
-                    filename,   # Original Name
-                    new_name,   # New Name
-                    artist,     # Artist
-                    title,      # Title
-                    status      # Status
-                ))
+        return (
+            i + 1,                                                   # #
+            file_data.get('album', ''),                              # Album
+            os.path.basename(file_data['path']),                     # Original Name
+            file_data.get('new', file_data.get('new_name', '')),     # New Name
+            file_data.get('artist', ''),                             # Artist
+            file_data.get('title', ''),                              # Title
+            file_data.get('status', 'Pending')                       # Status
+        )
+    
+    def file_row_image(self, i):
+        """Cover PhotoImage for row i, or '' until its preview is decoded"""
+        file_data = self.files_data[i]
+        cover = file_data.get('cover')
+        if cover:
+            # Covers found this session: build the preview once per image
+            cached = self.session_cover_photos.get(id(cover))
+            if cached and cached[0] is cover:
+                return cached[1]
+            preview = cover.copy()
+            preview.thumbnail((80, 80), Image.Resampling.LANCZOS)
+            photo = ImageTk.PhotoImage(preview)
+            self.remember(self.session_cover_photos, id(cover), (cover, photo))
+            return photo
+        
+        ref = file_data.get('cover_ref')
+        if ref:
+            return self.cover_photos.get(ref['hash'], '')
+        return ''
     
     def sort_by_status(self):
         """Sort files by status column"""
@@ -2859,7 +2251,7 @@ class FinalMP3Tool:
                     # Rename the file
                     if new_path != current_path:
                         os.rename(current_path, new_path)
-                        file_data['path'] = new_path
+                        self.set_file_path(file_data, new_path)
                         
                         # Update in tree view
                         self.update_file_in_tree(index, file_data)
@@ -2879,14 +2271,11 @@ class FinalMP3Tool:
     # New functions for action buttons
     def get_selected_file_index(self):
         """Get the index of the currently selected file"""
-        selection = self.files_tree.selection()
-        if not selection:
+        index = self.file_list.selected_index()
+        if index is None:
             messagebox.showwarning("No Selection", "Please select a file first.")
             return None
         
-        item = selection[0]
-        index = int(self.files_tree.item(item, "values")[0]) - 1
-        
         if 0 <= index < len(self.files_data):
             return index
         return None
@@ -2929,31 +2318,6 @@ class FinalMP3Tool:
         if index is not None:
             self.open_file_folder(index)
     
-    def normalize_album_name(self, album_name):
-        """Normaliza nome do álbum removendo variações desnecessárias"""
-        if not album_name:
-            return ""
-        
-        # Remover caracteres especiais e espaços extras
-        normalized = re.sub(r'[^\w\s-]', '', album_name)
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        # Remover sufixos comuns que causam separação
-        suffixes_to_remove = [
-            r'\s*-\s*\d{4}$',  # Remove " - 2024"
-            r'\s*\(\d{4}\)$',  # Remove " (2024)"
-            r'\s*\[\d{4}\]$',  # Remove " [2024]"
-            r'\s*-\s*deluxe.*$',  # Remove " - deluxe edition"
-            r'\s*-\s*extended.*$',  # Remove " - extended"
-            r'\s*-\s*remaster.*$',  # Remove " - remastered"
-            r'\s*-\s*special.*$',  # Remove " - special edition"
-        ]
-        
-        for suffix in suffixes_to_remove:
-            normalized = re.sub(suffix, '', normalized, flags=re.IGNORECASE)
-        
-        return normalized.strip()
-    
     def detect_album_inconsistencies(self):
         """Detecta e sugere correções para álbuns inconsistentes"""
         if not self.files_data:
@@ -3084,44 +2448,8 @@ class FinalMP3Tool:
         
     def update_file_in_tree(self, index, file_data):
         """Atualiza arquivo na treeview com preview da capa imediato"""
-        # Encontrar item na treeview
-        items = self.files_tree.get_children()
-        if index < len(items):
-            item = items[index]
-            
-            # Mostrar capa
-            if file_data['cover']:
-                # Criar preview da capa maior
-                cover_image = file_data['cover'].copy()
-                cover_image.thumbnail((80, 80), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(cover_image)
-                
-                # Atualizar item com imagem (sem coluna "Capa" duplicada)
-                self.files_tree.item(item, image=photo, values=(
-                    file_data['index'],
-                    file_data['album'],
-                    file_data['original'],
-                    file_data['new'],
-                    file_data['artist'],
-                    file_data['title'],
-                    file_data['status']
-                ))
-                
-                # Manter referência da imagem por item para evitar GC
-                if not hasattr(self, 'cover_thumbnails'):
-                    self.cover_thumbnails = {}
-                self.cover_thumbnails[item] = photo
-            else:
-                # Sem capa
-                self.files_tree.item(item, values=(
-                    file_data['index'],
-                    file_data['album'],
-                    file_data['original'],
-                    file_data['new'],
-                    file_data['artist'],
-                    file_data['title'],
-                    file_data['status']
-                ))
+        # Only rows currently materialized in the virtual list are touched
+        self.file_list.update_row(index)
             
     def save_changes(self):
         """Salva todas as alterações"""
@@ -3163,70 +2491,24 @@ class FinalMP3Tool:
     def save_all_changes(self):
         """Salva todas as alterações fisicamente"""
         try:
-            if hasattr(self, 'save_destination') and self.save_destination:
-                self.log_message(f"💾 Salvando arquivos na pasta: {self.save_destination}")
+            destination = getattr(self, 'save_destination', None)
+            if destination:
+                self.log_message(f"💾 Salvando arquivos na pasta: {destination}")
             else:
                 self.log_message("💾 Salvando arquivos nas localizações originais")
             self.log_message("=" * 70)
             
-            saved_count = 0
+            self.reset_save_stats()
             
-            for i, file_data in enumerate(self.files_data):
-                try:
-                    old_path = file_data['path']
-                    
-                    # Determine destination path
-                    if hasattr(self, 'save_destination') and self.save_destination:
-                        # Save to chosen folder
-                        filename = file_data.get('new', file_data['original'])
-                        # Sanitizar nome do arquivo para remover caracteres especiais
-                        filename = self.sanitize_filename(filename)
-                        if not filename.endswith('.mp3'):
-                            filename += '.mp3'
-                        new_path = os.path.join(self.save_destination, filename)
-                    else:
-                        # Save in original location with new name if changed
-                        if file_data.get('new') and file_data['new'] != file_data['original']:
-                            # Sanitizar nome do arquivo para remover caracteres especiais
-                            sanitized_name = self.sanitize_filename(file_data['new'])
-                            new_path = os.path.join(os.path.dirname(old_path), sanitized_name + '.mp3')
-                        else:
-                            new_path = old_path
-                    
-                    # Copy or rename file
-                    if new_path != old_path:
-                        if hasattr(self, 'save_destination') and self.save_destination:
-                            # Copy to new location
-                            import shutil
-                            shutil.copy2(old_path, new_path)
-                            self.log_message(f"📁 Copiado: {os.path.basename(old_path)} → {filename}")
-                        else:
-                            # Rename in place
-                            if not os.path.exists(new_path):
-                                os.rename(old_path, new_path)
-                                self.log_message(f"📝 Renomeado: {file_data['original']} → {file_data['new']}.mp3")
-                            else:
-                                self.log_message(f"⚠️ Arquivo já existe: {file_data['new']}.mp3")
-                                continue
-                        
-                        file_data['path'] = new_path
-                    
-                    # Update metadata
-                    self.set_text_tags(new_path, file_data['artist'], file_data['title'], 
-                                     file_data['album'], track_number=file_data['index'])
-                    self.log_message(f"🏷️ Metadados atualizados (faixa #{file_data['index']})")
-                    
-                    # Add cover if found
-                    if file_data['cover']:
-                        self.embed_cover_art(new_path, file_data['cover'], None)
-                        self.log_message(f"🖼️ Capa adicionada ao arquivo")
-                    
-                    saved_count += 1
-                    
-                except Exception as e:
-                    self.log_message(f"❌ Erro ao salvar {file_data['original']}: {e}")
+            def report(i, file_data, saved, error):
+                if error:
+                    self.log_message(f"❌ Erro ao salvar {file_data['original']}: {error}")
+            
+            # Pastas diferentes são gravadas em paralelo; cada pasta em ordem
+            saved_count = self.save_files(self.files_data, destination, report)
             
             self.log_message("=" * 70)
+            self.log_save_stats()
             self.log_message(f"✅ Gravação concluída! {saved_count} arquivos salvos.")
             
         except Exception as e:
@@ -3234,326 +2516,6 @@ class FinalMP3Tool:
         finally:
             self.root.after(0, self.save_finished)
             
-    def set_text_tags(self, path, artist, title, album, year=None, track_number=None):
-        """Atualiza metadados do arquivo com ID3 v2.3 e UTF-16"""
-        try:
-            # Usar mutagen diretamente para controle total sobre TPE2 e codificação
-            from mutagen.id3 import ID3, TIT2, TPE1, TALB, TPE2, TDRC, TRCK, ID3NoHeaderError, Encoding
-            
-            try:
-                tags = ID3(path)
-            except ID3NoHeaderError:
-                tags = ID3()
-            
-            # LIMPAR CAMPOS DESNECESSÁRIOS que podem causar problemas em carros
-            campos_para_remover = ['TPE3', 'TPE4', 'TCOM', 'TCON', 'TPOS', 'TPUB', 'TCOP', 'TENC', 'TSSE', 'TLAN', 'TIPL', 'TMCL']
-            campos_removidos = []
-            for campo in campos_para_remover:
-                if campo in tags:
-                    del tags[campo]
-                    campos_removidos.append(campo)
-            
-            if campos_removidos:
-                self.log_message(f"  🧹 Removidos campos desnecessários: {', '.join(campos_removidos)}")
-            
-            # Configurar codificação UTF-16 para ID3v2.3
-            encoding = Encoding.UTF16
-            
-            # GRAVAÇÃO SELETIVA: Gravar ou remover tags baseado nas configurações
-            if artist and self.save_artist_tag.get():
-                artist_clean = self.transliterate_if_needed(artist)
-                tags["TPE1"] = TPE1(encoding=encoding, text=[artist_clean])
-                self.log_message(f"  🎤 Tag Artista gravada: {artist_clean}")
-            elif not self.save_artist_tag.get():
-                # Remover tag de artista se checkbox estiver desmarcado
-                if "TPE1" in tags:
-                    del tags["TPE1"]
-                    self.log_message(f"  🗑️ Tag Artista removida (checkbox desmarcado)")
-            
-            if title and self.save_title_tag.get():
-                title_clean = self.transliterate_if_needed(title)
-                tags["TIT2"] = TIT2(encoding=encoding, text=[title_clean])
-                self.log_message(f"  🎵 Tag Título gravada: {title_clean}")
-            elif not self.save_title_tag.get():
-                # Remover tag de título se checkbox estiver desmarcado
-                if "TIT2" in tags:
-                    del tags["TIT2"]
-                    self.log_message(f"  🗑️ Tag Título removida (checkbox desmarcado)")
-            
-            if album and self.save_album_tag.get():
-                album_normalized = self.transliterate_if_needed(album)
-                tags["TALB"] = TALB(encoding=encoding, text=[album_normalized])
-                self.log_message(f"  💿 Tag Álbum gravada: {album_normalized}")
-            elif not self.save_album_tag.get():
-                # Remover tag de álbum se checkbox estiver desmarcado
-                if "TALB" in tags:
-                    del tags["TALB"]
-                    self.log_message(f"  🗑️ Tag Álbum removida (checkbox desmarcado)")
-            
-            # IMPORTANTE: TPE2 (AlbumArtist) para sistemas de carros - só se habilitado
-            if album and self.save_album_tag.get() and self.save_albumartist_tag.get():
-                album_normalized = self.transliterate_if_needed(album)
-                album_artist = self.determine_album_artist(album_normalized, artist)
-                tags["TPE2"] = TPE2(encoding=encoding, text=[album_artist])
-                self.log_message(f"  👥 Tag AlbumArtist gravada: {album_artist}")
-            elif not self.save_albumartist_tag.get():
-                # Remover tag de AlbumArtist se checkbox estiver desmarcado
-                if "TPE2" in tags:
-                    del tags["TPE2"]
-                    self.log_message(f"  🗑️ Tag AlbumArtist removida (checkbox desmarcado)")
-                
-            if year and self.save_year_tag.get():
-                tags["TDRC"] = TDRC(encoding=encoding, text=[str(year)])
-                self.log_message(f"  📅 Tag Ano gravada: {year}")
-            elif not self.save_year_tag.get():
-                # Remover tag de ano se checkbox estiver desmarcado
-                if "TDRC" in tags:
-                    del tags["TDRC"]
-                    self.log_message(f"  🗑️ Tag Ano removida (checkbox desmarcado)")
-                
-            if track_number and self.save_track_tag.get():
-                tags["TRCK"] = TRCK(encoding=encoding, text=[str(track_number)])
-                self.log_message(f"  🔢 Tag Faixa gravada: {track_number}")
-            elif not self.save_track_tag.get():
-                # Remover tag de faixa se checkbox estiver desmarcado
-                if "TRCK" in tags:
-                    del tags["TRCK"]
-                    self.log_message(f"  🗑️ Tag Faixa removida (checkbox desmarcado)")
-            
-            # Salvar com ID3 v2.3 e UTF-16
-            tags.save(path, v2_version=3)
-            
-            # LIMPEZA FINAL: Verificar se campos problemáticos foram re-adicionados
-            try:
-                final_tags = ID3(path)
-                campos_problematicos = ['TSSE', 'TPE3', 'TPE4', 'TCOM', 'TCON', 'TIPL', 'TMCL']
-                campos_removidos_final = []
-                
-                for campo in campos_problematicos:
-                    if campo in final_tags:
-                        del final_tags[campo]
-                        campos_removidos_final.append(campo)
-                
-                if campos_removidos_final:
-                    final_tags.save(path, v2_version=3)
-                    self.log_message(f"  🧹 Limpeza final: removidos {', '.join(campos_removidos_final)}")
-            except:
-                pass
-            
-        except Exception as e:
-            # Fallback para EasyID3 se houver erro
-            try:
-                # PRIMEIRO: Limpar campos desnecessários usando ID3 direto
-                try:
-                    from mutagen.id3 import ID3, ID3NoHeaderError
-                    id3_tags = ID3(path)
-                    campos_para_remover = ['TPE3', 'TPE4', 'TCOM', 'TCON', 'TPOS', 'TPUB', 'TCOP', 'TENC', 'TSSE', 'TLAN', 'TIPL', 'TMCL']
-                    campos_removidos = []
-                    for campo in campos_para_remover:
-                        if campo in id3_tags:
-                            del id3_tags[campo]
-                            campos_removidos.append(campo)
-                    if campos_removidos:
-                        self.log_message(f"  🧹 [Fallback] Removidos: {', '.join(campos_removidos)}")
-                        id3_tags.save(path, v2_version=3)
-                except:
-                    pass
-                
-                # DEPOIS: Usar EasyID3 para definir campos essenciais - GRAVAÇÃO SELETIVA
-                tags = self.ensure_easyid3(path)
-                
-                # Artista
-                if artist and self.save_artist_tag.get():
-                    tags["artist"] = self.transliterate_if_needed(artist)
-                    self.log_message(f"  🎤 [Fallback] Tag Artista gravada: {artist}")
-                elif not self.save_artist_tag.get():
-                    if "artist" in tags:
-                        del tags["artist"]
-                        self.log_message(f"  🗑️ [Fallback] Tag Artista removida (checkbox desmarcado)")
-                
-                # Título
-                if title and self.save_title_tag.get():
-                    tags["title"] = self.transliterate_if_needed(title)
-                    self.log_message(f"  🎵 [Fallback] Tag Título gravada: {title}")
-                elif not self.save_title_tag.get():
-                    if "title" in tags:
-                        del tags["title"]
-                        self.log_message(f"  🗑️ [Fallback] Tag Título removida (checkbox desmarcado)")
-                
-                # Álbum
-                if album and self.save_album_tag.get():
-                    album_normalized = self.transliterate_if_needed(album)
-                    tags["album"] = album_normalized
-                    self.log_message(f"  💿 [Fallback] Tag Álbum gravada: {album_normalized}")
-                elif not self.save_album_tag.get():
-                    if "album" in tags:
-                        del tags["album"]
-                        self.log_message(f"  🗑️ [Fallback] Tag Álbum removida (checkbox desmarcado)")
-                
-                # AlbumArtist
-                if album and self.save_album_tag.get() and self.save_albumartist_tag.get():
-                    album_normalized = self.transliterate_if_needed(album)
-                    album_artist = self.determine_album_artist(album_normalized, artist)
-                    tags["albumartist"] = album_artist
-                    self.log_message(f"  👥 [Fallback] Tag AlbumArtist gravada: {album_artist}")
-                elif not self.save_albumartist_tag.get():
-                    if "albumartist" in tags:
-                        del tags["albumartist"]
-                        self.log_message(f"  🗑️ [Fallback] Tag AlbumArtist removida (checkbox desmarcado)")
-                
-                # Ano
-                if year and self.save_year_tag.get():
-                    tags["date"] = str(year)
-                    self.log_message(f"  📅 [Fallback] Tag Ano gravada: {year}")
-                elif not self.save_year_tag.get():
-                    if "date" in tags:
-                        del tags["date"]
-                        self.log_message(f"  🗑️ [Fallback] Tag Ano removida (checkbox desmarcado)")
-                
-                # Faixa
-                if track_number and self.save_track_tag.get():
-                    tags["tracknumber"] = str(track_number)
-                    self.log_message(f"  🔢 [Fallback] Tag Faixa gravada: {track_number}")
-                elif not self.save_track_tag.get():
-                    if "tracknumber" in tags:
-                        del tags["tracknumber"]
-                        self.log_message(f"  🗑️ [Fallback] Tag Faixa removida (checkbox desmarcado)")
-                tags.save(v2_version=3)
-                
-                # LIMPEZA FINAL: Verificar se TSSE foi adicionado automaticamente e removê-lo
-                try:
-                    from mutagen.id3 import ID3
-                    final_tags = ID3(path)
-                    if 'TSSE' in final_tags:
-                        del final_tags['TSSE']
-                        final_tags.save(path, v2_version=3)
-                        self.log_message(f"  🧹 [Fallback] TSSE removido após salvamento")
-                except:
-                    pass
-                    
-            except Exception as e2:
-                self.log_message(f"  Erro ao atualizar metadados: {e2}")
-    
-    def determine_album_artist(self, album, artist):
-        """Determina o AlbumArtist mais apropriado para sistemas de carros"""
-        if not album:
-            return "Various Artists"
-        
-        # Se o álbum contém palavras como "mix", "compilation", "various", usar "Various Artists"
-        album_lower = album.lower()
-        compilation_keywords = ['mix', 'compilation', 'various', 'collection', 'hits', 'best of']
-        
-        for keyword in compilation_keywords:
-            if keyword in album_lower:
-                return "Various Artists"
-        
-        # Se o nome do álbum contém o nome do artista, usar o artista
-        if artist and artist.lower() in album_lower:
-            return artist
-        
-        # Para álbuns genéricos (como "musicas 2024"), usar "Various Artists"
-        generic_keywords = ['musicas', 'songs', 'music', 'tracks']
-        for keyword in generic_keywords:
-            if keyword in album_lower:
-                return "Various Artists"
-        
-        # Caso padrão: usar "Various Artists" para garantir agrupamento
-        return "Various Artists"
-            
-    def embed_cover_art(self, path, image, mime):
-        """Adiciona capa ao arquivo, substituindo existente"""
-        try:
-            filename = os.path.basename(path)
-            self.log_message(f"🖼️ Embutindo capa em: {filename}")
-            
-            # Melhorar qualidade da imagem
-            # Redimensionar para uma resolução ótima se necessário
-            max_size = 1000  # Tamanho máximo recomendado para capas
-            if image.size[0] > max_size or image.size[1] > max_size:
-                # Manter proporção ao redimensionar
-                image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
-                self.log_message(f"   📐 Imagem redimensionada para: {image.size[0]}x{image.size[1]}")
-            
-            # Converter imagem para bytes com alta qualidade
-            img_byte_arr = io.BytesIO()
-            
-            # Detectar formato original da imagem
-            original_format = image.format if hasattr(image, 'format') else None
-            
-            # Preferir PNG se a imagem original for PNG ou se tiver transparência
-            if (original_format == 'PNG' or 
-                (hasattr(image, 'mode') and image.mode in ('RGBA', 'LA')) or
-                (hasattr(image, 'info') and 'transparency' in image.info)):
-                
-                # Salvar como PNG para preservar qualidade e transparência
-                image.save(img_byte_arr, format='PNG', optimize=True)
-                mime = 'image/png'
-                self.log_message(f"   🎨 Formato PNG preservado para melhor qualidade")
-            else:
-                # Usar qualidade 95% para JPEG (padrão é 75%)
-                image.save(img_byte_arr, format='JPEG', quality=95, optimize=True)
-                mime = 'image/jpeg'
-                self.log_message(f"   🎨 Convertido para JPEG com qualidade 95%")
-            
-            img_byte_arr = img_byte_arr.getvalue()
-            
-            self.log_message(f"   📏 Tamanho da imagem: {len(img_byte_arr)} bytes")
-            
-            audio = MP3(path, ID3=ID3)
-            if audio.tags is None:
-                audio.add_tags()
-                self.log_message(f"   🏷️ Tags ID3 criadas")
-            
-            # Remover todas as capas existentes
-            audio.tags.delall("APIC")
-            self.log_message(f"   🗑️ Capas existentes removidas")
-            
-            # Adicionar nova capa
-            audio.tags.add(APIC(encoding=3, mime=mime, type=3, desc="Front cover", data=img_byte_arr))
-            self.log_message(f"   ➕ Nova capa adicionada")
-            
-            # Salvar com versão ID3 v2.3
-            audio.save(v2_version=3)
-            self.log_message(f"   ✅ Arquivo salvo com capa embutida")
-            
-            # Verificar se a capa foi realmente salva
-            audio_check = MP3(path, ID3=ID3)
-            if audio_check.tags:
-                for frame in audio_check.tags.values():
-                    if isinstance(frame, APIC):
-                        self.log_message(f"   ✅ Verificação: Capa embutida confirmada!")
-                        return
-            self.log_message(f"   ⚠️ Verificação: Capa não encontrada após salvamento")
-            
-        except Exception as e:
-            filename = os.path.basename(path)
-            self.log_message(f"❌ Erro ao embutir capa em {filename}: {e}")
-            
-    def ensure_easyid3(self, path):
-        """Garante que o arquivo tem tags ID3 v2.3"""
-        try:
-            return EasyID3(path)
-        except Exception:
-            audio = MP3(path, ID3=ID3)
-            if audio.tags is None:
-                audio.add_tags()
-            # Salvar com versão ID3 v2.3
-            audio.save(v2_version=3)
-            return EasyID3(path)
-            
-    def transliterate_if_needed(self, text):
-        """Translitera apenas se contém caracteres não-LATIN"""
-        if not text:
-            return ""
-        
-        # Verificar se contém caracteres não-LATIN
-        has_non_latin = any(ord(char) > 127 for char in text)
-        
-        if has_non_latin:
-            return unidecode(text).strip()
-        else:
-            return text.strip()
-            
     def processing_finished(self):
         """Chamado quando o processamento termina"""
         self.process_btn.config(state="normal")
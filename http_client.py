@@ -0,0 +1,155 @@
+"""
+MP3 Album Tool - HTTP client
+One keep-alive requests.Session per host, with pools sized for the lookup workers
+and the requests to each metadata source rate limited
+"""
+
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import DEFAULT_RATE_LIMITS, SOURCE_HOSTS, AdaptiveLimiter, LimitedAdapter
+
+
+class HttpClient:
+    """Shared HTTP client for all metadata and cover requests.
+
+    Each host gets its own session (and so its own connection pool), so the
+    handshake to api.deezer.com is paid once per pooled connection instead of
+    once per lookup. ``pool_size`` should match the number of threads that
+    may talk to the same host at once.
+
+    Hosts listed in rate_limiter.SOURCE_HOSTS share one AdaptiveLimiter per
+    source, configured from ``rate_limits`` ({source: (rate, burst)}).
+    new_session() gives a client that keeps state in its session (cookies,
+    headers) a session of its own, still counted against the host's limit.
+    """
+
+    def __init__(self, pool_size: int = 8, rate_limits: dict = None):
+        self.pool_size = max(1, int(pool_size))
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS)
+        self.rate_limits.update(rate_limits or {})
+        self.limiters = {}
+        self._sessions = {}
+        self._own_sessions = weakref.WeakKeyDictionary()  # session -> host, see new_session()
+        self._lock = threading.Lock()
+
+    def _make_adapter(self, host: str, pool_size: int = None):
+        pool_size = pool_size or self.pool_size
+        source = SOURCE_HOSTS.get(host)
+        if source in self.rate_limits:
+            return LimitedAdapter(self._limiter_for(source),
+                                  pool_connections=1, pool_maxsize=pool_size)
+        return HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+
+    def _limiter_for(self, source: str) -> AdaptiveLimiter:
+        limiter = self.limiters.get(source)
+        if limiter is None:
+            rate, burst = self.rate_limits[source]
+            limiter = AdaptiveLimiter(rate, burst, self.pool_size)
+            self.limiters[source] = limiter
+        return limiter
+
+    def set_rate_limit(self, source: str, rate: float, burst: int):
+        """Change a source's request rate (requests per second) and burst"""
+        with self._lock:
+            self.rate_limits[source] = (rate, burst)
+            if source in self.limiters:
+                self.limiters[source].configure(rate=rate, burst=burst)
+
+    def throttled(self, url: str):
+        """Report a throttling answer the adapter can't see (e.g. an error in a 200 body)"""
+        source = SOURCE_HOSTS.get(urlsplit(url).netloc)
+        limiter = self.limiters.get(source)
+        if limiter:
+            limiter.on_throttle()
+
+    def session_for(self, host: str) -> requests.Session:
+        """The pooled session for a host (created on first use)"""
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = self._make_adapter(host)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def new_session(self, host: str) -> requests.Session:
+        """A separate keep-alive session for host, used by one thread at a time.
+
+        It has its own cookies and connection, and shares the host's rate
+        limiter. It is dropped with its owner.
+        """
+        session = requests.Session()
+        with self._lock:
+            adapter = self._make_adapter(host, pool_size=1)
+            self._own_sessions[session] = host
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """requests.get through the pooled session of the URL's host"""
+        return self.session_for(urlsplit(url).netloc).get(url, **kwargs)
+
+    def set_pool_size(self, pool_size: int):
+        """Resize the pools (existing connections of resized hosts are dropped)"""
+        pool_size = max(1, int(pool_size))
+        with self._lock:
+            if pool_size == self.pool_size:
+                return
+            self.pool_size = pool_size
+            for limiter in self.limiters.values():
+                limiter.configure(max_concurrency=pool_size)
+            for host, session in self._sessions.items():
+                old = session.get_adapter('https://')
+                adapter = self._make_adapter(host)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                old.close()
+
+    def stats(self) -> dict:
+        """Per-host {'requests', 'connections', 'reused'} from the urllib3 pools"""
+        result = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+            sessions += [(host, session) for session, host in list(self._own_sessions.items())]
+        for host, session in sessions:
+            requests_made = connections = 0
+            pools = session.get_adapter('https://').poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    requests_made += pool.num_requests
+                    connections += pool.num_connections
+            if requests_made:
+                stats = result.setdefault(host, {'requests': 0, 'connections': 0, 'reused': 0})
+                stats['requests'] += requests_made
+                stats['connections'] += connections
+                stats['reused'] += requests_made - connections
+        return result
+
+    def limiter_stats(self) -> dict:
+        """Per-source current rate, parallel requests and throttling count"""
+        with self._lock:
+            limiters = list(self.limiters.items())
+        return {source: {'rate': round(limiter.bucket.rate, 2),
+                         'concurrency': int(limiter.concurrency),
+                         'requests': limiter.requests,
+                         'throttled': limiter.throttled}
+                for source, limiter in limiters if limiter.requests}
+
+    def close(self):
+        with self._lock:
+            for session in list(self._sessions.values()) + list(self._own_sessions.keys()):
+                session.close()
+            self._sessions.clear()
+            self._own_sessions.clear()
@@ -0,0 +1,213 @@
+"""
+MP3 Album Tool - Header-only ID3 reader
+Reads just the ID3v2 tag at the start of the file (sized from its header)
+and decodes TPE1/TIT2/TALB/TRCK/APIC without syncing to the MPEG stream.
+"""
+
+import hashlib
+import struct
+
+# Frame IDs we decode, per ID3v2 major version
+WANTED_FRAMES = {
+    2: {'TP1': 'artist', 'TT2': 'title', 'TAL': 'album', 'TRK': 'track', 'PIC': 'cover'},
+    3: {'TPE1': 'artist', 'TIT2': 'title', 'TALB': 'album', 'TRCK': 'track', 'APIC': 'cover'},
+    4: {'TPE1': 'artist', 'TIT2': 'title', 'TALB': 'album', 'TRCK': 'track', 'APIC': 'cover'},
+}
+
+PIC_FORMATS = {'JPG': 'image/jpeg', 'PNG': 'image/png'}
+
+TEXT_ENCODINGS = {0: 'latin-1', 1: 'utf-16', 2: 'utf-16-be', 3: 'utf-8'}
+
+
+class ID3Malformed(ValueError):
+    """The tag can't be read by the fast path; use the full parser instead"""
+
+
+def _syncsafe(data: bytes) -> int:
+    if any(b & 0x80 for b in data):
+        raise ID3Malformed("invalid syncsafe integer")
+    value = 0
+    for b in data:
+        value = (value << 7) | b
+    return value
+
+
+def _unsynchronise(data: bytes) -> bytes:
+    return data.replace(b'\xff\x00', b'\xff')
+
+
+def _decode_text(payload: bytes) -> str:
+    if not payload:
+        return ''
+    encoding = TEXT_ENCODINGS.get(payload[0])
+    if encoding is None:
+        raise ID3Malformed("unknown text encoding")
+    try:
+        text = payload[1:].decode(encoding)
+    except UnicodeDecodeError:
+        raise ID3Malformed("undecodable text frame")
+    # Multiple values are NUL separated; the file list only shows the first
+    return text.split('\x00')[0].strip()
+
+
+def _skip_terminated(payload: bytes, pos: int, wide: bool) -> int:
+    """Return the index just past the NUL terminator starting at pos"""
+    if wide:
+        while pos + 1 < len(payload):
+            if payload[pos] == 0 and payload[pos + 1] == 0:
+                return pos + 2
+            pos += 2
+    else:
+        end = payload.find(b'\x00', pos)
+        if end >= 0:
+            return end + 1
+    raise ID3Malformed("unterminated string in picture frame")
+
+
+def _picture_start(payload: bytes, version: int):
+    """Return (mime, offset of the image bytes inside the frame payload)"""
+    if not payload:
+        raise ID3Malformed("empty picture frame")
+    wide = payload[0] in (1, 2)
+    if version == 2:
+        mime = PIC_FORMATS.get(payload[1:4].decode('latin-1').upper(), 'image/')
+        pos = 4
+    else:
+        end = _skip_terminated(payload, 1, False)
+        mime = payload[1:end - 1].decode('latin-1')
+        pos = end
+    pos += 1  # picture type
+    pos = _skip_terminated(payload, pos, wide)
+    return mime, pos
+
+
+def _read_id3v1(f) -> dict:
+    """Read a trailing ID3v1 tag (mutagen falls back to it when there's no v2)"""
+    record = {}
+    try:
+        f.seek(-128, 2)
+    except OSError:
+        return record
+    block = f.read(128)
+    if len(block) != 128 or block[:3] != b'TAG':
+        return record
+
+    def field(raw):
+        return raw.split(b'\x00')[0].decode('latin-1').strip()
+
+    record['title'] = field(block[3:33])
+    record['artist'] = field(block[33:63])
+    record['album'] = field(block[63:93])
+    if block[125] == 0 and block[126]:
+        record['track'] = str(block[126])
+    return record
+
+
+def read_id3_fast(path: str) -> dict:
+    """Decode the fields the file list needs from the ID3 tag alone.
+
+    Returns the same record shape as track_reader.read_track_info, with the
+    stream info fields set to None. Raises ID3Malformed when the tag uses
+    features the fast path doesn't handle (compression, encryption, bad sizes).
+    """
+    record = {
+        'artist': '',
+        'title': '',
+        'album': '',
+        'track': '',
+        'duration': None,
+        'bitrate': None,
+        'sample_rate': None,
+        'cover_hash': None,
+        'cover_data': None,
+        'cover_mime': None,
+        'cover_offset': None,
+        'cover_length': None,
+    }
+
+    with open(path, 'rb') as f:
+        header = f.read(10)
+        if len(header) < 10 or header[:3] != b'ID3':
+            record.update(_read_id3v1(f))
+            return record
+
+        version, flags = header[3], header[5]
+        if version not in WANTED_FRAMES:
+            raise ID3Malformed(f"unsupported ID3v2.{version}")
+        tag_size = _syncsafe(header[6:10])
+        data = f.read(tag_size)
+        if len(data) != tag_size:
+            raise ID3Malformed("tag is larger than the file")
+
+    tag_unsync = bool(flags & 0x80)
+    if tag_unsync and version < 4:
+        # v2.2/v2.3 unsynchronise the whole tag; offsets no longer map to the file
+        data = _unsynchronise(data)
+
+    pos = 0
+    if flags & 0x40 and version >= 3:
+        if version == 3:
+            pos = 4 + struct.unpack('>I', data[:4])[0]
+        else:
+            pos = _syncsafe(data[:4])
+        if pos > len(data):
+            raise ID3Malformed("extended header overflows tag")
+
+    wanted = WANTED_FRAMES[version]
+    id_len, header_len = (3, 6) if version == 2 else (4, 10)
+
+    while pos + header_len <= len(data):
+        frame_id = data[pos:pos + id_len]
+        if frame_id[:1] in (b'\x00', b''):
+            break  # padding
+        try:
+            frame_id = frame_id.decode('ascii')
+        except UnicodeDecodeError:
+            raise ID3Malformed("invalid frame id")
+
+        if version == 2:
+            size = int.from_bytes(data[pos + 3:pos + 6], 'big')
+            frame_flags = 0
+        elif version == 3:
+            size = struct.unpack('>I', data[pos + 4:pos + 8])[0]
+            frame_flags = struct.unpack('>H', data[pos + 8:pos + 10])[0]
+        else:
+            size = _syncsafe(data[pos + 4:pos + 8])
+            frame_flags = struct.unpack('>H', data[pos + 8:pos + 10])[0]
+
+        start = pos + header_len
+        end = start + size
+        if end > len(data):
+            raise ID3Malformed(f"frame {frame_id} overflows tag")
+        pos = end
+
+        field = wanted.get(frame_id)
+        if field is None or (field == 'cover' and record['cover_data'] is not None):
+            continue
+
+        # Compression, encryption, grouping and data-length indicators are
+        # rare enough that the full parser can deal with them
+        if version == 3 and frame_flags & 0x00E0:
+            raise ID3Malformed(f"frame {frame_id} is compressed or encrypted")
+        if version == 4 and frame_flags & 0x004D:
+            raise ID3Malformed(f"frame {frame_id} uses unsupported format flags")
+
+        payload = data[start:end]
+        frame_unsync = version == 4 and (tag_unsync or frame_flags & 0x0002)
+        if frame_unsync:
+            payload = _unsynchronise(payload)
+
+        if field == 'cover':
+            mime, image_pos = _picture_start(payload, version)
+            image = payload[image_pos:]
+            record['cover_data'] = image
+            record['cover_mime'] = mime
+            record['cover_hash'] = hashlib.sha1(image).hexdigest()
+            record['cover_length'] = len(image)
+            if not tag_unsync and not frame_unsync:
+                # Where the image bytes live in the file, for lazy decoding
+                record['cover_offset'] = 10 + start + image_pos
+        else:
+            record[field] = _decode_text(payload)
+
+    return record
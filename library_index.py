@@ -0,0 +1,120 @@
+"""
+MP3 Album Tool - Library index
+Persistent SQLite cache of track info, invalidated by file mtime and size
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+# Bump when the stored fields change; older indexes are rebuilt from scratch
+SCHEMA_VERSION = 2
+
+FIELDS = ('artist', 'title', 'album', 'duration',
+          'cover_hash', 'cover_mime', 'cover_offset', 'cover_length')
+
+
+class LibraryIndex:
+    """Path -> track info cache shared by the scanner worker threads.
+
+    Writes are committed every ``commit_every`` rows or ``commit_interval``
+    seconds, whichever comes first, so another instance sharing the file
+    (a second window, the CLI) waits at most that long for the write lock;
+    ``timeout`` is how long a write waits for the other instance.
+    """
+
+    def __init__(self, db_path: str, commit_every: int = 500, commit_interval: float = 2.0,
+                 timeout: float = 30.0):
+        self.db_path = db_path
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+        self._first_pending = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS tracks")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tracks ("
+            " path TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " artist TEXT, title TEXT, album TEXT,"
+            " duration REAL, cover_hash TEXT, cover_mime TEXT,"
+            " cover_offset INTEGER, cover_length INTEGER,"
+            " indexed_at REAL)"
+        )
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.commit()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def lookup(self, path: str, mtime_ns: int, size: int):
+        """Return the stored record if the file is unchanged, else None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, " + ", ".join(FIELDS) +
+                " FROM tracks WHERE path = ?", (self._key(path),)
+            ).fetchone()
+        if row is None or row[0] != mtime_ns or row[1] != size:
+            return None
+        return dict(zip(FIELDS, row[2:]))
+
+    def store(self, path: str, mtime_ns: int, size: int, record: dict):
+        """Insert or replace the record for path (committed in batches)"""
+        values = [record.get(field) for field in FIELDS]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tracks"
+                " (path, mtime_ns, size, " + ", ".join(FIELDS) + ", indexed_at)"
+                " VALUES (" + ", ".join("?" * (len(FIELDS) + 4)) + ")",
+                [self._key(path), mtime_ns, size] + values + [time.time()]
+            )
+            if not self._pending:
+                self._first_pending = time.monotonic()
+            self._pending += 1
+            if (self._pending >= self.commit_every
+                    or time.monotonic() - self._first_pending >= self.commit_interval):
+                self._conn.commit()
+                self._pending = 0
+
+    def read(self, path: str, reader) -> dict:
+        """Serve path from the index, re-reading it with reader() if it changed"""
+        st = os.stat(path)
+        record = self.lookup(path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if record is not None:
+                self.hits += 1
+                return record
+            self.misses += 1
+
+        record = reader(path)
+        self.store(path, st.st_mtime_ns, st.st_size, record)
+        return record
+
+    def flush(self):
+        """Commit pending writes"""
+        with self._lock:
+            if self._pending:
+                self._conn.commit()
+                self._pending = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,145 @@
+"""
+MP3 Album Tool - Library scanner
+Walks folders with os.scandir and reads tags on a bounded thread pool
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def iter_mp3_paths(folder: str, recursive: bool = True):
+    """Yield MP3 paths under folder in the same top-down order as os.walk"""
+    pending = [folder]
+    while pending:
+        current = pending.pop()
+        subdirs = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.lower().endswith('.mp3') and entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+        if not recursive:
+            break
+        # Reverse so the first subfolder is walked first (stack order)
+        pending.extend(reversed(subdirs))
+
+
+class ScanStats:
+    """Running counters for a scan"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.files = 0
+        self.errors = 0
+        self.cancelled = False
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.monotonic() - self.started, 1e-6)
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed
+
+
+class TagScanner:
+    """Reads tags for many files concurrently and streams ordered batches back.
+
+    ``read_tags(path)`` and ``path_key(path)`` run on the worker threads;
+    ``on_batch(records, stats)`` and ``on_done(stats)`` run on the scanner
+    thread, so GUI callers should hand them over to the Tk loop with
+    ``root.after``. Batches hold (path, key, record) tuples: key is
+    path_key(path) (None without path_key), record is None if reading failed.
+    """
+
+    def __init__(self, read_tags, workers: int = 8, batch_size: int = 200, flush_interval: float = 0.25,
+                 path_key=None):
+        self.read_tags = read_tags
+        self.path_key = path_key
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.stats = ScanStats()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def start(self, paths, on_batch, on_done=None):
+        """Start scanning in a background thread"""
+        self._thread = threading.Thread(target=self.run, args=(paths, on_batch, on_done))
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Request the scan to stop; batches already read are kept"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def run(self, paths, on_batch, on_done=None):
+        """Scan synchronously (used by start() and by headless callers)"""
+        self.stats = ScanStats()
+        # Bounded window of in-flight reads keeps memory flat on huge trees
+        max_in_flight = self.workers * 4
+        in_flight = deque()
+        batch = []
+        last_flush = time.monotonic()
+
+        def read(path):
+            # realpath() may hit the disk (slow on network shares): done here, not by the caller
+            key = self.path_key(path) if self.path_key else None
+            try:
+                return key, self.read_tags(path), None
+            except Exception as e:
+                return key, None, e
+
+        def drain_one():
+            nonlocal last_flush
+            path, future = in_flight.popleft()
+            key, record, error = future.result()
+            if error is not None:
+                self.stats.errors += 1
+            batch.append((path, key, record))
+            self.stats.files += 1
+            # Flush on size or time so slow shares still show steady progress
+            now = time.monotonic()
+            if len(batch) >= self.batch_size or now - last_flush >= self.flush_interval:
+                on_batch(list(batch), self.stats)
+                batch.clear()
+                last_flush = now
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for path in paths:
+                if self._cancel.is_set():
+                    break
+                in_flight.append((path, executor.submit(read, path)))
+                if len(in_flight) >= max_in_flight:
+                    drain_one()
+
+            while in_flight:
+                if self._cancel.is_set():
+                    for _, future in in_flight:
+                        future.cancel()
+                    in_flight.clear()
+                    break
+                drain_one()
+
+        if batch:
+            on_batch(list(batch), self.stats)
+        self.stats.cancelled = self._cancel.is_set()
+        if on_done:
+            on_done(self.stats)
+        return self.stats
@@ -0,0 +1,301 @@
+"""
+MP3 Album Tool - Lookup cache
+Persistent SQLite cache of metadata search results per source and query,
+plus Bloom filters remembering the queries a source didn't find
+"""
+
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+
+import text_normalizer
+
+# 2: queries keep their artist/title split
+SCHEMA_VERSION = 2
+
+DAY = 24 * 60 * 60
+
+
+def _normalize_text(text: str) -> str:
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text).casefold().split())
+
+
+def normalize_query(query: str) -> str:
+    """Case, punctuation and spacing don't change what a search returns.
+
+    Where the query splits into artist and title (as the TheAudioDB and
+    YouTube Music searches split it) each side is normalized on its own,
+    so "A - B C" and "A B - C" stay different keys.
+    """
+    artist, title = text_normalizer.extract_artist_title(query)
+    if artist and title:
+        return _normalize_text(artist) + '\x1f' + _normalize_text(title)
+    return _normalize_text(query)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)"""
+
+    def __init__(self, capacity: int, error_rate: float, bits: bytes = None):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.size + 7) // 8)
+        if len(self.bits) != (self.size + 7) // 8:
+            raise ValueError("stored filter doesn't match its capacity")
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class MissFilter:
+    """Remembers (source, query) pairs that found nothing, in a few MB.
+
+    Misses go into two generations of Bloom filters: a key is a known miss
+    if either has it. The current generation becomes the previous one after
+    half the TTL (or when it's full), so a miss is forgotten after between
+    TTL/2 and TTL. The bit arrays are only rewritten by flush(); until then
+    new misses are kept exactly in a small journal table and replayed into
+    the filter on load, so each miss costs one row instead of a BLOB write.
+    """
+
+    def __init__(self, conn, ttl: float, capacity: int, error_rate: float):
+        self._conn = conn
+        self.ttl = ttl
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS miss_filters ("
+            " generation INTEGER PRIMARY KEY,"
+            " created_at REAL NOT NULL,"
+            " count INTEGER NOT NULL,"
+            " bits BLOB NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS miss_journal ("
+            " key TEXT PRIMARY KEY,"
+            " generation INTEGER NOT NULL)"
+        )
+        self._load()
+
+    def _new_generation(self, generation: int):
+        return {'generation': generation, 'created_at': time.time(), 'count': 0,
+                'filter': BloomFilter(self.capacity, self.error_rate), 'dirty': True}
+
+    def _load(self):
+        rows = self._conn.execute(
+            "SELECT generation, created_at, count, bits FROM miss_filters"
+            " ORDER BY generation DESC LIMIT 2").fetchall()
+        self.generations = []
+        for generation, created_at, count, bits in rows:
+            try:
+                bloom = BloomFilter(self.capacity, self.error_rate, bits)
+            except ValueError:
+                continue  # capacity changed: start over
+            self.generations.append({'generation': generation, 'created_at': created_at,
+                                     'count': count, 'filter': bloom, 'dirty': False})
+        if not self.generations:
+            self.generations.append(self._new_generation(1))
+
+        live = {gen['generation']: gen for gen in self.generations}
+        for key, generation in self._conn.execute("SELECT key, generation FROM miss_journal"):
+            gen = live.get(generation)
+            if gen:
+                gen['filter'].add(key)
+                gen['count'] += 1
+                gen['dirty'] = True
+        self._rotate_if_due()
+
+    def _rotate_if_due(self):
+        current = self.generations[0]
+        if time.time() - current['created_at'] > self.ttl / 2 or current['count'] >= self.capacity:
+            self.generations = [self._new_generation(current['generation'] + 1), current]
+            self._save()
+
+    def _save(self):
+        """Write dirty bit arrays, drop dead generations and the replayed journal"""
+        oldest = self.generations[-1]['generation']
+        for gen in self.generations:
+            if gen['dirty']:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO miss_filters (generation, created_at, count, bits)"
+                    " VALUES (?, ?, ?, ?)",
+                    (gen['generation'], gen['created_at'], gen['count'], bytes(gen['filter'].bits)))
+                gen['dirty'] = False
+        self._conn.execute("DELETE FROM miss_filters WHERE generation < ?", (oldest,))
+        self._conn.execute("DELETE FROM miss_journal")
+        self._conn.commit()
+
+    def __contains__(self, key: str) -> bool:
+        now = time.time()
+        return any(key in gen['filter'] for gen in self.generations
+                   if now - gen['created_at'] <= self.ttl)
+
+    def add(self, key: str):
+        self._rotate_if_due()
+        current = self.generations[0]
+        current['filter'].add(key)
+        current['count'] += 1
+        current['dirty'] = True
+        self._conn.execute("INSERT OR REPLACE INTO miss_journal (key, generation) VALUES (?, ?)",
+                           (key, current['generation']))
+
+    def flush(self):
+        if any(gen['dirty'] for gen in self.generations):
+            self._save()
+
+
+class LookupCache:
+    """(source, normalized query) -> result, with a TTL and an LRU size cap.
+
+    ``get`` returns None on a miss. Last-used times are updated on hits, and
+    when the cache grows past ``max_entries`` the least recently used tenth
+    is evicted in one statement. Queries a source didn't find are recorded
+    with ``put_miss`` and checked with ``is_known_miss``; they expire sooner
+    (``miss_ttl``) and live in a MissFilter rather than in the table.
+    ``timeout`` is how long a write waits for another instance sharing the
+    file (a second window, the CLI).
+    """
+
+    def __init__(self, db_path: str, ttl: float = 30 * DAY, max_entries: int = 100000,
+                 commit_every: int = 100, miss_ttl: float = 7 * DAY,
+                 miss_capacity: int = 1000000, miss_error_rate: float = 0.001, timeout: float = 30.0):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.commit_every = commit_every
+        self.hits = 0
+        self.misses = 0
+        self.known_misses = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+        self._miss_filter = MissFilter(self._conn, miss_ttl, miss_capacity, miss_error_rate)
+
+    def _create_schema(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS lookups")
+            self._conn.execute("DROP TABLE IF EXISTS miss_filters")
+            self._conn.execute("DROP TABLE IF EXISTS miss_journal")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lookups ("
+            " source TEXT NOT NULL,"
+            " query TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " used_at REAL NOT NULL,"
+            " PRIMARY KEY (source, query))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS lookups_used ON lookups (used_at)")
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def _written(self):
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._conn.commit()
+            self._pending = 0
+
+    def get(self, source: str, query: str):
+        """Cached result for the query, or None if missing or expired"""
+        key = (source, normalize_query(query))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM lookups WHERE source = ? AND query = ?", key
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE lookups SET used_at = ? WHERE source = ? AND query = ?", (now,) + key)
+            self._written()
+        return json.loads(row[0])
+
+    def put(self, source: str, query: str, value):
+        """Store a result (any JSON-serializable value)"""
+        key = (source, normalize_query(query))
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM lookups WHERE source = ? AND query = ?", key).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookups (source, query, value, stored_at, used_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                key + (json.dumps(value), now, now))
+            # Replacing a result doesn't grow the table
+            if exists is None:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+            self._written()
+
+    @staticmethod
+    def _miss_key(source: str, query: str) -> str:
+        return source + '\x00' + normalize_query(query)
+
+    def is_known_miss(self, source: str, query: str) -> bool:
+        """True if source recently found nothing for the query (rare false positives)"""
+        key = self._miss_key(source, query)
+        with self._lock:
+            if key in self._miss_filter:
+                self.known_misses += 1
+                return True
+        return False
+
+    def put_miss(self, source: str, query: str):
+        """Remember that source found nothing for the query"""
+        key = self._miss_key(source, query)
+        with self._lock:
+            self._miss_filter.add(key)
+            self._written()
+
+    def _evict(self):
+        """Drop expired entries and the least recently used ones above 90% of the cap"""
+        self._conn.execute("DELETE FROM lookups WHERE stored_at < ?", (time.time() - self.ttl,))
+        count = self._conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+        excess = count - int(self.max_entries * 0.9)
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM lookups WHERE rowid IN"
+                " (SELECT rowid FROM lookups ORDER BY used_at LIMIT ?)", (excess,))
+            count -= excess
+        self._count = count
+
+    def flush(self):
+        """Commit pending writes and save the miss filters"""
+        with self._lock:
+            if self._pending:
+                self._conn.commit()
+                self._pending = 0
+            self._miss_filter.flush()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.known_misses = 0
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+MP3 Album Tool - Command line
+Headless batch run: python -m mp3_cli <folders/files> [--dest DIR] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from drive_info import DEFAULT_SAVE_WORKERS
+from library_scanner import TagScanner, iter_mp3_paths
+from mp3_engine import MP3Engine
+import text_normalizer
+
+
+class JsonProgress:
+    """Writes one JSON object per line to stdout (safe to call from any thread)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.lock = threading.Lock()
+
+    def emit(self, event: str, **fields):
+        line = json.dumps(dict(event=event, **fields), ensure_ascii=False)
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def iter_sources(sources, recursive: bool = True):
+    """Expand folders into their MP3 files; files are passed through"""
+    for source in sources:
+        if os.path.isdir(source):
+            yield from iter_mp3_paths(source, recursive)
+        elif source.lower().endswith('.mp3') and os.path.isfile(source):
+            yield source
+
+
+def parse_rate(value):
+    """SOURCE=RATE[/BURST], e.g. deezer=8/10"""
+    try:
+        source, limit = value.split('=', 1)
+        rate, _, burst = limit.partition('/')
+        rate = float(rate)
+        return source.strip(), (rate, int(burst) if burst else max(1, int(rate)))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected SOURCE=RATE[/BURST], got {value!r}")
+
+
+RENAME_SOURCES = ('deezer', 'theaudiodb', 'ytmusic')
+COVER_SOURCES = ('deezer', 'theaudiodb', 'ytmusic', 'google')
+
+
+def source_list(choices):
+    """Parser for a comma-separated subset of choices ('none' for no source)"""
+    def parse(value):
+        sources = {source.strip().lower() for source in value.split(',') if source.strip()}
+        sources.discard('none')
+        unknown = sources.difference(choices)
+        if unknown:
+            raise argparse.ArgumentTypeError(
+                f"unknown source(s) {', '.join(sorted(unknown))}; choose from {','.join(choices)} or none")
+        return sources
+    return parse
+
+
+def parse_save_workers(value):
+    """TYPE=N, e.g. removable=2"""
+    kind, _, count = value.partition('=')
+    kind = kind.strip()
+    if kind not in DEFAULT_SAVE_WORKERS or not count.strip().isdigit() or int(count) < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected {'|'.join(DEFAULT_SAVE_WORKERS)}=N with N >= 1, got {value!r}")
+    return kind, int(count)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="mp3_cli",
+        description="Clean names, look up metadata and covers, and save MP3 files without the GUI")
+    parser.add_argument('sources', nargs='+', help="folders and/or MP3 files to process")
+    parser.add_argument('--dest', help="copy the results to this folder (default: rename in place)")
+    parser.add_argument('--workers', type=int, default=8,
+                        help="concurrent tag reads and metadata lookups (default: 8)")
+    parser.add_argument('--rate', type=parse_rate, action='append', default=[], metavar='SOURCE=RATE[/BURST]',
+                        help="requests per second (and burst) for deezer, theaudiodb or ytmusic")
+    parser.add_argument('--hedged', action='store_true',
+                        help="query all sources at once per file; the first match above --threshold wins")
+    parser.add_argument('--threshold', type=int, default=80,
+                        help="minimum match score (0-100) for a hedged result (default: 80)")
+    parser.add_argument('--no-recursive', action='store_true', help="don't descend into subfolders")
+    parser.add_argument('--force-cover', action='store_true', help="search covers even for files that have one")
+    parser.add_argument('--no-capitalize', action='store_true', help="keep the capitalization found online")
+    parser.add_argument('--sources', dest='rename_sources', type=source_list(RENAME_SOURCES),
+                        default=set(RENAME_SOURCES),
+                        metavar='LIST', help="rename sources to query, comma separated, or none "
+                                             "(default: %s)" % ','.join(RENAME_SOURCES))
+    parser.add_argument('--cover-sources', type=source_list(COVER_SOURCES), default=set(COVER_SOURCES),
+                        metavar='LIST', help="cover sources to query, comma separated, or none "
+                                             "(default: %s)" % ','.join(COVER_SOURCES))
+    parser.add_argument('--offline', action='store_true',
+                        help="name files from their file names only (no metadata or cover lookups)")
+    parser.add_argument('--save-workers', type=parse_save_workers, action='append', default=[],
+                        metavar='TYPE=N', help="files saved at the same time on local, removable or network drives "
+                                               "(default: local=%d, removable=1, network=4)" % DEFAULT_SAVE_WORKERS['local'])
+    parser.add_argument('--tag-padding', type=int, default=64, metavar='KB',
+                        help="free space reserved when a tag has to grow, so later edits save in place (default: 64)")
+    parser.add_argument('--dry-run', action='store_true', help="look everything up but don't write any file")
+    parser.add_argument('--verbose', action='store_true', help="print the processing log to stderr")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    progress = JsonProgress()
+
+    log = (lambda message: print(message, file=sys.stderr)) if args.verbose else None
+    engine = MP3Engine(log=log)
+    engine.recursive_var.set(not args.no_recursive)
+    engine.force_cover_var.set(args.force_cover)
+    engine.capitalize_names_var.set(not args.no_capitalize)
+    engine.hedged_lookups.set(args.hedged)
+    engine.fuzzy_threshold.set(args.threshold)
+    engine.use_deezer_rename.set('deezer' in args.rename_sources)
+    engine.use_theaudiodb_rename.set('theaudiodb' in args.rename_sources)
+    engine.use_ytmusic_rename.set('ytmusic' in args.rename_sources)
+    engine.use_deezer_cover.set('deezer' in args.cover_sources)
+    engine.use_theaudiodb_cover.set('theaudiodb' in args.cover_sources)
+    engine.use_ytmusic_cover.set('ytmusic' in args.cover_sources)
+    engine.use_google_covers.set('google' in args.cover_sources)
+    engine.tag_padding.set(max(0, args.tag_padding))
+    engine.configure_save_workers(dict(args.save_workers))
+    engine.configure_rate_limits(dict(args.rate))
+
+    if args.dest:
+        os.makedirs(args.dest, exist_ok=True)
+
+    started = time.monotonic()
+    workers = max(1, args.workers)
+
+    # Scan: tags are read on a thread pool, files reached twice are kept once
+    def add_batch(batch, stats):
+        for file_path, key, record in batch:
+            engine.add_file(file_path, record, key)
+        progress.emit('scan', files=stats.files, errors=stats.errors)
+
+    scanner = TagScanner(engine.ingest_file, workers=workers, path_key=engine.path_key)
+    scanner.run(iter_sources(args.sources, engine.recursive_var.get()), add_batch)
+    if engine.library_index:
+        engine.library_index.flush()
+    total = len(engine.files_data)
+    progress.emit('scanned', files=total)
+
+    # Clean + lookup + cover: network bound, so several files are looked up at once
+    errors = 0
+
+    def report(i, file_data, cover_found, error):
+        nonlocal errors
+        errors += error is not None
+        progress.emit('processed', index=i + 1, total=total, path=file_data['path'],
+                      artist=file_data['artist'], title=file_data['title'],
+                      source=file_data['status'], cover_found=cover_found,
+                      error=str(error) if error else None)
+
+    if args.offline:
+        engine.normalize_files(engine.files_data)
+        for i, file_data in enumerate(engine.files_data):
+            report(i, file_data, False, None)
+    else:
+        engine.process_files(engine.files_data, report, workers)
+
+    # Save (folders in parallel, each folder in order)
+    saved = 0
+    if not args.dry_run:
+        to_save = [(i, file_data) for i, file_data in enumerate(engine.files_data)
+                   if file_data['status'] != "Error"]
+
+        def report_saved(n, file_data, ok, error):
+            nonlocal errors
+            errors += error is not None
+            progress.emit('saved', index=to_save[n][0] + 1, total=total, path=file_data['path'],
+                          saved=bool(ok), error=str(error) if error else None)
+
+        saved = engine.save_files([file_data for _, file_data in to_save], args.dest, report_saved)
+
+    if engine.library_index:
+        engine.library_index.close()
+    if engine.lookup_cache:
+        engine.lookup_cache.close()
+        progress.emit('cache', hits=engine.lookup_cache.hits,
+                      known_misses=engine.lookup_cache.known_misses,
+                      misses=engine.lookup_cache.misses - engine.lookup_cache.known_misses)
+    progress.emit('tags', **engine.save_stats)
+    progress.emit('http', hosts=engine.http.stats(), limits=engine.http.limiter_stats())
+    progress.emit('normalize', **{name: {'hits': stats['hits'], 'misses': stats['misses']}
+                                  for name, stats in text_normalizer.cache_stats().items()})
+    progress.emit('coalesced', calls=engine.flights.calls, coalesced=engine.flights.coalesced)
+    progress.emit('sources', **{source: {'state': breaker.state, 'skipped': breaker.skipped}
+                                 for source, breaker in engine.breakers.items()})
+    progress.emit('done', files=total, saved=saved, errors=errors,
+                  elapsed=round(time.monotonic() - started, 3))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
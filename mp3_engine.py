@@ -0,0 +1,1674 @@
+"""
+MP3 Album Tool - Processing engine
+Scan, clean, metadata lookup, cover search and save without any GUI
+"""
+
+import hashlib
+import io
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from mutagen import PaddingInfo
+from mutagen.id3 import (APIC, ID3, TALB, TDRC, TIT2, TPE1, TPE2, TRCK, Encoding,
+                         ID3NoHeaderError)
+from PIL import Image
+from rapidfuzz import fuzz, utils
+
+from circuit_breaker import CLOSED, OPEN, CircuitBreaker
+from client_pool import ClientPool
+from config import app_data_path
+from drive_info import DEFAULT_SAVE_WORKERS, drive_of, drive_type
+from http_client import HttpClient
+from library_index import LibraryIndex
+from lookup_cache import LookupCache, normalize_query
+from single_flight import SingleFlight
+import text_normalizer
+from track_reader import read_cover_data, read_track_info
+
+
+# Tamanho máximo recomendado para capas (maior lado, em pixels)
+COVER_MAX_SIZE = 1000
+
+# Audio copied to the destination folder in chunks of this size
+COPY_CHUNK_SIZE = 1 << 20
+
+# Display names of the metadata/cover sources (keys of MP3Engine.breakers)
+SOURCE_NAMES = {
+    'deezer': 'Deezer',
+    'theaudiodb': 'TheAudioDB',
+    'ytmusic': 'YouTube Music',
+    'google': 'Google',
+}
+
+
+class Setting:
+    """Plain value holder with the get()/set() interface of a Tk variable"""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class MP3Engine:
+    """Everything between scanning a file and saving it, with no Tk dependency.
+
+    Options are created through option(), which returns a Setting here and a
+    Tk variable in the GUI, so the same code reads them with .get().
+    Messages go through log_message(), which the GUI overrides.
+    """
+
+    def __init__(self, log=None):
+        self.log = log
+
+        self.recursive_var = self.option(True)
+        self.force_cover_var = self.option(False)
+        self.capitalize_names_var = self.option(True)
+        self.fuzzy_threshold = self.option(80)
+        self.lookup_workers = self.option(4)  # files looked up at the same time
+        # Query every rename source at once and take the first good enough answer
+        self.hedged_lookups = self.option(False)
+
+        # Fontes separadas para renomeação e capas
+        self.use_deezer_rename = self.option(True)
+        self.use_theaudiodb_rename = self.option(True)
+        self.use_ytmusic_rename = self.option(True)
+        self.use_deezer_cover = self.option(True)
+        self.use_theaudiodb_cover = self.option(True)
+        self.use_ytmusic_cover = self.option(True)
+        self.use_google_covers = self.option(True)
+
+        # Configurações de metadados para gravação (para resolver problema do carro)
+        self.save_artist_tag = self.option(True)
+        self.save_title_tag = self.option(True)
+        self.save_album_tag = self.option(True)
+        self.save_albumartist_tag = self.option(True)
+        self.save_year_tag = self.option(False)
+        self.save_track_tag = self.option(False)
+        # Free space (KB) reserved in the tag when a file has to be rewritten,
+        # so later edits fit and are saved without moving the audio
+        self.tag_padding = self.option(64)
+        # Files saved at the same time on each kind of drive (local, removable, network)
+        self.save_workers = dict(DEFAULT_SAVE_WORKERS)
+
+        # Tag saves since the last reset: 'in_place' (fit in the existing tag),
+        # 'rewritten' (audio moved to make room) and 'copied' (written to a new file);
+        # covers 'encoded' for the APIC frame and 'reused' from another track
+        self.save_stats = {'in_place': 0, 'rewritten': 0, 'copied': 0, 'padding': 0, 'encoded': 0, 'reused': 0}
+        self.save_stats_lock = threading.Lock()
+        self.cover_lock = threading.Lock()
+        # During save_files(): encoded covers by (pixel hash, size, format), see encode_cover()
+        self.encoded_covers = None
+        self.cover_keys = {}  # id(image) -> (image, cover key)
+        self.cover_flights = SingleFlight()
+
+        self.files_data = []
+        self.files_by_path = {}  # path_key(path) -> file_data, for duplicate checks
+
+        # Índice persistente da biblioteca (path + mtime + size)
+        self.library_index = self.open_library_index()
+        # Resultados de buscas anteriores (Deezer, TheAudioDB, YouTube Music)
+        self.lookup_cache = self.open_lookup_cache()
+
+        # Keep-alive connection pools shared by every source, rate limited per source
+        self.http = HttpClient(pool_size=self.lookup_workers.get())
+
+        # Clientes do YouTube Music, um por worker (criados sob demanda)
+        self.ytmusic_pool = ClientPool(self.create_ytmusic_client, size=self.lookup_workers.get(),
+                                       log=self.log_message)
+
+        # Runs the per-source searches of hedged lookups (only during process_files)
+        self.hedge_executor = None
+
+        # Identical searches/cover lookups running at the same time share one call
+        self.flights = SingleFlight()
+        # Per run: album lookups by (folder, artist) and downloaded images by URL,
+        # so the tracks of an album share one search and one download
+        self.run_results = {}
+
+        # Log lines of a file being processed on a worker, see process_track()
+        self.log_buffers = threading.local()
+        # Whether the current thread's last search failed (vs. found nothing)
+        self.search_state = threading.local()
+        # Unhealthy sources are skipped for a while instead of retried per file
+        self.breakers = {source: CircuitBreaker(source, failure_threshold=3,
+                                                on_change=self.on_breaker_change)
+                         for source in SOURCE_NAMES}
+
+    def option(self, value):
+        """Create an option holder; the GUI returns Tk variables instead"""
+        return Setting(value)
+
+    def log_message(self, message):
+        """Log a message; on a processing worker it is held until the file is applied"""
+        lines = getattr(self.log_buffers, 'lines', None)
+        if lines is not None:
+            lines.append(message)
+        else:
+            self.write_log(message)
+
+    def write_log(self, message):
+        """Send a message to the log callback (if any); the GUI writes to its log panel"""
+        if self.log:
+            self.log(message)
+
+    def new_file_data(self, file_path, record=None):
+        """Build the file list entry for a scanned file"""
+        if not record:
+            record = {'artist': '', 'title': '', 'cover_ref': None}
+        return {
+            'index': len(self.files_data) + 1,  # Índice baseado na posição atual
+            'path': file_path,
+            'album': os.path.basename(os.path.dirname(file_path)),
+            'original': os.path.basename(file_path),  # Nome original do arquivo
+            'new': '',  # Campo para novo nome do arquivo
+            'artist': record['artist'] or '',
+            'title': record['title'] or '',
+            'status': 'Pending',
+            'cover': None,  # Nova capa (PIL), gravada no save; None mantém a embutida
+            'cover_ref': record['cover_ref']  # Capa embutida, decodificada só quando visível
+        }
+
+    def add_file(self, file_path, record=None, key=None):
+        """Append a file to files_data unless it's already there; returns the entry or None"""
+        key = key or self.path_key(file_path)
+        if key in self.files_by_path:
+            return None
+        file_data = self.new_file_data(file_path, record)
+        self.files_data.append(file_data)
+        self.index_file_path(file_data, key)
+        return file_data
+
+    def identify_track(self, file_data):
+        """Clean the file name and look up the real artist/title"""
+        original_name = os.path.splitext(file_data['original'])[0]
+
+        # Clean filename
+        cleaned_name = self.clean_filename(original_name)
+
+        # Try to extract artist and title from name
+        artist_from_filename, title_from_filename = self.extract_artist_title(cleaned_name)
+
+        # Search for real metadata, in source precedence order
+        sources = self.rename_sources()
+        if self.hedge_executor and len(sources) > 1:
+            real_artist, real_title, source = self.hedged_lookup(sources, cleaned_name)
+        else:
+            real_artist = real_title = None
+            source = "None"
+            for name, search in sources:
+                real_artist, real_title = self.lookup_source(name, search, cleaned_name)
+                if real_artist and real_title:
+                    source = SOURCE_NAMES[name]
+                    break
+
+        # Se não encontrou em nenhuma fonte, usar do nome do arquivo
+        if not real_artist or not real_title:
+            if artist_from_filename and title_from_filename:
+                real_artist = artist_from_filename
+                real_title = title_from_filename
+                source = "Nome do Arquivo"
+                self.log_message(f"  📁 Usando do nome do arquivo: {real_artist} - {real_title}")
+            else:
+                real_artist = "Artista Desconhecido"
+                real_title = cleaned_name
+                source = "Desconhecido"
+                self.log_message(f"  ❌ Usando fallback: {real_artist} - {real_title}")
+
+        # Formatar nomes
+        if self.capitalize_names_var.get():
+            real_artist = self.smart_capitalize(real_artist)
+            real_title = self.smart_capitalize(real_title)
+
+        # Criar novo nome baseado nos metadados reais
+        new_name = f"{real_artist} - {real_title}"
+
+        # Atualizar dados
+        file_data['new'] = new_name
+        file_data['artist'] = real_artist
+        file_data['title'] = real_title
+        file_data['status'] = source
+
+        self.log_message(f"  → {new_name} (Fonte: {source})")
+
+    def find_cover(self, file_data, album=None):
+        """Search a cover for the track; returns True if a new one was found"""
+        if not (file_data['artist'] and file_data['title']):
+            return False
+        self.log_message(f"  🖼️ Buscando capa: {file_data['artist']} - {file_data['title']}")
+
+        # Verificar se já tem capa
+        if not self.force_cover_var.get() and (file_data['cover'] or file_data.get('cover_ref')):
+            self.log_message("    ✅ Capa já existe")
+            return False
+
+        if album and album.get('cover'):
+            file_data['cover'] = album['cover']
+            self.log_message(f"    ✅ Capa do álbum: {album['title']}")
+            return True
+
+        artist, title = file_data['artist'], file_data['title']
+        cover_image = self.flights.do(('cover', artist.casefold(), title.casefold()),
+                                      lambda: self.search_cover_all_sources(artist, title))
+        if cover_image:
+            file_data['cover'] = cover_image
+            self.log_message("    ✅ Capa encontrada")
+            return True
+
+        self.log_message("    ❌ Capa não encontrada")
+        return False
+
+    def run_once(self, key, compute):
+        """compute() once per key for the whole run, shared by all threads asking for it.
+
+        Threads asking while it runs wait for the same result. Results of a
+        failed search (see search_failed()) are not kept, so the next caller
+        tries again.
+        """
+        if key in self.run_results:
+            return self.run_results[key]
+
+        def compute_and_keep():
+            outer_failed = getattr(self.search_state, 'failed', False)
+            self.search_state.failed = False
+            try:
+                result = compute()
+            except Exception:
+                result = None
+                self.search_failed()
+            if not self.search_state.failed:
+                self.run_results[key] = result
+            self.search_state.failed = outer_failed
+            return result
+        return self.flights.do(key, compute_and_keep)
+
+    @staticmethod
+    def album_key(file_data):
+        """Tracks of the same folder and artist are treated as one album"""
+        folder = os.path.normcase(os.path.dirname(file_data['path']))
+        return folder, (file_data['artist'] or '').casefold()
+
+    def album_info(self, file_data):
+        """Release info (title, cover, year) of the track's album, or None.
+
+        Looked up once per album_key() and shared by the group's tracks.
+        Only Deezer has album search; it is used when Deezer covers are
+        enabled, or the year tag is saved and Deezer isn't turned off.
+        """
+        if not file_data['artist'] or not file_data['album']:
+            return None
+        wants_cover = self.force_cover_var.get() or not (file_data['cover'] or file_data.get('cover_ref'))
+        deezer_enabled = self.use_deezer_cover.get() or self.use_deezer_rename.get()
+        if not ((wants_cover and self.use_deezer_cover.get())
+                or (self.save_year_tag.get() and deezer_enabled)):
+            return None
+        artist, album_name = file_data['artist'], self.normalize_album_name(file_data['album'])
+        album = self.run_once(('album',) + self.album_key(file_data),
+                              lambda: self.call_source('deezer', None, self.search_album_deezer,
+                                                       artist, album_name))
+        if album and album.get('year'):
+            file_data['year'] = album['year']
+        return album
+
+    def search_album_deezer(self, artist, album_name):
+        """Busca o álbum no Deezer: {'title', 'cover', 'year'} ou None se a pasta não é um álbum"""
+        try:
+            api_url = "https://api.deezer.com/search/album"
+            self.search_sent()
+            response = self.http.get(api_url, params={'q': f'artist:"{artist}" album:"{album_name}"'},
+                                     timeout=10)
+            if response.status_code != 200:
+                self.search_failed()
+                return None
+            data = response.json()
+            if self.deezer_quota_exceeded(api_url, data):
+                self.search_failed()
+                return None
+
+            # A pasta só conta como álbum se o nome bater com um álbum do artista
+            threshold = self.fuzzy_threshold.get()
+            for candidate in data.get('data', [])[:5]:
+                title = candidate.get('title', '')
+                candidate_artist = candidate.get('artist', {}).get('name', '')
+                if (fuzz.token_set_ratio(album_name, title, processor=utils.default_process) >= threshold
+                        and fuzz.token_set_ratio(artist, candidate_artist, processor=utils.default_process) >= threshold):
+                    break
+            else:
+                self.log_message(f"  💿 Álbum não encontrado no Deezer: {artist} - {album_name}")
+                return None
+
+            album = {'title': title, 'cover': None, 'year': None}
+            self.log_message(f"  💿 Álbum Deezer: {candidate_artist} - {title}")
+            if self.use_deezer_cover.get():
+                for cover_key in ('cover_xl', 'cover_big', 'cover_medium'):
+                    if candidate.get(cover_key):
+                        album['cover'] = self.download_image(candidate[cover_key])
+                        if album['cover']:
+                            break
+            if self.save_year_tag.get() and candidate.get('id'):
+                details = self.http.get(f"https://api.deezer.com/album/{candidate['id']}", timeout=10)
+                if details.status_code == 200:
+                    release_date = details.json().get('release_date') or ''
+                    if release_date[:4].isdigit():
+                        album['year'] = release_date[:4]
+            return album
+
+        except Exception as e:
+            self.search_failed()
+            self.log_message(f"  Erro na busca de álbum Deezer: {e}")
+            return None
+
+    def download_image(self, url):
+        """Download an image once per run (albums share their cover URL)"""
+        def fetch():
+            response = self.http.get(url, timeout=10)
+            if response.status_code != 200:
+                self.search_failed()
+                return None
+            image = Image.open(io.BytesIO(response.content))
+            image.load()  # decode now: the image is shared between threads
+            return image
+        return self.run_once(('image', url), fetch)
+
+    def normalize_files(self, files):
+        """Name files from their file names only (no lookups), in one batch.
+
+        Same result as identify_track() with every rename source disabled.
+        """
+        capitalize = self.capitalize_names_var.get()
+        names = text_normalizer.normalize_names([f['original'] for f in files], capitalize=capitalize)
+        for file_data, names_found in zip(files, names):
+            if names_found['artist'] and names_found['title']:
+                artist, title, source = names_found['artist'], names_found['title'], "Nome do Arquivo"
+            else:
+                artist, title, source = "Artista Desconhecido", names_found['clean'], "Desconhecido"
+                if capitalize:
+                    artist, title = self.smart_capitalize(artist), self.smart_capitalize(title)
+            file_data['new'] = f"{artist} - {title}"
+            file_data['artist'] = artist
+            file_data['title'] = title
+            file_data['status'] = source
+
+    def rename_sources(self):
+        """(source, search function) of the enabled rename sources, in precedence order"""
+        sources = []
+        if self.use_deezer_rename.get():
+            sources.append(('deezer', self.search_deezer))
+        if self.use_theaudiodb_rename.get():
+            sources.append(('theaudiodb', self.search_theaudiodb))
+        if self.use_ytmusic_rename.get():
+            sources.append(('ytmusic', self.search_ytmusic))
+        return sources
+
+    def lookup_source(self, source, search, query):
+        """Search one rename source (through the cache), logging the outcome"""
+        name = SOURCE_NAMES[source]
+        self.log_message(f"  🔍 Searching {name}: {query}")
+        artist, title = self.cached_search(source, search, query)
+        if artist and title:
+            self.log_message(f"  ✅ {name} found: {artist} - {title}")
+        else:
+            self.log_message(f"  ❌ {name} not found")
+        return artist, title
+
+    @staticmethod
+    def match_score(query, artist, title):
+        """How well a found artist/title matches the searched name (0-100)"""
+        return fuzz.token_set_ratio(query, f"{artist} {title}", processor=utils.default_process)
+
+    def hedged_lookup(self, sources, query):
+        """Search all sources at once; returns (artist, title, source name).
+
+        Results are taken in precedence order: the first one scoring at least
+        fuzzy_threshold wins as soon as every source before it has answered,
+        and the searches still queued are cancelled (running ones finish in
+        the background and only fill the cache). If nothing clears the
+        threshold, the first result found is used, as in sequential mode.
+        """
+        def search_one(source, search):
+            # Own log buffer: the lines are replayed on the file's worker
+            self.log_buffers.lines = []
+            try:
+                found = self.lookup_source(source, search, query)
+            except Exception as e:
+                self.log_message(f"  ❌ {SOURCE_NAMES[source]}: {e}")
+                found = (None, None)
+            finally:
+                lines = self.log_buffers.lines
+                self.log_buffers.lines = None
+            return found, lines
+
+        threshold = self.fuzzy_threshold.get()
+        futures = [(source, self.hedge_executor.submit(search_one, source, search))
+                   for source, search in sources]
+        fallback = (None, None, "None")
+        try:
+            for source, future in futures:
+                (artist, title), lines = future.result()
+                for line in lines:
+                    self.log_message(line)
+                if not (artist and title):
+                    continue
+                score = self.match_score(query, artist, title)
+                if score >= threshold:
+                    self.log_message(f"  ⚡ {SOURCE_NAMES[source]} accepted (match {score:.0f}%)")
+                    return artist, title, SOURCE_NAMES[source]
+                self.log_message(f"  ⚠️ {SOURCE_NAMES[source]} match {score:.0f}% below {threshold}%")
+                if fallback[0] is None:
+                    fallback = (artist, title, SOURCE_NAMES[source])
+            return fallback
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+    def process_track(self, file_data, position, total):
+        """Identify one file and find its cover on a copy of its entry.
+
+        Runs on a worker thread: the model is not touched and log lines are
+        buffered, so process_files() can apply results in list order.
+        Returns (result, cover_found, error, log_lines).
+        """
+        result = dict(file_data)
+        cover_found = False
+        error = None
+        self.log_buffers.lines = []
+        try:
+            original_name = os.path.splitext(result['original'])[0]
+            self.log_message(f"Processing ({position}/{total}): {original_name}")
+            self.identify_track(result)
+            album = self.album_info(result)
+            cover_found = self.find_cover(result, album)
+        except Exception as e:
+            error = e
+            result['status'] = "Error"
+            self.log_message(f"  ❌ Error: {e}")
+        finally:
+            lines = self.log_buffers.lines
+            self.log_buffers.lines = None
+        return result, cover_found, error, lines
+
+    def process_files(self, files, on_result, workers=None, should_stop=None, is_paused=None):
+        """Look up metadata and covers for many files concurrently.
+
+        Each file keeps the usual source precedence (its sources are queried
+        together when hedged_lookups is on); up to ``workers`` files are in
+        flight at once. Results are applied to the entries and passed
+        to ``on_result(index, file_data, cover_found, error)`` in list order,
+        on the calling thread. Pausing holds back new files; stopping drops
+        the files that haven't started. Returns the number of files applied.
+        """
+        workers = max(1, int(workers or self.lookup_workers.get()))
+        self.http.set_pool_size(workers)
+        self.ytmusic_pool.resize(workers)
+        if self.lookup_cache:
+            self.lookup_cache.reset_stats()
+        for breaker in self.breakers.values():
+            breaker.skipped = 0
+        self.run_results.clear()
+        self.flights.reset_stats()
+        hedged_sources = len(self.rename_sources())
+        if self.hedged_lookups.get() and hedged_sources > 1:
+            # One thread per hedged search: each file queries the enabled rename sources
+            self.hedge_executor = ThreadPoolExecutor(max_workers=workers * hedged_sources,
+                                                     thread_name_prefix='hedge')
+        should_stop = should_stop or (lambda: False)
+        is_paused = is_paused or (lambda: False)
+        total = len(files)
+        in_flight = deque()
+        applied = 0
+
+        def apply_next():
+            nonlocal applied
+            i, file_data, future = in_flight.popleft()
+            result, cover_found, error, lines = future.result()
+            for line in lines:
+                self.write_log(line)
+            file_data.update(result)
+            on_result(i, file_data, cover_found, error)
+            applied += 1
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for i, file_data in enumerate(files):
+                    while is_paused() and not should_stop():
+                        # Lookups that finished before the pause still show up
+                        while in_flight and in_flight[0][2].done():
+                            apply_next()
+                        time.sleep(0.1)
+                    if should_stop():
+                        break
+                    in_flight.append((i, file_data, executor.submit(self.process_track, file_data, i + 1, total)))
+                    # Small window: results come back in order without queuing the whole list
+                    if len(in_flight) >= workers * 2:
+                        apply_next()
+
+                while in_flight:
+                    if should_stop():
+                        # Files already being looked up are still applied
+                        for _, _, future in in_flight:
+                            future.cancel()
+                        while in_flight and not in_flight[0][2].cancelled():
+                            apply_next()
+                        in_flight.clear()
+                        break
+                    apply_next()
+        finally:
+            if self.hedge_executor:
+                # Abandoned hedged searches may still be running: don't wait for them
+                self.hedge_executor.shutdown(wait=False, cancel_futures=True)
+                self.hedge_executor = None
+        return applied
+
+    def log_cache_stats(self):
+        """Log lookup cache hits/misses since reset_stats() and save pending entries"""
+        if not self.lookup_cache:
+            return
+        self.lookup_cache.flush()
+        cache = self.lookup_cache
+        lookups = cache.hits + cache.misses
+        if lookups:
+            # A known miss also counts as a miss of the positive cache
+            served = cache.hits + cache.known_misses
+            self.log_message(f"🗄️ Lookup cache: {cache.hits} hits, {cache.known_misses} known not found, "
+                             f"{cache.misses - cache.known_misses} misses "
+                             f"({100 * served / lookups:.0f}% served from disk)")
+
+    def configure_rate_limits(self, limits):
+        """Apply {source: (requests per second, burst)} to the HTTP client"""
+        for source, (rate, burst) in limits.items():
+            self.http.set_rate_limit(source, float(rate), int(burst))
+
+    def configure_save_workers(self, workers):
+        """Apply {drive type: files saved at the same time}"""
+        for kind, count in workers.items():
+            self.save_workers[kind] = max(1, int(count))
+
+    def log_http_stats(self):
+        """Log per-host request counts and how many reused a pooled connection"""
+        for host, stats in sorted(self.http.stats().items()):
+            reused = 100 * stats['reused'] / stats['requests']
+            self.log_message(f"🌐 {host}: {stats['requests']} requests, "
+                             f"{stats['connections']} connections ({reused:.0f}% reused)")
+        for source, stats in sorted(self.http.limiter_stats().items()):
+            if stats['throttled']:
+                self.log_message(f"🚦 {source}: throttled {stats['throttled']}x, now "
+                                 f"{stats['rate']} req/s with {stats['concurrency']} in parallel")
+
+    def log_normalization_stats(self):
+        """Log the hit rates of the memoized name normalization"""
+        rates = [f"{name} {100 * stats['hit_rate']:.0f}%"
+                 for name, stats in text_normalizer.cache_stats().items()
+                 if stats['hits'] + stats['misses']]
+        if rates:
+            self.log_message("🧠 Normalization cache hits: " + ", ".join(rates))
+
+    def log_flight_stats(self):
+        """Log how many lookups shared a call already in flight"""
+        if self.flights.coalesced:
+            self.log_message(f"🔗 {self.flights.coalesced} identical lookups shared "
+                             f"another file's request ({self.flights.calls} made)")
+
+    def save_file(self, file_data, destination=None):
+        """Rename/copy one file and write its tags and cover.
+
+        With a destination the file is copied there, otherwise it is renamed
+        in place. Returns False if the file was skipped; errors propagate.
+        """
+        old_path = file_data['path']
+        new_path = self.target_path(file_data, destination)
+        filename = os.path.basename(new_path)
+
+        copying = destination and new_path != old_path
+        if new_path != old_path and not copying:
+            # Rename in place
+            if not os.path.exists(new_path):
+                os.rename(old_path, new_path)
+                self.log_message(f"📝 Renomeado: {file_data['original']} → {file_data['new']}.mp3")
+            else:
+                self.log_message(f"⚠️ Arquivo já existe: {file_data['new']}.mp3")
+                return False
+            self.set_file_path(file_data, new_path)
+
+        # Tags (limpeza, texto e capa) montadas em memória: o arquivo é gravado uma vez só
+        source_path = old_path if copying else new_path
+        tags, new_cover = self.build_tags(source_path, file_data)
+
+        if copying:
+            # The copy is written with its final tags instead of copied and then retagged
+            self.write_copy(old_path, new_path, tags)
+            self.log_message(f"📁 Copiado: {os.path.basename(old_path)} → {filename}")
+            self.set_file_path(file_data, new_path)
+        elif tags is not None:
+            try:
+                self.save_tags(tags, new_path)
+            except Exception as e:
+                tags = None
+                self.log_message(f"  Erro ao atualizar metadados: {e}")
+
+        if tags is not None:
+            self.log_message(f"🏷️ Metadados atualizados (faixa #{file_data['index']})")
+            if new_cover:
+                self.log_message(f"🖼️ Capa adicionada ao arquivo")
+            self.cover_saved(file_data, new_cover)
+        return True
+
+    def cover_changed(self, file_data):
+        """Whether file_data['cover'] still has to be written to the file.
+
+        The embedded cover (cover_ref: hash, MIME, offset and length of its
+        raw bytes) is otherwise left alone: its APIC frame is saved back
+        byte for byte, never decoded and re-encoded.
+        """
+        cover = file_data['cover']
+        return cover is not None and cover is not file_data.get('saved_cover')
+
+    def cover_saved(self, file_data, new_cover):
+        """After a save: the embedded cover is now new_cover ((data, mime)) if one was written"""
+        if new_cover:
+            data, mime = new_cover
+            file_data['cover_ref'] = {'hash': hashlib.sha1(data).hexdigest(), 'mime': mime,
+                                      'offset': None, 'length': len(data)}
+        elif file_data.get('cover_ref'):
+            # Same bytes, but the tag was rewritten: the offset is no longer valid
+            file_data['cover_ref'] = dict(file_data['cover_ref'], offset=None)
+        if file_data['cover'] is not None:
+            file_data['saved_cover'] = file_data['cover']
+
+    def read_cover_bytes(self, file_data):
+        """Read the embedded cover bytes using the offset kept at load time"""
+        ref = file_data['cover_ref']
+        if ref['offset'] is not None:
+            try:
+                with open(file_data['path'], 'rb') as f:
+                    f.seek(ref['offset'])
+                    data = f.read(ref['length'])
+                # The tag may have been rewritten since it was scanned
+                if hashlib.sha1(data).hexdigest() == ref['hash']:
+                    return data
+            except OSError:
+                pass
+        data, _ = read_cover_data(file_data['path'])
+        return data
+
+    def target_path(self, file_data, destination=None):
+        """Where save_file() writes the file"""
+        if destination:
+            # Save to chosen folder
+            filename = file_data.get('new', file_data['original'])
+            # Sanitizar nome do arquivo para remover caracteres especiais
+            filename = self.sanitize_filename(filename)
+            if not filename.endswith('.mp3'):
+                filename += '.mp3'
+            return os.path.join(destination, filename)
+        # Save in original location with new name if changed
+        if file_data.get('new') and file_data['new'] != file_data['original']:
+            # Sanitizar nome do arquivo para remover caracteres especiais
+            sanitized_name = self.sanitize_filename(file_data['new'])
+            return os.path.join(os.path.dirname(file_data['path']), sanitized_name + '.mp3')
+        return file_data['path']
+
+    def save_partitions(self, files, destination=None):
+        """Split (index, file_data) pairs into lists that must be saved in order.
+
+        Renames in a folder depend on each other ("already exists" checks,
+        swapped names), so each source folder is one list. Copies only
+        depend on files with the same target name, unless the destination
+        also holds files being saved; then it is one list too.
+        """
+        if destination:
+            dest_key = self.path_key(destination)
+            if not any(os.path.dirname(file_data['path_key']) == dest_key for file_data in files):
+                partitions = {}
+                for i, file_data in enumerate(files):
+                    key = self.path_key(self.target_path(file_data, destination))
+                    partitions.setdefault(key, []).append((i, file_data))
+                return list(partitions.values())
+            return [list(enumerate(files))]
+        partitions = {}
+        for i, file_data in enumerate(files):
+            partitions.setdefault(os.path.dirname(file_data['path_key']), []).append((i, file_data))
+        return list(partitions.values())
+
+    def save_files(self, files, destination=None, on_saved=None, should_stop=None):
+        """Save many files on worker threads, in parallel across folders.
+
+        The lists from save_partitions() run in parallel, each one in order
+        on one worker. Each drive gets its own pool sized by its type (see
+        save_workers): several writers on a local disk, one on a pen drive.
+        ``on_saved(index, file_data, saved, error)`` is called on the calling
+        thread as files finish, after their log lines are written. Stopping
+        skips the files that haven't started. Returns the number saved.
+        """
+        should_stop = should_stop or (lambda: False)
+        done = queue.Queue()
+
+        def save_partition(partition):
+            try:
+                for i, file_data in partition:
+                    if should_stop():
+                        break
+                    saved, error = False, None
+                    self.log_buffers.lines = []
+                    try:
+                        saved = self.save_file(file_data, destination)
+                    except Exception as e:
+                        error = e
+                    finally:
+                        lines = self.log_buffers.lines
+                        self.log_buffers.lines = None
+                    done.put((i, file_data, saved, error, lines))
+            finally:
+                done.put(None)  # this list is finished
+
+        # One pool per drive, sized by the kind of drive
+        drives = {}
+        for partition in self.save_partitions(files, destination):
+            folder = destination or os.path.dirname(partition[0][1]['path'])
+            drives.setdefault(drive_of(folder), (folder, []))[1].append(partition)
+        executors = []
+        running = 0
+        saved_count = 0
+        # Each distinct cover is resized and encoded once for the whole batch
+        self.encoded_covers = {}
+        self.cover_keys = {}
+        try:
+            for folder, partitions in drives.values():
+                kind = drive_type(folder)
+                workers = max(1, min(int(self.save_workers.get(kind, 1)), len(partitions)))
+                self.log_message(f"💾 {len(partitions)} folder/file queue(s) on a {kind} drive: "
+                                 f"{workers} worker(s)")
+                executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='save')
+                executors.append(executor)
+                for partition in partitions:
+                    executor.submit(save_partition, partition)
+                    running += 1
+
+            while running:
+                result = done.get()
+                if result is None:
+                    running -= 1
+                    continue
+                i, file_data, saved, error, lines = result
+                for line in lines:
+                    self.write_log(line)
+                saved_count += bool(saved)
+                if on_saved:
+                    on_saved(i, file_data, saved, error)
+            return saved_count
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+            self.encoded_covers = None
+            self.cover_keys = {}
+
+    def build_tags(self, path, file_data):
+        """The file's ID3 tag with the final frames (cleanup, text, cover), not yet saved.
+
+        Returns (tags, new_cover): tags is None (after logging) if the
+        existing tag can't be read, new_cover is the (data, mime) put in the
+        APIC frame, or None if the file keeps its cover.
+        """
+        try:
+            try:
+                tags = ID3(path)
+            except ID3NoHeaderError:
+                tags = ID3()
+            self.apply_text_tags(tags, file_data['artist'], file_data['title'], file_data['album'],
+                                 year=file_data.get('year'), track_number=file_data['index'])
+        except Exception as e:
+            self.log_message(f"  Erro ao atualizar metadados: {e}")
+            return None, None
+        new_cover = None
+        if self.cover_changed(file_data):
+            try:
+                new_cover = self.apply_cover(tags, file_data['cover'], file_data.get('cover_ref'))
+            except Exception as e:
+                self.log_message(f"❌ Erro ao embutir capa em {os.path.basename(path)}: {e}")
+        return tags, new_cover
+
+    def write_copy(self, source, target, tags):
+        """Write source to target with tags applied, in a single write of target"""
+        if tags is None:
+            shutil.copy2(source, target)
+            return
+        with open(source, 'rb') as src:
+            head, trailer, audio_start, end = self.render_tags(src, tags)
+            with open(target, 'wb') as out:
+                out.write(head)
+                src.seek(audio_start)
+                remaining = end - audio_start - len(trailer)
+                while remaining > 0:
+                    chunk = src.read(min(remaining, COPY_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    remaining -= len(chunk)
+                out.write(trailer)
+        shutil.copystat(source, target)
+        self.count_save('copied')
+
+    def render_tags(self, f, tags):
+        """Render tags for the file open in f, without writing it.
+
+        Returns (tag, ID3v1 trailer, audio start, file end): tag replaces
+        bytes [0, audio start), the trailer (b'' if the file has no ID3v1)
+        replaces the file's last bytes.
+        """
+        audio_start = tags.size  # 0 se o arquivo não tinha tag ID3v2
+        end = f.seek(0, os.SEEK_END)
+        # ID3v1 no final: o mutagen o atualiza junto com a tag ID3v2
+        f.seek(max(audio_start, end - 128))
+        trailer = f.read()
+        if len(trailer) != 128 or not trailer.startswith(b'TAG'):
+            trailer = b''
+
+        reserved = []
+
+        def padding(info):
+            # O padding que a tag teria se fosse salva no próprio arquivo
+            reserved.append(self.tag_padding_for(PaddingInfo(info.padding + audio_start, end - audio_start)))
+            return reserved[-1]
+
+        # Só a tag nova (e o ID3v1) em memória, nunca o áudio
+        buffer = io.BytesIO(trailer)
+        tags.save(buffer, v2_version=3, padding=padding)
+        data = buffer.getvalue()
+        tag_length = len(data) - len(trailer)
+        # Free space left at the end of the tag, for the next edit
+        self.count_save('padding', reserved[-1] if reserved else 0)
+        return data[:tag_length], data[tag_length:], audio_start, end
+
+    def save_tags(self, tags, path):
+        """Save tags to path, in place when they fit in the file's current tag.
+
+        A tag that grows moves the audio once; unlike mutagen's own save,
+        the new space isn't zero-filled before the tag is written over it.
+        """
+        with open(path, 'r+b') as f:
+            head, trailer, audio_start, end = self.render_tags(f, tags)
+            if len(head) != audio_start:
+                self.move_audio(f, audio_start, len(head), end)
+            f.seek(0)
+            f.write(head)
+            if trailer:
+                f.seek(len(head) - audio_start + end - len(trailer))
+                f.write(trailer)
+        self.count_save('in_place' if len(head) == audio_start else 'rewritten')
+
+    @staticmethod
+    def move_audio(f, start, new_start, end):
+        """Move bytes [start, end) of f to new_start, resizing the file"""
+        length = end - start
+        if new_start > start:
+            # Cresce sem escrever zeros; copia de trás pra frente
+            f.truncate(new_start + length)
+            remaining = length
+            while remaining > 0:
+                size = min(remaining, COPY_CHUNK_SIZE)
+                remaining -= size
+                f.seek(start + remaining)
+                chunk = f.read(size)
+                f.seek(new_start + remaining)
+                f.write(chunk)
+        else:
+            done = 0
+            while done < length:
+                f.seek(start + done)
+                chunk = f.read(min(length - done, COPY_CHUNK_SIZE))
+                f.seek(new_start + done)
+                f.write(chunk)
+                done += len(chunk)
+            f.truncate(new_start + length)
+
+    def tag_padding_for(self, info):
+        """Padding callback for mutagen saves.
+
+        A tag that fits keeps all the free space it had (shrinking it would
+        move the audio too); a tag that doesn't gets tag_padding KB of room.
+        """
+        if info.padding >= 0:
+            return info.padding
+        return max(0, self.tag_padding.get()) * 1024
+
+    def count_save(self, kind, amount=1):
+        with self.save_stats_lock:
+            self.save_stats[kind] += amount
+
+    def reset_save_stats(self):
+        with self.save_stats_lock:
+            self.save_stats = dict.fromkeys(self.save_stats, 0)
+
+    def log_save_stats(self):
+        """Log how many tag saves fit in place, how many rewrote the file and
+        the free space (padding) left at the end of the saved tags"""
+        stats = self.save_stats
+        if stats['in_place'] or stats['rewritten']:
+            self.log_message(f"🏷️ Tags saved in place: {stats['in_place']}, "
+                             f"file rewritten (tag grew): {stats['rewritten']}")
+        if stats['copied']:
+            self.log_message(f"📁 Copies written with their final tags: {stats['copied']}")
+        saved = stats['in_place'] + stats['rewritten'] + stats['copied']
+        if saved:
+            self.log_message(f"📏 Tag padding left for later edits: "
+                             f"{stats['padding'] / saved / 1024:.1f} KB per file on average")
+        if stats['reused']:
+            self.log_message(f"🖼️ Covers encoded: {stats['encoded']}, reused by other tracks: {stats['reused']}")
+
+    def create_ytmusic_client(self):
+        """New YTMusic client with its own music.youtube.com session (no test query)"""
+        # Importar aqui para evitar problemas de inicialização
+        from ytmusicapi import YTMusic
+        # YTMusic keeps cookies/headers in its session: one per pooled client
+        return YTMusic(requests_session=self.http.new_session('music.youtube.com'))
+
+    def open_library_index(self):
+        """Open the persistent library index (None if it can't be created)"""
+        try:
+            return LibraryIndex(app_data_path('library_index.sqlite3'))
+        except Exception as e:
+            print(f"Aviso: índice da biblioteca indisponível: {e}")
+            return None
+
+    def open_lookup_cache(self):
+        """Open the persistent lookup cache (None if it can't be created)"""
+        try:
+            return LookupCache(app_data_path('lookup_cache.sqlite3'))
+        except Exception as e:
+            print(f"Aviso: cache de buscas indisponível: {e}")
+            return None
+
+    def cached_search(self, source, search, query):
+        """Run search(query) -> (artist, title) unless the cache already has the answer.
+
+        Both answers are cached: found results, and queries the source
+        answered with nothing (unless the search failed, see search_failed()).
+        """
+        if self.lookup_cache:
+            cached = self.lookup_cache.get(source, query)
+            if cached:
+                return tuple(cached)
+            if self.lookup_cache.is_known_miss(source, query):
+                self.log_message(f"  🗄️ {source}: not found on a previous run, skipped")
+                return None, None
+        def search_and_store():
+            artist, title = self.call_source(source, (None, None), search, query)
+            if self.lookup_cache:
+                if artist and title:
+                    self.lookup_cache.put(source, query, [artist, title])
+                elif self.search_state.sent and not self.search_state.failed:
+                    # Only the source saying "nothing" is a miss, not a query never sent
+                    self.lookup_cache.put_miss(source, query)
+            return artist, title
+        # Duplicates in the batch look up the same query at the same time
+        return self.flights.do(('search', source, normalize_query(query)), search_and_store)
+
+    def search_failed(self):
+        """Called by search_* when a request failed, so the miss isn't remembered"""
+        self.search_state.failed = True
+
+    def search_sent(self):
+        """Called by search_* before the request: returns before it (no artist/title
+        split, empty query, no client) are not answers from the source"""
+        self.search_state.sent = True
+
+    def call_source(self, source, default, search, *args):
+        """Call search(*args) through the source's circuit breaker.
+
+        Returns default without calling it while the breaker is open. If
+        the search sent a request (search_sent()), its outcome (search_failed()
+        or not) is recorded on the breaker; otherwise nothing is, and a
+        half-open breaker waits for a real probe.
+        """
+        breaker = self.breakers[source]
+        if not breaker.allow():
+            self.search_state.failed = True
+            self.search_state.sent = False
+            self.log_message(f"  ⛔ {SOURCE_NAMES[source]} skipped (unavailable, retry in {breaker.retry_in:.0f}s)")
+            return default
+        self.search_state.failed = False
+        self.search_state.sent = False
+        try:
+            result = search(*args)
+        except Exception:
+            self.search_failed()
+            raise
+        finally:
+            if not self.search_state.sent:
+                breaker.record_no_request()
+            elif self.search_state.failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        return result
+
+    def on_breaker_change(self, source, state):
+        """Log circuit breaker transitions (called from worker threads)"""
+        name = SOURCE_NAMES[source]
+        if state == OPEN:
+            self.write_log(f"⛔ {name}: fonte indisponível, pulando por {self.breakers[source].cooldown:.0f}s")
+        elif state == CLOSED:
+            self.write_log(f"✅ {name}: fonte disponível novamente")
+        else:
+            self.write_log(f"🔌 {name}: testando a fonte novamente")
+
+    def log_source_health(self):
+        """Log sources that were skipped or are still unavailable"""
+        for source, breaker in self.breakers.items():
+            if breaker.skipped or breaker.state != CLOSED:
+                self.log_message(f"⛔ {SOURCE_NAMES[source]}: {breaker.state}, "
+                                 f"skipped {breaker.skipped} lookups")
+
+    def read_track(self, file_path):
+        """Read track info, served from the library index when the file is unchanged"""
+        if self.library_index:
+            return self.library_index.read(file_path, read_track_info)
+        return read_track_info(file_path)
+
+    def extract_existing_metadata(self, file_path):
+        """Extract existing metadata from file"""
+        try:
+            record = self.read_track(file_path)
+            return record['artist'], record['title']
+        except Exception:
+            pass
+        return None, None
+
+    def ingest_file(self, file_path):
+        """Read tags with a single parse; the cover is only referenced, not decoded"""
+        record = dict(self.read_track(file_path))
+        record.pop('cover_data', None)
+        record['cover_ref'] = None
+        if record.get('cover_hash'):
+            record['cover_ref'] = {
+                'hash': record['cover_hash'],
+                'mime': record.get('cover_mime'),
+                'offset': record.get('cover_offset'),
+                'length': record.get('cover_length')
+            }
+        return record
+
+    def search_deezer(self, search_term):
+        """Busca no Deezer"""
+        try:
+            # Limpar termo de busca
+            clean_term = re.sub(r'[^\w\s]', ' ', search_term)
+            clean_term = re.sub(r'\s+', ' ', clean_term).strip()
+            if not clean_term:
+                return None, None
+            
+            # Buscar no Deezer
+            api_url = f"https://api.deezer.com/search?q={clean_term}"
+            
+            self.search_sent()
+            response = self.http.get(api_url, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                if self.deezer_quota_exceeded(api_url, data):
+                    self.search_failed()
+                    return None, None
+                
+                if 'data' in data and len(data['data']) > 0:
+                    track = data['data'][0]
+                    
+                    artist = track.get('artist', {}).get('name', '')
+                    title = track.get('title', '')
+                    
+                    if artist and title:
+                        return artist, title
+            else:
+                self.search_failed()
+            
+            return None, None
+            
+        except Exception as e:
+            self.search_failed()
+            self.log_message(f"  Erro na busca Deezer: {e}")
+            return None, None
+
+    def deezer_quota_exceeded(self, url, data):
+        """Deezer reports its rate limit as error code 4 inside an HTTP 200 answer"""
+        error = data.get('error') if isinstance(data, dict) else None
+        if isinstance(error, dict) and error.get('code') == 4:
+            self.http.throttled(url)
+            self.log_message("  🚦 Deezer: limite de requisições atingido, reduzindo o ritmo")
+            return True
+        return False
+
+    def search_theaudiodb(self, search_term):
+        """Busca simples e rápida no TheAudioDB - apenas artista/título"""
+        try:
+            # Extrair artista e título
+            artist_guess, title_guess = self.extract_artist_title(search_term)
+            
+            if not artist_guess or not title_guess:
+                return None, None
+            
+            # Busca direta por track específico - mais rápida
+            api_url = "https://theaudiodb.com/api/v1/json/2/searchtrack.php"
+            params = {'s': artist_guess, 't': title_guess}
+            
+            self.search_sent()
+            response = self.http.get(api_url, params=params, timeout=5)
+            if response.status_code == 200:
+                data = response.json()
+                if 'track' in data and data['track'] and len(data['track']) > 0:
+                    track = data['track'][0]
+                    artist = track.get('strArtist', '').strip()
+                    title = track.get('strTrack', '').strip()
+                    
+                    if artist and title:
+                        return artist, title
+            else:
+                self.search_failed()
+            
+            return None, None
+            
+        except Exception:
+            self.search_failed()
+            return None, None
+
+    def search_ytmusic(self, filename):
+        """Busca informações no YouTube Music com retry automático"""
+        max_attempts = 2
+        
+        for attempt in range(1, max_attempts + 1):
+            try:
+                artist_guess, title_guess = self.extract_artist_title(filename)
+                
+                if not artist_guess or not title_guess:
+                    return None, None
+                
+                # Buscar por artista e título
+                search_query = f"{artist_guess} {title_guess}"
+                self.log_message(f"🔍 YouTube Music: Buscando '{search_query}' (tentativa {attempt})")
+                
+                # Cliente deste worker; se a busca falhar ele é substituído
+                with self.ytmusic_pool.client() as ytmusic:
+                    self.search_sent()
+                    results = ytmusic.search(search_query, filter="songs", limit=5)
+                
+                if results:
+                    for result in results:
+                        if result.get('resultType') == 'song':
+                            # Extrair artista
+                            artists = result.get('artists', [])
+                            if artists:
+                                artist = artists[0].get('name', '').strip()
+                            else:
+                                artist = None
+                            
+                            # Extrair título
+                            title = result.get('title', '').strip()
+                            
+                            if artist and title:
+                                self.log_message(f"✅ YouTube Music: Encontrado '{artist} - {title}'")
+                                return artist, title
+                
+                self.log_message(f"⚠️ YouTube Music: Nenhum resultado encontrado para '{search_query}'")
+                return None, None
+                
+            except Exception as e:
+                self.log_message(f"❌ YouTube Music tentativa {attempt} falhou: {e}")
+                
+                if attempt == max_attempts:
+                    self.log_message("❌ YouTube Music: Todas as tentativas falharam")
+        
+        self.search_failed()
+        return None, None
+
+    def search_cover_all_sources(self, artist, title):
+        """Busca capa em todas as fontes habilitadas"""
+        # Deezer (se habilitado para capas)
+        if self.use_deezer_cover.get():
+            try:
+                cover_image = self.call_source('deezer', None, self.search_cover_deezer, artist, title)
+                if cover_image:
+                    return cover_image
+            except Exception:
+                pass
+            
+        # TheAudioDB (se habilitado para capas)
+        if self.use_theaudiodb_cover.get():
+            try:
+                cover_image = self.call_source('theaudiodb', None, self.search_cover_theaudiodb, artist, title)
+                if cover_image:
+                    return cover_image
+            except Exception:
+                pass
+            
+        # YouTube Music (se habilitado para capas)
+        if self.use_ytmusic_cover.get():
+            try:
+                cover_image = self.call_source('ytmusic', None, self.search_cover_ytmusic, artist, title)
+                if cover_image:
+                    return cover_image
+            except Exception:
+                pass
+            
+        # Google (só para capas)
+        if self.use_google_covers.get():
+            try:
+                cover_image = self.call_source('google', None, self.search_cover_google, artist, title)
+                if cover_image:
+                    return cover_image
+            except Exception:
+                pass
+            
+        return None
+
+    def search_cover_deezer(self, artist, title):
+        """Busca capa no Deezer com alta resolução"""
+        try:
+            query = f'artist:"{artist}" track:"{title}"'
+            api_url = f"https://api.deezer.com/search?q={query}"
+            
+            self.search_sent()
+            response = self.http.get(api_url, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                if self.deezer_quota_exceeded(api_url, data):
+                    self.search_failed()
+                    return None
+                
+                if 'data' in data and len(data['data']) > 0:
+                    track = data['data'][0]
+                    
+                    if 'album' in track:
+                        album = track['album']
+                        
+                        # Tentar diferentes resoluções em ordem de preferência (maior para menor)
+                        cover_sizes = [
+                            ('cover_xl', 'XL (1000x1000)'),      # 1000x1000
+                            ('cover_big', 'Big (500x500)'),      # 500x500  
+                            ('cover_medium', 'Medium (250x250)'), # 250x250
+                            ('cover', 'Standard (120x120)'),     # 120x120
+                            ('cover_small', 'Small (56x56)')     # 56x56
+                        ]
+                        
+                        for cover_key, size_desc in cover_sizes:
+                            if cover_key in album:
+                                cover_url = album[cover_key]
+                                
+                                try:
+                                    image = self.download_image(cover_url)
+                                    if image:
+                                        self.log_message(f"   🖼️ Capa Deezer encontrada: {size_desc} - {image.size[0]}x{image.size[1]}")
+                                        
+                                        # Não redimensionar aqui - deixar para embed_cover_art fazer isso
+                                        return image
+                                except Exception as e:
+                                    self.log_message(f"   ⚠️ Erro ao baixar capa {size_desc}: {e}")
+                                    continue
+            else:
+                self.search_failed()
+            
+            return None
+            
+        except Exception as e:
+            self.search_failed()
+            self.log_message(f"Erro ao buscar capa Deezer: {e}")
+            return None
+
+    def search_cover_theaudiodb(self, artist, title):
+        """Busca capa no TheAudioDB - CORRIGIDO"""
+        try:
+            # Buscar track específico
+            api_url = "https://theaudiodb.com/api/v1/json/2/searchtrack.php"
+            params = {
+                's': artist,
+                't': title
+            }
+            
+            self.search_sent()
+            response = self.http.get(api_url, params=params, timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                
+                if 'track' in data and len(data['track']) > 0:
+                    track = data['track'][0]
+                    album_id = track.get('idAlbum')
+                    
+                    if album_id:
+                        # Buscar capa do álbum
+                        cover_url = f"https://theaudiodb.com/api/v1/json/2/album.php?m={album_id}"
+                        cover_response = self.http.get(cover_url, timeout=10)
+                        
+                        if cover_response.status_code == 200:
+                            cover_data = cover_response.json()
+                            
+                            if 'album' in cover_data and len(cover_data['album']) > 0:
+                                album = cover_data['album'][0]
+                                cover_url = album.get('strAlbumThumb')
+                                
+                                if cover_url and cover_url != "":
+                                    img_response = self.http.get(cover_url, timeout=10)
+                                    if img_response.status_code == 200:
+                                        image = Image.open(io.BytesIO(img_response.content))
+                                        image.load()  # decode now: the image is shared between threads
+                                        self.log_message(f"   🖼️ Capa TheAudioDB encontrada: {image.size[0]}x{image.size[1]}")
+                                        # Não redimensionar aqui - deixar para embed_cover_art fazer isso
+                                        return image
+            else:
+                self.search_failed()
+            
+            return None
+            
+        except Exception as e:
+            self.search_failed()
+            self.log_message(f"Erro ao buscar capa TheAudioDB: {e}")
+            return None
+
+    def search_cover_ytmusic(self, artist, title):
+        """Busca capa no YouTube Music com retry automático"""
+        max_attempts = 2
+        
+        for attempt in range(1, max_attempts + 1):
+            try:
+                # Buscar por artista e título
+                search_query = f"{artist} {title}"
+                self.log_message(f"🖼️ YouTube Music: Buscando capa para '{search_query}' (tentativa {attempt})")
+                
+                # Cliente deste worker; se a busca falhar ele é substituído
+                with self.ytmusic_pool.client() as ytmusic:
+                    self.search_sent()
+                    results = ytmusic.search(search_query, filter="songs", limit=5)
+                
+                if results:
+                    for result in results:
+                        if result.get('resultType') == 'song':
+                            # Verificar se há thumbnail
+                            thumbnails = result.get('thumbnails', [])
+                            if thumbnails:
+                                # Pegar a thumbnail de maior resolução
+                                thumbnail_url = thumbnails[-1].get('url', '')
+                                if thumbnail_url:
+                                    # Baixar a imagem
+                                    response = self.http.get(thumbnail_url, timeout=10)
+                                    if response.status_code == 200:
+                                        # Converter para PIL Image
+                                        image = Image.open(io.BytesIO(response.content))
+                                        image.load()  # decode now: the image is shared between threads
+                                        
+                                        # Log das dimensões encontradas
+                                        self.log_message(f"✅ YouTube Music: Capa encontrada {image.size[0]}x{image.size[1]}")
+                                        
+                                        return image
+                
+                self.log_message(f"⚠️ YouTube Music: Nenhuma capa encontrada para '{search_query}'")
+                return None
+                
+            except Exception as e:
+                self.log_message(f"❌ YouTube Music capa tentativa {attempt} falhou: {e}")
+                
+                if attempt == max_attempts:
+                    self.log_message("❌ YouTube Music capa: Todas as tentativas falharam")
+        
+        self.search_failed()
+        return None
+
+    def search_cover_google(self, artist, title):
+        """Busca capa no Google (só para capas)"""
+        try:
+            query = f"{artist} {title} album cover"
+            search_url = f"https://www.google.com/search?q={query}&tbm=isch"
+            
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            }
+            
+            self.search_sent()
+            response = self.http.get(search_url, headers=headers, timeout=10)
+            if response.status_code == 200:
+                self.log_message("⚠️ Google Images requer implementação de scraping")
+                return None
+            
+            self.search_failed()
+            return None
+        except Exception as e:
+            self.search_failed()
+            self.log_message(f"Erro Google: {e}")
+            return None
+
+    def clean_filename(self, filename):
+        """Limpa nome do arquivo (regras em filename_cleaner)"""
+        cleaned = text_normalizer.clean_filename(filename)
+        
+        # Log da limpeza se houve mudança significativa
+        if filename != cleaned and len(cleaned) > 0:
+            self.log_message(f"🧹 Limpeza: '{filename}' → '{cleaned}'")
+        
+        return cleaned
+
+    def sanitize_filename(self, filename):
+        """Remove caracteres especiais que causam problemas no Windows"""
+        return text_normalizer.sanitize_filename(filename)
+
+    def extract_artist_title(self, filename):
+        """Extrai artista e título do nome do arquivo"""
+        return text_normalizer.extract_artist_title(filename)
+
+    def smart_capitalize(self, text):
+        """Capitalização inteligente"""
+        return text_normalizer.smart_capitalize(text)
+
+    @staticmethod
+    def path_key(path):
+        """Normalized key for a path, so the same file matches however it's spelled"""
+        key = os.path.normcase(os.path.realpath(path))
+        # Windows paths are case-insensitive; casefold also covers non-ASCII names
+        return key.casefold() if os.name == 'nt' else key
+
+    def index_file_path(self, file_data, key=None):
+        """Register file_data in files_by_path (key is computed if not given)"""
+        file_data['path_key'] = key or self.path_key(file_data['path'])
+        self.files_by_path[file_data['path_key']] = file_data
+
+    def set_file_path(self, file_data, new_path):
+        """Change a file's path and keep files_by_path in sync"""
+        # The old key was stored at insert time; the old path may no longer resolve
+        self.files_by_path.pop(file_data['path_key'], None)
+        file_data['path'] = new_path
+        self.index_file_path(file_data)
+
+    def normalize_album_name(self, album_name):
+        """Normaliza nome do álbum removendo variações desnecessárias"""
+        return text_normalizer.normalize_album_name(album_name)
+
+    def apply_text_tags(self, tags, artist, title, album, year=None, track_number=None):
+        """Limpa campos e grava/remove as tags de texto (ID3 v2.3, UTF-16) em memória"""
+        # LIMPAR CAMPOS DESNECESSÁRIOS que podem causar problemas em carros
+        campos_para_remover = ['TPE3', 'TPE4', 'TCOM', 'TCON', 'TPOS', 'TPUB', 'TCOP', 'TENC', 'TSSE', 'TLAN', 'TIPL', 'TMCL']
+        campos_removidos = []
+        for campo in campos_para_remover:
+            if campo in tags:
+                del tags[campo]
+                campos_removidos.append(campo)
+        
+        if campos_removidos:
+            self.log_message(f"  🧹 Removidos campos desnecessários: {', '.join(campos_removidos)}")
+        
+        # Configurar codificação UTF-16 para ID3v2.3
+        encoding = Encoding.UTF16
+        
+        # GRAVAÇÃO SELETIVA: Gravar ou remover tags baseado nas configurações
+        if artist and self.save_artist_tag.get():
+            artist_clean = self.transliterate_if_needed(artist)
+            tags["TPE1"] = TPE1(encoding=encoding, text=[artist_clean])
+            self.log_message(f"  🎤 Tag Artista gravada: {artist_clean}")
+        elif not self.save_artist_tag.get():
+            # Remover tag de artista se checkbox estiver desmarcado
+            if "TPE1" in tags:
+                del tags["TPE1"]
+                self.log_message(f"  🗑️ Tag Artista removida (checkbox desmarcado)")
+        
+        if title and self.save_title_tag.get():
+            title_clean = self.transliterate_if_needed(title)
+            tags["TIT2"] = TIT2(encoding=encoding, text=[title_clean])
+            self.log_message(f"  🎵 Tag Título gravada: {title_clean}")
+        elif not self.save_title_tag.get():
+            # Remover tag de título se checkbox estiver desmarcado
+            if "TIT2" in tags:
+                del tags["TIT2"]
+                self.log_message(f"  🗑️ Tag Título removida (checkbox desmarcado)")
+        
+        if album and self.save_album_tag.get():
+            album_normalized = self.transliterate_if_needed(album)
+            tags["TALB"] = TALB(encoding=encoding, text=[album_normalized])
+            self.log_message(f"  💿 Tag Álbum gravada: {album_normalized}")
+        elif not self.save_album_tag.get():
+            # Remover tag de álbum se checkbox estiver desmarcado
+            if "TALB" in tags:
+                del tags["TALB"]
+                self.log_message(f"  🗑️ Tag Álbum removida (checkbox desmarcado)")
+        
+        # IMPORTANTE: TPE2 (AlbumArtist) para sistemas de carros - só se habilitado
+        if album and self.save_album_tag.get() and self.save_albumartist_tag.get():
+            album_normalized = self.transliterate_if_needed(album)
+            album_artist = self.determine_album_artist(album_normalized, artist)
+            tags["TPE2"] = TPE2(encoding=encoding, text=[album_artist])
+            self.log_message(f"  👥 Tag AlbumArtist gravada: {album_artist}")
+        elif not self.save_albumartist_tag.get():
+            # Remover tag de AlbumArtist se checkbox estiver desmarcado
+            if "TPE2" in tags:
+                del tags["TPE2"]
+                self.log_message(f"  🗑️ Tag AlbumArtist removida (checkbox desmarcado)")
+            
+        if year and self.save_year_tag.get():
+            tags["TDRC"] = TDRC(encoding=encoding, text=[str(year)])
+            self.log_message(f"  📅 Tag Ano gravada: {year}")
+        elif not self.save_year_tag.get():
+            # Remover tag de ano se checkbox estiver desmarcado
+            if "TDRC" in tags:
+                del tags["TDRC"]
+                self.log_message(f"  🗑️ Tag Ano removida (checkbox desmarcado)")
+            
+        if track_number and self.save_track_tag.get():
+            tags["TRCK"] = TRCK(encoding=encoding, text=[str(track_number)])
+            self.log_message(f"  🔢 Tag Faixa gravada: {track_number}")
+        elif not self.save_track_tag.get():
+            # Remover tag de faixa se checkbox estiver desmarcado
+            if "TRCK" in tags:
+                del tags["TRCK"]
+                self.log_message(f"  🗑️ Tag Faixa removida (checkbox desmarcado)")
+
+    def determine_album_artist(self, album, artist):
+        """Determina o AlbumArtist mais apropriado para sistemas de carros"""
+        if not album:
+            return "Various Artists"
+        
+        # Se o álbum contém palavras como "mix", "compilation", "various", usar "Various Artists"
+        album_lower = album.lower()
+        compilation_keywords = ['mix', 'compilation', 'various', 'collection', 'hits', 'best of']
+        
+        for keyword in compilation_keywords:
+            if keyword in album_lower:
+                return "Various Artists"
+        
+        # Se o nome do álbum contém o nome do artista, usar o artista
+        if artist and artist.lower() in album_lower:
+            return artist
+        
+        # Para álbuns genéricos (como "musicas 2024"), usar "Various Artists"
+        generic_keywords = ['musicas', 'songs', 'music', 'tracks']
+        for keyword in generic_keywords:
+            if keyword in album_lower:
+                return "Various Artists"
+        
+        # Caso padrão: usar "Various Artists" para garantir agrupamento
+        return "Various Artists"
+
+    def apply_cover(self, tags, image, embedded=None):
+        """Substitui as capas do tag (em memória) pela imagem.
+
+        Returns (data, mime) of the new APIC frame, or None when the image
+        encodes to the bytes already embedded (cover_ref ``embedded``).
+        """
+        data, mime = self.encode_cover(image)
+        if embedded and embedded['hash'] == hashlib.sha1(data).hexdigest() and tags.getall("APIC"):
+            self.log_message("   ↩️ Capa igual à embutida, mantida sem regravar")
+            return None
+        # Remover todas as capas existentes e adicionar a nova
+        tags.delall("APIC")
+        tags.add(APIC(encoding=3, mime=mime, type=3, desc="Front cover", data=data))
+        self.log_message(f"   ➕ Nova capa adicionada ({len(data)} bytes, {mime})")
+        return data, mime
+
+    def encode_cover(self, image):
+        """Imagem -> (bytes, mime) para o frame APIC.
+
+        Inside save_files() the result is cached by the image's pixels, so
+        the tracks of an album (or any tracks with the same cover) reuse
+        one encoding; tracks saved at the same time wait for it.
+        """
+        source_format = image.format
+        covers = self.encoded_covers
+        if covers is None:
+            self.count_save('encoded')
+            return self.encode_cover_image(self.copy_cover(image), source_format)
+
+        key = self.cover_key(image, source_format)
+        cached = covers.get(key)
+        if cached is None:
+            def encode():
+                encoded = covers.get(key)
+                if encoded is None:
+                    encoded = covers[key] = self.encode_cover_image(self.copy_cover(image), source_format)
+                    self.count_save('encoded')
+                return encoded
+            cached = self.cover_flights.do(key, encode)
+        else:
+            self.count_save('reused')
+        return cached
+
+    def copy_cover(self, image):
+        """Copy to resize and encode: the tracks of an album share one image
+        and may be saved at the same time"""
+        with self.cover_lock:
+            return image.copy()
+
+    def cover_key(self, image, source_format):
+        """(pixel hash, size, mode, PNG?, max size); hashed once per image object in a batch"""
+        with self.cover_lock:
+            known = self.cover_keys.get(id(image))
+            if known is None:
+                key = (hashlib.blake2b(image.tobytes(), digest_size=16).digest(), image.size,
+                       image.mode, self.cover_as_png(image, source_format), COVER_MAX_SIZE)
+                # The image is kept so its id isn't reused during the batch
+                known = self.cover_keys[id(image)] = (image, key)
+        return known[1]
+
+    @staticmethod
+    def cover_as_png(image, source_format):
+        """Preferir PNG se a imagem original for PNG ou se tiver transparência"""
+        return (source_format == 'PNG' or image.mode in ('RGBA', 'LA')
+                or 'transparency' in image.info)
+
+    def encode_cover_image(self, image, source_format):
+        """Resize (if needed) and encode image, which is changed in place"""
+        # Redimensionar para uma resolução ótima se necessário
+        if image.size[0] > COVER_MAX_SIZE or image.size[1] > COVER_MAX_SIZE:
+            # Manter proporção ao redimensionar
+            image.thumbnail((COVER_MAX_SIZE, COVER_MAX_SIZE), Image.Resampling.LANCZOS)
+            self.log_message(f"   📐 Imagem redimensionada para: {image.size[0]}x{image.size[1]}")
+
+        img_byte_arr = io.BytesIO()
+        if self.cover_as_png(image, source_format):
+            image.save(img_byte_arr, format='PNG', optimize=True)
+            return img_byte_arr.getvalue(), 'image/png'
+        # Usar qualidade 95% para JPEG (padrão é 75%)
+        image.save(img_byte_arr, format='JPEG', quality=95, optimize=True)
+        return img_byte_arr.getvalue(), 'image/jpeg'
+
+    def transliterate_if_needed(self, text):
+        """Translitera apenas se contém caracteres não-LATIN"""
+        return text_normalizer.transliterate(text)
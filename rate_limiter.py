@@ -0,0 +1,158 @@
+"""
+MP3 Album Tool - Rate limiter
+Per-source token buckets with AIMD concurrency, applied at the HTTP adapter
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# source -> (requests per second, burst); Deezer documents 50 requests / 5 s
+DEFAULT_RATE_LIMITS = {
+    'deezer': (8.0, 10),
+    'theaudiodb': (2.0, 4),
+    'ytmusic': (4.0, 6),
+}
+
+# Hosts whose requests count against a source's limit
+SOURCE_HOSTS = {
+    'api.deezer.com': 'deezer',
+    'theaudiodb.com': 'theaudiodb',
+    'www.theaudiodb.com': 'theaudiodb',
+    'music.youtube.com': 'ytmusic',
+}
+
+
+class TokenBucket:
+    """Classic token bucket; take() reserves a token and says how long to wait"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> float:
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            # Tokens may go negative: later callers queue up behind this one
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def set_rate(self, rate: float):
+        """Change the refill rate; tokens earned at the old rate are kept"""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def hold(self, seconds: float):
+        """Don't hand out tokens for the next seconds (e.g. Retry-After)"""
+        with self._lock:
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class AdaptiveLimiter:
+    """Rate and concurrency limit for one source, adjusted AIMD style.
+
+    Every throttling signal (HTTP 429/5xx, timeouts, connection errors)
+    halves both the request rate and the number of parallel requests; each
+    successful response adds back a small step until the configured rate and
+    the pool size are reached again.
+    """
+
+    RATE_STEP = 1 / 50  # of the configured rate, per successful response
+    MIN_RATE = 0.2
+
+    def __init__(self, rate: float, burst: int, max_concurrency: int):
+        self.max_rate = rate
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = float(self.max_concurrency)
+        self.active = 0
+        self.requests = 0
+        self.throttled = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """Wait for a free parallel slot and a token, then run the request"""
+        with self._cond:
+            while self.active >= int(self.concurrency):
+                self._cond.wait()
+            self.active += 1
+        try:
+            wait = self.bucket.take()
+            if wait > 0:
+                time.sleep(wait)
+            yield
+        finally:
+            with self._cond:
+                self.active -= 1
+                self._cond.notify()
+
+    def on_success(self):
+        with self._cond:
+            self.requests += 1
+            # Additive increase: about one more parallel request per window
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+            self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.max_rate * self.RATE_STEP))
+            self._cond.notify_all()
+
+    def on_throttle(self, retry_after: float = 0):
+        with self._cond:
+            self.requests += 1
+            self.throttled += 1
+            # Multiplicative decrease
+            self.concurrency = max(1.0, self.concurrency / 2)
+            self.bucket.set_rate(max(self.MIN_RATE, self.bucket.rate / 2))
+        self.bucket.hold(retry_after)
+
+    def configure(self, rate: float = None, burst: int = None, max_concurrency: int = None):
+        """Change the limits; raised limits are reached by the normal ramp-up"""
+        with self._cond:
+            if rate is not None:
+                self.max_rate = rate
+                self.bucket.set_rate(min(self.bucket.rate, rate))
+            if burst is not None:
+                self.bucket.burst = burst
+            if max_concurrency is not None:
+                self.max_concurrency = max(1, max_concurrency)
+                self.concurrency = min(self.concurrency, self.max_concurrency)
+            self._cond.notify_all()
+
+
+def _retry_after(response) -> float:
+    try:
+        return min(float(response.headers.get('Retry-After', 0)), 60.0)
+    except ValueError:
+        return 0.0
+
+
+class LimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that sends through an AdaptiveLimiter and feeds it the outcome"""
+
+    def __init__(self, limiter: AdaptiveLimiter, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        with self.limiter.slot():
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.Timeout, requests.ConnectionError):
+                self.limiter.on_throttle()
+                raise
+        if response.status_code == 429 or response.status_code >= 500:
+            self.limiter.on_throttle(_retry_after(response))
+        else:
+            self.limiter.on_success()
+        return response
@@ -0,0 +1,51 @@
+"""
+MP3 Album Tool - Single flight
+Identical lookups running at the same time share one call and its result
+"""
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """do(key, fn) runs fn once per key at a time.
+
+    Callers arriving while a call for the same key is in flight wait for it
+    and get the same result (or exception). Nothing is kept after the call
+    returns: that's the lookup cache's job.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._flights.get(key)
+            owner = future is None
+            if owner:
+                future = self._flights[key] = Future()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._land(key)
+            future.set_exception(e)
+            raise
+        self._land(key)
+        future.set_result(result)
+        return result
+
+    def _land(self, key):
+        with self._lock:
+            del self._flights[key]
+
+    def reset_stats(self):
+        self.calls = 0
+        self.coalesced = 0
@@ -0,0 +1,11 @@
+import pytest
+
+from mp3_engine import MP3Engine
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """MP3Engine without the on-disk library index and lookup cache"""
+    monkeypatch.setattr(MP3Engine, 'open_library_index', lambda self: None)
+    monkeypatch.setattr(MP3Engine, 'open_lookup_cache', lambda self: None)
+    return MP3Engine()
@@ -0,0 +1,52 @@
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def open_breaker(engine, source):
+    breaker = engine.breakers[source]
+    for _ in range(breaker.failure_threshold):
+        breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    breaker.opened_at -= breaker.cooldown  # cooldown over: the next call is a probe
+    return breaker
+
+
+def test_return_without_request_is_not_a_probe(engine):
+    breaker = open_breaker(engine, 'theaudiodb')
+    # No artist/title split: search_theaudiodb returns before any request
+    assert engine.call_source('theaudiodb', (None, None), engine.search_theaudiodb, "x") == (None, None)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()  # the probe is still available
+
+
+def test_request_that_answers_closes_the_breaker(engine):
+    breaker = open_breaker(engine, 'deezer')
+
+    def search(query):
+        engine.search_sent()
+        return None, None
+
+    engine.call_source('deezer', (None, None), search, "artist title")
+    assert breaker.state == CLOSED
+
+
+def test_failed_request_reopens_the_breaker(engine):
+    breaker = open_breaker(engine, 'deezer')
+
+    def search(query):
+        engine.search_sent()
+        engine.search_failed()
+        return None, None
+
+    engine.call_source('deezer', (None, None), search, "artist title")
+    assert breaker.state == OPEN
+
+
+def test_record_no_request_releases_the_probe():
+    breaker = CircuitBreaker('test', failure_threshold=1, cooldown=0)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_no_request()
+    assert breaker.allow()
@@ -0,0 +1,73 @@
+import pytest
+
+import mp3_cli
+from mp3_engine import MP3Engine
+
+SEARCHES = {
+    'search_deezer': ('Artist', 'Title'),
+    'search_theaudiodb': ('Artist', 'Title'),
+    'search_ytmusic': ('Artist', 'Title'),
+    'search_album_deezer': None,
+    'search_cover_deezer': None,
+    'search_cover_theaudiodb': None,
+    'search_cover_ytmusic': None,
+    'search_cover_google': None,
+}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Names of the search_* methods called during a CLI run (no network)"""
+    monkeypatch.setattr(MP3Engine, 'open_library_index', lambda self: None)
+    monkeypatch.setattr(MP3Engine, 'open_lookup_cache', lambda self: None)
+    called = []
+
+    def fake(name, result):
+        def search(self, *args):
+            called.append(name)
+            return result
+        return search
+
+    for name, result in SEARCHES.items():
+        monkeypatch.setattr(MP3Engine, name, fake(name, result))
+    return called
+
+
+def run(tmp_path, *options):
+    (tmp_path / 'Artist - Title.mp3').write_bytes(b'')
+    mp3_cli.main([str(tmp_path), '--dry-run', '--workers', '1', *options])
+
+
+def test_disabled_sources_are_never_called(tmp_path, calls, capsys):
+    run(tmp_path, '--sources', 'theaudiodb', '--cover-sources', 'theaudiodb')
+    assert 'search_theaudiodb' in calls
+    assert 'search_cover_theaudiodb' in calls
+    assert not set(calls) - {'search_theaudiodb', 'search_cover_theaudiodb'}
+
+
+def test_no_sources(tmp_path, calls, capsys):
+    run(tmp_path, '--sources', 'none', '--cover-sources', 'none')
+    assert calls == []
+
+
+def test_all_sources_by_default(tmp_path, calls, capsys):
+    run(tmp_path)
+    assert {'search_deezer', 'search_cover_google'} <= set(calls)
+
+
+def test_unknown_source_is_rejected(capsys):
+    with pytest.raises(SystemExit):
+        mp3_cli.build_parser().parse_args(['x', '--cover-sources', 'deezer,spotify'])
+    assert 'spotify' in capsys.readouterr().err
+
+
+def test_year_lookup_skips_a_disabled_deezer(engine, calls):
+    engine.save_year_tag.set(True)
+    engine.use_deezer_rename.set(False)
+    engine.use_deezer_cover.set(False)
+    file_data = {'path': 'Album/01.mp3', 'artist': 'Artist', 'album': 'Album', 'cover': None}
+    assert engine.album_info(file_data) is None
+    assert calls == []
+    engine.use_deezer_rename.set(True)
+    engine.album_info(file_data)
+    assert calls == ['search_album_deezer']
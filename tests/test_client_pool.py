@@ -0,0 +1,48 @@
+import threading
+
+from client_pool import ClientPool
+
+
+def test_waiter_wakes_up_when_background_creation_fails():
+    fill_started = threading.Event()
+    fail_now = threading.Event()
+    calls = []
+
+    def factory():
+        calls.append(None)
+        if len(calls) == 2:
+            # The background warm-up: fails while another caller waits for capacity
+            fill_started.set()
+            fail_now.wait(5)
+            raise ConnectionError("no client")
+        return object()
+
+    pool = ClientPool(factory, size=2)
+    got = []
+    with pool.client() as first:
+        assert fill_started.wait(5)
+
+        def second_caller():
+            with pool.client() as client:
+                got.append(client)
+
+        waiter = threading.Thread(target=second_caller, daemon=True)
+        waiter.start()
+        waiter.join(0.2)
+        assert waiter.is_alive()  # pool full: waiting
+        fail_now.set()
+        waiter.join(5)
+        assert not waiter.is_alive()
+    assert got and got[0] is not first
+
+
+def test_client_discarded_when_its_block_raises():
+    pool = ClientPool(object, size=1)
+    try:
+        with pool.client():
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert pool.replaced == 1
+    with pool.client() as client:
+        assert client is not None
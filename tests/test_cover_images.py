@@ -0,0 +1,40 @@
+import contextlib
+import io
+
+from PIL import Image
+
+
+class Response:
+    def __init__(self, payload=None, content=b''):
+        self.status_code = 200
+        self.payload = payload
+        self.content = content
+
+    def json(self):
+        return self.payload
+
+
+def png():
+    data = io.BytesIO()
+    Image.new('RGB', (8, 8), (200, 10, 10)).save(data, format='PNG')
+    return data.getvalue()
+
+
+def test_theaudiodb_cover_is_decoded_before_it_is_shared(engine, monkeypatch):
+    responses = iter([Response({'track': [{'idAlbum': '1'}]}),
+                      Response({'album': [{'strAlbumThumb': 'https://example.com/a.png'}]}),
+                      Response(content=png())])
+    monkeypatch.setattr(engine.http, 'get', lambda url, **kwargs: next(responses))
+    image = engine.search_cover_theaudiodb('Artist', 'Title')
+    assert image.tile == []  # nothing left to decode lazily
+
+
+def test_ytmusic_cover_is_decoded_before_it_is_shared(engine, monkeypatch):
+    class Client:
+        def search(self, query, **kwargs):
+            return [{'resultType': 'song', 'thumbnails': [{'url': 'https://example.com/a.png'}]}]
+
+    monkeypatch.setattr(engine.ytmusic_pool, 'client', lambda: contextlib.nullcontext(Client()))
+    monkeypatch.setattr(engine.http, 'get', lambda url, **kwargs: Response(content=png()))
+    image = engine.search_cover_ytmusic('Artist', 'Title')
+    assert image.tile == []
@@ -0,0 +1,97 @@
+import re
+
+import pytest
+
+import filename_cleaner
+from filename_cleaner import clean_filename
+
+# (file name, clean_filename result) recorded from the original implementation
+CLEAN_GOLDEN = [
+    ('01 - Queen - Bohemian Rhapsody (Official Video)', 'Queen - Bohemian Rhapsody'),
+    ('1. Anitta - Envolver [Official Music Video]', 'Anitta - Envolver [Official'),
+    ('Zé Neto & Cristiano - Largado às Traças (Ao Vivo)', 'Zé Neto & Cristiano - Largado às Traças'),
+    ('MC_Livinho_-_Fazer_Falta_videoclip_', 'MCLivinho-FazerFalta'),
+    ('Olivia Rodrigo - drivers license (Lyrics)', 'Olivia Rodrigo - drivers license'),
+    ('Shadow Hunters - Night Ride', 'Shadow Hunters - Night Ride'),
+    ('Discovery Band - Summer', 'Dis'),
+    ('Clean Bandit - Rather Be', ''),
+    ('Audioslave - Like a Stone | Canal Oficial', 'Audioslave - Like a Stone'),
+    ('Jorge & Mateus - Os Anjos Cantam #shorts', 'Jorge & Mateus - Os Anjos Cantam'),
+    ('Coverdale - Here I Go Again {Live}', ''),
+    ('Legião Urbana - Tempo Perdido (Versão Acústica)', 'Legião Urbana - Tempo Perdido'),
+    ('003-Artist_-_Song_official_audio', 'Artist-Songofficialaudio'),
+    ('Artist - Song - Video Oficial', 'Artist - Song'),
+    ('Artist - Song (Clipe Oficial) [4K]', 'Artist - Song'),
+    ('artist-song-video-', 'artist-song'),
+    ('The Beatles - Help! (Remastered 2009)', 'The Beatles - Help!'),
+    ('Song Name [1080p]', 'Song Name ['),
+    ('Marília Mendonça - Supera Letra', 'Marília Mendonça - Supera'),
+    ('Artist_Song_bonus', 'ArtistSongbonus'),
+    ('Artist - Song audio', 'Artist - Song'),
+    ('Banda - Show Completo (DVD)', 'Banda - Show Completo'),
+    ('__oficial__Artist - Song', 'oficialArtist - Song'),
+    ('Artist - Song - ', 'Artist - Song'),
+    ('Artist - Song (Karaoke Version)', 'Artist - Song'),
+    ('BTS - Dynamite MV', 'BTS - Dynamite'),
+    ('Artist - Song (Radio Edit)', 'Artist - Song'),
+    ('Artist_music_Song', 'ArtistmusicSong'),
+    ('video_Artist_Song', 'videoArtistSong'),
+    ('Artist - Song feat. Someone', 'Artist - Song feat. Someone'),
+    ('İlkay Şencan - Dinle', 'İlkay Şencan - Dinle'),
+    ('12_Artist\t-\tSong', 'Artist - Song'),
+    ('Artist -- Song ...', 'Artist - Song'),
+    ('Artist - Song_-_', 'Artist - Song'),
+    ('Henrique & Juliano - Vidinha de Balada (DVD Ao Vivo Em Brasília)', 'Henrique & Juliano - Vidinha de Balada'),
+    ('Artist - Música Boa (Acústico)', 'Artist - Música Boa'),
+    ('2024 Artist - Song', 'Artist - Song'),
+    ('Artist - Video Killed the Radio Star', 'Artist - Killed the Radio Star'),
+    ('Artist - Song (FULL HD)', 'Artist - Song (FULL'),
+    ('Artist - HDMI Blues', 'Artist'),
+]
+
+
+
+
+@pytest.mark.parametrize('name, expected', CLEAN_GOLDEN)
+def test_golden(name, expected):
+    assert clean_filename(name) == expected
+
+
+def every_rule(filename):
+    """clean_filename without the keyword shortcut: every rule runs"""
+    filename = filename_cleaner._LEADING_NUMBER.sub('', filename)
+    for _, pattern in filename_cleaner._CUT_RULES + filename_cleaner._SYMBOL_RULES:
+        filename = pattern.sub('', filename)
+    for _, patterns in filename_cleaner._WORD_RULES:
+        for pattern, replacement in patterns:
+            filename = pattern.sub(replacement, filename)
+    for pattern, replacement in ((filename_cleaner._MULTIPLE_UNDERSCORES, '_'),
+                                 (filename_cleaner._MULTIPLE_HYPHENS, '-'),
+                                 (filename_cleaner._MULTIPLE_SPACES, ' ')):
+        filename = pattern.sub(replacement, filename)
+    return filename.strip('_-. ').strip()
+
+
+def case_variants(keyword):
+    """keyword in upper, title and alternating case: never as written in the rule table"""
+    alternating = ''.join(c.upper() if i % 2 else c.lower() for i, c in enumerate(keyword))
+    return {keyword.upper(), keyword.title(), alternating, alternating.swapcase()} - {keyword}
+
+
+KEYWORDS = sorted({keyword for keyword, _ in filename_cleaner._CUT_RULES}
+                  | set(filename_cleaner._PROBLEMATIC_WORDS))
+
+
+@pytest.mark.parametrize('keyword', KEYWORDS)
+def test_rules_fire_whatever_the_keyword_case(keyword):
+    for variant in case_variants(keyword):
+        for name in (f"Artist - Song ({variant})", f"Artist - Song {variant}",
+                     f"Artist_Song_{variant}", f"{variant}-Artist - Song"):
+            assert clean_filename(name) == every_rule(name), name
+
+
+def test_dotted_capital_i_matches_like_the_regex():
+    # re.IGNORECASE matches 'İ' to 'i', casefold() alone would hide the keyword
+    name = 'Artist - Song (LİVE)'
+    assert re.search('live', name, re.IGNORECASE)
+    assert clean_filename(name) == every_rule(name) == 'Artist - Song'
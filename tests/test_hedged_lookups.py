@@ -0,0 +1,27 @@
+def test_hedge_executor_sized_by_enabled_rename_sources(engine, monkeypatch):
+    engine.hedged_lookups.set(True)
+    engine.use_ytmusic_rename.set(False)
+    sizes = []
+
+    def process_track(file_data, position, total):
+        sizes.append(engine.hedge_executor._max_workers)
+        return {}, False, None, []
+
+    monkeypatch.setattr(engine, 'process_track', process_track)
+    engine.process_files([{'original': 'a.mp3'}], lambda *args: None, workers=3)
+    assert sizes == [3 * 2]  # Deezer and TheAudioDB; Google only finds covers
+
+
+def test_no_hedge_executor_with_a_single_rename_source(engine, monkeypatch):
+    engine.hedged_lookups.set(True)
+    engine.use_theaudiodb_rename.set(False)
+    engine.use_ytmusic_rename.set(False)
+    executors = []
+
+    def process_track(file_data, position, total):
+        executors.append(engine.hedge_executor)
+        return {}, False, None, []
+
+    monkeypatch.setattr(engine, 'process_track', process_track)
+    engine.process_files([{'original': 'a.mp3'}], lambda *args: None, workers=3)
+    assert executors == [None]
@@ -0,0 +1,12 @@
+from http_client import HttpClient
+
+
+def test_own_sessions_are_separate_and_share_the_rate_limit():
+    http = HttpClient(pool_size=4)
+    first = http.new_session('music.youtube.com')
+    second = http.new_session('music.youtube.com')
+    assert first is not second
+    assert first is not http.session_for('music.youtube.com')
+    assert first.get_adapter('https://').limiter is second.get_adapter('https://').limiter
+    assert first.get_adapter('https://').limiter is http.session_for('music.youtube.com').get_adapter('https://').limiter
+    http.close()
@@ -0,0 +1,147 @@
+import pytest
+from mutagen.id3 import APIC, ID3, TALB, TIT2, TPE1, TRCK
+
+import track_reader
+from id3_reader import ID3Malformed, read_id3_fast
+from track_reader import read_track_info, read_track_info_full
+
+MPEG_FRAME = b'\xff\xfb\x90\x00' + b'\x00' * 413
+COVER = b'\xff\xd8\xff\xe0' + bytes(range(256)) * 4 + b'\xff\x00\xff\xd9'
+FIELDS = ('artist', 'title', 'album', 'track', 'cover_data', 'cover_hash', 'cover_mime')
+
+
+def syncsafe(value):
+    return bytes((value >> shift) & 0x7F for shift in (21, 14, 7, 0))
+
+
+def unsynchronise(data):
+    return data.replace(b'\xff', b'\xff\x00')
+
+
+def frame(version, frame_id, payload, flags=0):
+    if version == 2:
+        return frame_id + len(payload).to_bytes(3, 'big') + payload
+    size = syncsafe(len(payload)) if version == 4 else len(payload).to_bytes(4, 'big')
+    return frame_id + size + flags.to_bytes(2, 'big') + payload
+
+
+def tag(version, body, flags=0):
+    return b'ID3' + bytes((version, 0, flags)) + syncsafe(len(body)) + body
+
+
+def text(value, encoding=3):
+    codec = {0: 'latin-1', 1: 'utf-16', 3: 'utf-8'}[encoding]
+    return bytes((encoding,)) + value.encode(codec)
+
+
+def write(path, data):
+    path.write_bytes(data + MPEG_FRAME * 20)
+    return str(path)
+
+
+def mutagen_file(path, version, encoding=3):
+    path.write_bytes(MPEG_FRAME * 20)
+    tags = ID3()
+    tags.add(TPE1(encoding=encoding, text=['Ærtist ☃']))
+    tags.add(TIT2(encoding=encoding, text=['Títle']))
+    tags.add(TALB(encoding=encoding, text=['Album']))
+    tags.add(TRCK(encoding=encoding, text=['3/12']))
+    tags.add(APIC(encoding=encoding, mime='image/jpeg', type=3, desc='Front cövers', data=COVER))
+    tags.save(str(path), v2_version=version)
+    return str(path)
+
+
+def assert_same_as_mutagen(path, lazy_cover=True):
+    fast, full = read_id3_fast(path), read_track_info_full(path)
+    assert {field: fast[field] for field in FIELDS} == {field: full[field] for field in FIELDS}
+    if fast['cover_data'] is None:
+        return fast
+    assert fast['cover_length'] == len(full['cover_data'])
+    if lazy_cover:
+        with open(path, 'rb') as f:
+            f.seek(fast['cover_offset'])
+            assert f.read(fast['cover_length']) == full['cover_data']
+    else:
+        assert fast['cover_offset'] is None
+    return fast
+
+
+@pytest.mark.parametrize('version', [3, 4])
+@pytest.mark.parametrize('encoding', [0, 1, 3])
+def test_mutagen_tags(tmp_path, version, encoding):
+    if encoding == 0:
+        path = str(tmp_path / 'a.mp3')
+        (tmp_path / 'a.mp3').write_bytes(MPEG_FRAME * 20)
+        tags = ID3()
+        tags.add(TPE1(encoding=0, text=['Artist']))
+        tags.add(APIC(encoding=0, mime='image/png', type=3, desc='x', data=COVER))
+        tags.save(path, v2_version=version)
+    else:
+        path = mutagen_file(tmp_path / 'a.mp3', version, encoding)
+    fast = assert_same_as_mutagen(path)
+    assert fast['artist']
+
+
+def test_v22(tmp_path):
+    body = (frame(2, b'TP1', text('Artist', 1)) + frame(2, b'TT2', text('Title'))
+            + frame(2, b'TAL', text('Album')) + frame(2, b'TRK', text('7'))
+            + frame(2, b'PIC', b'\x00JPG\x03desc\x00' + COVER) + b'\x00' * 64)
+    fast = assert_same_as_mutagen(write(tmp_path / 'a.mp3', tag(2, body)))
+    assert (fast['artist'], fast['track'], fast['cover_mime']) == ('Artist', '7', 'image/jpeg')
+
+
+@pytest.mark.parametrize('version', [2, 3])
+def test_unsynchronised_tag(tmp_path, version):
+    if version == 2:
+        frames = frame(2, b'TT2', text('Title')) + frame(2, b'PIC', b'\x00JPG\x03\x00' + COVER)
+    else:
+        frames = frame(3, b'TIT2', text('Title')) + frame(3, b'APIC', b'\x00image/jpeg\x00\x03\x00' + COVER)
+    path = write(tmp_path / 'a.mp3', tag(version, unsynchronise(frames), flags=0x80))
+    fast = assert_same_as_mutagen(path, lazy_cover=False)
+    assert fast['cover_data'] == COVER
+
+
+def test_unsynchronised_v24_frame(tmp_path):
+    body = (frame(4, b'TIT2', text('Title'))
+            + frame(4, b'APIC', unsynchronise(b'\x00image/jpeg\x00\x03\x00' + COVER), flags=0x0002))
+    fast = assert_same_as_mutagen(write(tmp_path / 'a.mp3', tag(4, body)), lazy_cover=False)
+    assert fast['cover_data'] == COVER
+
+
+@pytest.mark.parametrize('version', [3, 4])
+def test_extended_header(tmp_path, version):
+    if version == 3:
+        extended = (6).to_bytes(4, 'big') + b'\x00\x00' + (0).to_bytes(4, 'big')
+    else:
+        extended = syncsafe(6) + b'\x01\x00'
+    body = (extended + frame(version, b'TPE1', text('Artist')) + frame(version, b'TIT2', text('Title'))
+            + frame(version, b'APIC', b'\x00image/png\x00\x03\x00' + COVER))
+    fast = assert_same_as_mutagen(write(tmp_path / 'a.mp3', tag(version, body, flags=0x40)))
+    assert fast['title'] == 'Title'
+
+
+def test_id3v1_only(tmp_path):
+    v1 = (b'TAG' + b'Title'.ljust(30, b'\x00') + b'Artist'.ljust(30, b'\x00')
+          + b'Album'.ljust(30, b'\x00') + b'2001' + b'\x00' * 29 + b'\x05' + b'\xff')
+    path = tmp_path / 'a.mp3'
+    path.write_bytes(MPEG_FRAME * 20 + v1)
+    fast = assert_same_as_mutagen(str(path))
+    assert (fast['artist'], fast['title'], fast['album'], fast['track']) == ('Artist', 'Title', 'Album', '5')
+
+
+@pytest.mark.parametrize('data', [
+    tag(3, frame(3, b'TIT2', text('Title')))[:15],               # truncated: tag larger than the file
+    b'ID3\x03\x00\x00\x80\x80\x80\x80',                           # size bytes aren't syncsafe
+    b'ID3\x05\x00\x00\x00\x00\x00\x10' + b'\x00' * 16,            # unknown major version
+    b'ID3\x03\x00\x00\x00\x00\x00\x20' + b'\xfe' * 32,          # garbage frame id
+])
+def test_garbage_falls_back_to_the_full_parser(tmp_path, monkeypatch, data):
+    path = tmp_path / 'a.mp3'
+    path.write_bytes(data)
+    with pytest.raises(ID3Malformed):
+        read_id3_fast(str(path))
+
+    calls = []
+    monkeypatch.setattr(track_reader, 'read_track_info_full', lambda p: calls.append(p) or {'artist': 'full'})
+    assert read_track_info(str(path)) == {'artist': 'full'}
+    assert calls == [str(path)]
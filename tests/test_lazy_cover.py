@@ -0,0 +1,43 @@
+import pytest
+from mutagen.id3 import APIC, ID3, TIT2
+
+import mp3_engine
+
+MPEG_FRAME = b'\xff\xfb\x90\x00' + b'\x00' * 413
+COVER = b'\xff\xd8\xff\xe0' + bytes(range(256)) * 16 + b'\xff\xd9'
+
+
+def tagged_file(path, *frames):
+    path.write_bytes(MPEG_FRAME * 20)
+    tags = ID3()
+    for frame in frames:
+        tags.add(frame)
+    tags.save(str(path), v2_version=3)
+    return str(path)
+
+
+def test_cover_is_read_at_the_stored_offset(engine, tmp_path, monkeypatch):
+    path = tagged_file(tmp_path / 'a.mp3', TIT2(encoding=3, text=['Title']),
+                       APIC(encoding=3, mime='image/jpeg', type=3, desc='', data=COVER))
+    file_data = engine.add_file(path, engine.ingest_file(path))
+    ref = file_data['cover_ref']
+    assert (ref['offset'], ref['length']) != (None, None)
+
+    # No tag parse at all: mutagen is never asked for the cover
+    monkeypatch.setattr(mp3_engine, 'read_cover_data', lambda path: pytest.fail("tag parsed"))
+    monkeypatch.setattr(ID3, 'load', lambda *args, **kwargs: pytest.fail("tag parsed"))
+    assert engine.read_cover_bytes(file_data) == COVER
+
+
+def test_stale_offset_falls_back_to_the_tag(engine, tmp_path, monkeypatch):
+    path = tagged_file(tmp_path / 'a.mp3', APIC(encoding=3, mime='image/jpeg', type=3, desc='', data=COVER))
+    file_data = engine.add_file(path, engine.ingest_file(path))
+    # Rewritten by another program: the cover moved
+    tags = ID3(path)
+    tags.add(TIT2(encoding=3, text=['A much longer title than before ' * 20]))
+    tags.save(path, v2_version=3, padding=lambda info: 0)
+    parsed = []
+    read = mp3_engine.read_cover_data
+    monkeypatch.setattr(mp3_engine, 'read_cover_data', lambda path: parsed.append(path) or read(path))
+    assert engine.read_cover_bytes(file_data) == COVER
+    assert parsed == [path]
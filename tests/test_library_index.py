@@ -0,0 +1,38 @@
+import os
+import threading
+import time
+
+from library_index import LibraryIndex
+
+RECORD = {'artist': 'Artist', 'title': 'Title', 'album': 'Album', 'duration': 1.0,
+          'cover_hash': None, 'cover_mime': None, 'cover_offset': None, 'cover_length': None}
+
+
+def test_two_instances_share_the_index(tmp_path):
+    db = str(tmp_path / 'index.sqlite3')
+    first = LibraryIndex(db, timeout=5.0)
+    second = LibraryIndex(db, timeout=5.0)
+    try:
+        # first holds uncommitted rows (and the write lock): second waits instead of failing
+        first.store(os.path.join(str(tmp_path), 'a.mp3'), 1, 10, RECORD)
+        threading.Timer(0.2, first.flush).start()
+        started = time.monotonic()
+        second.store(os.path.join(str(tmp_path), 'b.mp3'), 2, 20, RECORD)
+        second.flush()
+        assert time.monotonic() - started >= 0.1
+        assert first.lookup(os.path.join(str(tmp_path), 'b.mp3'), 2, 20)['title'] == 'Title'
+    finally:
+        first.close()
+        second.close()
+
+
+def test_pending_rows_committed_after_interval(tmp_path):
+    db = str(tmp_path / 'index.sqlite3')
+    index = LibraryIndex(db, commit_every=1000, commit_interval=0.0)
+    other = LibraryIndex(db)
+    try:
+        index.store(os.path.join(str(tmp_path), 'a.mp3'), 1, 10, RECORD)
+        assert other.lookup(os.path.join(str(tmp_path), 'a.mp3'), 1, 10) is not None
+    finally:
+        index.close()
+        other.close()
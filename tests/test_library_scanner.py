@@ -0,0 +1,68 @@
+import os
+import threading
+import time
+
+from library_scanner import TagScanner, iter_mp3_paths
+
+
+def test_keys_are_computed_on_the_workers():
+    caller = threading.get_ident()
+    key_threads = []
+
+    def path_key(path):
+        key_threads.append(threading.get_ident())
+        return path.casefold()
+
+    def read_tags(path):
+        if path == 'B.mp3':
+            raise OSError("unreadable")
+        return {'title': path}
+
+    batches = []
+    stats = TagScanner(read_tags, workers=2, path_key=path_key).run(
+        ['A.mp3', 'B.mp3'], lambda batch, stats: batches.extend(batch))
+    assert batches == [('A.mp3', 'a.mp3', {'title': 'A.mp3'}), ('B.mp3', 'b.mp3', None)]
+    assert stats.errors == 1
+    assert caller not in key_threads
+
+
+def test_batches_come_back_in_path_order():
+    paths = [f"{n:03d}.mp3" for n in range(60)]
+
+    def read_tags(path):
+        # Earlier files take longer: completion order is roughly reversed
+        time.sleep((60 - int(path[:3])) * 0.0005)
+        return {'title': path}
+
+    batches = []
+    TagScanner(read_tags, workers=8, batch_size=7).run(paths, lambda batch, stats: batches.append(batch))
+    assert len(batches) > 1
+    assert [path for batch in batches for path, _, _ in batch] == paths
+
+
+def test_cancel_stops_submitting_work():
+    consumed = []
+
+    def paths():
+        for n in range(10000):
+            consumed.append(n)
+            yield f"{n}.mp3"
+
+    scanner = TagScanner(lambda path: scanner.cancel() or {}, workers=2)
+    stats = scanner.run(paths(), lambda batch, stats: None)
+    assert stats.cancelled
+    # At most one window of reads (workers * 4) was handed out after the cancel
+    assert len(consumed) <= 2 * 4 + 1
+
+
+def test_iter_mp3_paths_walks_like_os_walk(tmp_path):
+    for folder in ('a', 'a/x', 'b', 'c/y/z'):
+        (tmp_path / folder).mkdir(parents=True, exist_ok=True)
+        for name in ('1.mp3', '2.MP3', 'notes.txt'):
+            (tmp_path / folder / name).write_bytes(b'')
+    (tmp_path / 'top.mp3').write_bytes(b'')
+
+    expected = [os.path.join(root, name) for root, _, names in os.walk(str(tmp_path))
+                for name in names if name.lower().endswith('.mp3')]
+    assert list(iter_mp3_paths(str(tmp_path))) == expected
+    assert list(iter_mp3_paths(str(tmp_path), recursive=False)) == [str(tmp_path / 'top.mp3')]
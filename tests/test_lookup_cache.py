@@ -0,0 +1,63 @@
+import threading
+import time
+
+from lookup_cache import LookupCache
+
+
+def test_replacing_a_result_does_not_count_as_new_entry(tmp_path):
+    cache = LookupCache(str(tmp_path / 'lookups.sqlite3'), max_entries=5)
+    try:
+        for n in range(5):
+            cache.put('deezer', f"artist {n}", {'n': n})
+        for n in range(20):
+            cache.put('deezer', "artist 0", {'n': n})
+        # At the cap, not above it: nothing was evicted
+        assert cache._count == 5
+        assert all(cache.get('deezer', f"artist {n}") is not None for n in range(5))
+        assert cache.get('deezer', "artist 0") == {'n': 19}
+    finally:
+        cache.close()
+
+
+def test_eviction_keeps_the_most_recently_used(tmp_path):
+    cache = LookupCache(str(tmp_path / 'lookups.sqlite3'), max_entries=10)
+    try:
+        for n in range(11):
+            cache.put('deezer', f"artist {n}", n)
+        assert cache._count == 9
+        assert cache.get('deezer', "artist 10") == 10
+    finally:
+        cache.close()
+
+
+def test_two_instances_share_the_cache(tmp_path):
+    db = str(tmp_path / 'lookups.sqlite3')
+    first = LookupCache(db, commit_every=1000, timeout=5.0)
+    second = LookupCache(db, commit_every=1, timeout=5.0)
+    try:
+        # first holds an uncommitted row (and the write lock): second waits instead of failing
+        first.put('deezer', "artist a", 'a')
+        threading.Timer(0.2, first.flush).start()
+        started = time.monotonic()
+        second.put('deezer', "artist b", 'b')
+        assert time.monotonic() - started >= 0.1
+        assert first.get('deezer', "artist b") == 'b'
+    finally:
+        first.close()
+        second.close()
+
+
+def test_artist_title_split_is_part_of_the_key(tmp_path):
+    cache = LookupCache(str(tmp_path / 'lookups.sqlite3'))
+    try:
+        cache.put('theaudiodb', "Ana Vitória - Trevo", ['Ana Vitória', 'Trevo'])
+        cache.put_miss('theaudiodb', "Ana - Vitória Trevo")
+        # Same words, different artist/title: different searches
+        assert cache.get('theaudiodb', "Ana - Vitória Trevo") is None
+        assert not cache.is_known_miss('theaudiodb', "Ana Vitória - Trevo")
+        assert not cache.is_known_miss('theaudiodb', "Ana Vitória Trevo")
+        # Case, punctuation and spacing still don't matter
+        assert cache.get('theaudiodb', "ana vitória  -  TREVO!") == ['Ana Vitória', 'Trevo']
+        assert cache.is_known_miss('theaudiodb', "ANA - Vitória, Trevo")
+    finally:
+        cache.close()
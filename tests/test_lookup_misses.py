@@ -0,0 +1,36 @@
+from lookup_cache import LookupCache
+
+
+def with_cache(engine, tmp_path):
+    engine.lookup_cache = LookupCache(str(tmp_path / 'lookups.sqlite3'))
+    return engine.lookup_cache
+
+
+def test_query_never_sent_is_not_a_miss(engine, tmp_path):
+    cache = with_cache(engine, tmp_path)
+    # No artist/title split: TheAudioDB is not asked
+    assert engine.cached_search('theaudiodb', engine.search_theaudiodb, "x") == (None, None)
+    assert not cache.is_known_miss('theaudiodb', "x")
+
+
+def test_source_answering_nothing_is_a_miss(engine, tmp_path):
+    cache = with_cache(engine, tmp_path)
+
+    def search(query):
+        engine.search_sent()
+        return None, None
+
+    engine.cached_search('deezer', search, "artist title")
+    assert cache.is_known_miss('deezer', "artist title")
+
+
+def test_failed_request_is_not_a_miss(engine, tmp_path):
+    cache = with_cache(engine, tmp_path)
+
+    def search(query):
+        engine.search_sent()
+        engine.search_failed()
+        return None, None
+
+    engine.cached_search('deezer', search, "artist title")
+    assert not cache.is_known_miss('deezer', "artist title")
@@ -0,0 +1,25 @@
+import threading
+
+
+def test_finished_lookups_are_applied_while_paused(engine, monkeypatch):
+    started = []
+    applied = []
+    polls = []
+    lock = threading.Lock()
+
+    def process_track(file_data, position, total):
+        with lock:
+            started.append(position)
+        return {'status': 'Found'}, False, None, []
+
+    def is_paused():
+        # Pause once two files are submitted, until both are shown (or give up)
+        polls.append(len(applied))
+        return len(started) >= 2 and len(applied) < 2 and len(polls) < 100
+
+    monkeypatch.setattr(engine, 'process_track', process_track)
+    files = [{'original': f"{n}.mp3"} for n in range(4)]
+    engine.process_files(files, lambda i, *args: applied.append(i), workers=2, is_paused=is_paused)
+
+    assert applied == [0, 1, 2, 3]
+    assert len(polls) < 100  # the pause ended because the results came in
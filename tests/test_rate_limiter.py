@@ -0,0 +1,105 @@
+import pytest
+from requests.adapters import HTTPAdapter
+
+import rate_limiter
+from rate_limiter import AdaptiveLimiter, LimitedAdapter, TokenBucket
+
+
+class FakeTime:
+    """Stands in for the time module: sleep() only moves the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(rate_limiter, 'time', fake)
+    return fake
+
+
+def test_bucket_burst_then_rate(clock):
+    bucket = TokenBucket(rate=4.0, burst=2)
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert bucket.take() == pytest.approx(0.25)
+    assert bucket.take() == pytest.approx(0.5)
+    clock.now += 10
+    assert bucket.take() == 0  # refilled, but never past the burst
+    assert bucket.take() == 0
+    assert bucket.take() > 0
+
+
+def test_set_rate_keeps_the_tokens_earned_at_the_old_rate(clock):
+    bucket = TokenBucket(rate=10.0, burst=10)
+    for _ in range(10):
+        bucket.take()
+    clock.now += 0.5  # 5 tokens at 10/s
+    bucket.set_rate(1.0)
+    assert [bucket.take() for _ in range(5)] == [0, 0, 0, 0, 0]
+    assert bucket.take() == pytest.approx(1.0)
+
+
+def test_throttle_halves_rate_and_concurrency(clock):
+    limiter = AdaptiveLimiter(rate=8.0, burst=10, max_concurrency=8)
+    limiter.on_throttle()
+    assert (limiter.bucket.rate, limiter.concurrency) == (4.0, 4.0)
+    limiter.on_throttle()
+    assert (limiter.bucket.rate, limiter.concurrency) == (2.0, 2.0)
+    assert limiter.throttled == 2
+
+
+def test_throttle_floors(clock):
+    limiter = AdaptiveLimiter(rate=8.0, burst=10, max_concurrency=8)
+    for _ in range(20):
+        limiter.on_throttle()
+    assert limiter.bucket.rate == AdaptiveLimiter.MIN_RATE
+    assert limiter.concurrency == 1.0
+
+
+def test_success_adds_back_up_to_the_configured_limits(clock):
+    limiter = AdaptiveLimiter(rate=8.0, burst=10, max_concurrency=4)
+    limiter.on_throttle()
+    limiter.on_success()
+    assert limiter.bucket.rate == pytest.approx(4.0 + 8.0 * AdaptiveLimiter.RATE_STEP)
+    assert limiter.concurrency == pytest.approx(2.5)  # + 1 / concurrency
+    for _ in range(200):
+        limiter.on_success()
+    assert limiter.bucket.rate == 8.0
+    assert limiter.concurrency == 4
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_adapter_throttles_and_honours_retry_after(clock, monkeypatch, status):
+    limiter = AdaptiveLimiter(rate=8.0, burst=10, max_concurrency=4)
+    adapter = LimitedAdapter(limiter)
+    monkeypatch.setattr(HTTPAdapter, 'send', lambda self, request, **kwargs: Response(status, {'Retry-After': '3'}))
+    adapter.send(None)
+    assert limiter.throttled == 1
+    assert limiter.bucket.rate == 4.0
+
+    monkeypatch.setattr(HTTPAdapter, 'send', lambda self, request, **kwargs: Response(200))
+    adapter.send(None)
+    assert clock.slept and clock.slept[0] >= 3.0  # nothing was sent before Retry-After
+    assert limiter.throttled == 1
+
+
+def test_retry_after_is_capped_and_tolerates_dates():
+    assert rate_limiter._retry_after(Response(429, {'Retry-After': '600'})) == 60.0
+    assert rate_limiter._retry_after(Response(429, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})) == 0.0
+    assert rate_limiter._retry_after(Response(429)) == 0.0
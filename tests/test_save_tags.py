@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+
+import pytest
+from mutagen.id3 import APIC, ID3, ID3NoHeaderError, TALB, TIT2
+from PIL import Image
+
+MPEG_FRAME = b'\xff\xfb\x90\x00' + b'\x00' * 413
+ID3V1 = b'TAG' + b'Old title'.ljust(30, b'\x00') + b'\x00' * 94 + b'\xff'
+
+
+def make_mp3(path, tagged=True, id3v1=False):
+    path.write_bytes(MPEG_FRAME * 50 + (ID3V1 if id3v1 else b''))
+    if tagged:
+        tags = ID3()
+        tags.add(TIT2(encoding=3, text=['Old title']))
+        tags.save(path, v2_version=3, v1=1)
+
+
+def retag(path, cover_size):
+    try:
+        tags = ID3(path)
+    except ID3NoHeaderError:
+        tags = ID3()
+    tags.add(TIT2(encoding=3, text=['New title']))
+    if cover_size:
+        tags.add(APIC(encoding=3, mime='image/jpeg', type=3, desc='Front cover', data=b'\xff' * cover_size))
+    return tags
+
+
+@pytest.mark.parametrize('tagged', [True, False])
+@pytest.mark.parametrize('id3v1', [True, False])
+@pytest.mark.parametrize('cover_size', [0, 300_000])
+def test_save_tags_matches_a_mutagen_save(engine, tmp_path, tagged, id3v1, cover_size):
+    ours, theirs = tmp_path / 'ours.mp3', tmp_path / 'theirs.mp3'
+    make_mp3(ours, tagged, id3v1)
+    make_mp3(theirs, tagged, id3v1)
+
+    engine.save_tags(retag(ours, cover_size), str(ours))
+    retag(theirs, cover_size).save(str(theirs), v2_version=3, padding=engine.tag_padding_for)
+
+    assert ours.read_bytes() == theirs.read_bytes()
+
+
+def test_tag_that_fits_is_saved_in_place(engine, tmp_path):
+    path = tmp_path / 'a.mp3'
+    make_mp3(path)
+    engine.save_tags(retag(path, 300_000), str(path))
+    engine.save_tags(retag(path, 1000), str(path))
+    assert engine.save_stats['rewritten'] == 1
+    assert engine.save_stats['in_place'] == 1
+
+
+def trailing_padding(path):
+    """Zero bytes at the end of the file's ID3v2 tag"""
+    data = path.read_bytes()
+    tag = data[10:10 + ID3(str(path)).size - 10]
+    return len(tag) - len(tag.rstrip(b'\x00'))
+
+
+def test_padding_stat_is_the_free_space_left_in_the_tag(engine, tmp_path, monkeypatch):
+    path = tmp_path / 'a.mp3'
+    make_mp3(path)
+    engine.tag_padding.set(4)
+    engine.save_tags(retag(path, 300_000), str(path))
+    assert engine.save_stats['rewritten'] == 1
+    assert engine.save_stats['padding'] == trailing_padding(path) == 4 * 1024
+
+    # A second edit that fits in the padding doesn't touch the audio
+    monkeypatch.setattr(engine, 'move_audio', lambda *args: pytest.fail("audio moved"))
+    engine.reset_save_stats()
+    before = path.read_bytes()
+    tags = retag(path, 0)
+    tags.add(TALB(encoding=0, text=['An album name']))
+    engine.save_tags(tags, str(path))
+    after = path.read_bytes()
+    audio_start = ID3(str(path)).size
+    assert engine.save_stats['in_place'] == 1
+    assert len(after) == len(before) and after[audio_start:] == before[audio_start:]
+    assert engine.save_stats['padding'] == trailing_padding(path) < 4 * 1024
+
+
+def add_track(engine, path, **tags):
+    make_mp3(path)
+    if tags:
+        id3 = ID3(str(path))
+        for frame in tags.values():
+            id3.add(frame)
+        id3.save(str(path), v2_version=3)
+    file_data = engine.add_file(str(path), engine.ingest_file(str(path)))
+    file_data.update(artist='Artist', title=path.stem, album='Album')
+    return file_data
+
+
+def test_same_cover_is_encoded_once_per_batch(engine, tmp_path, monkeypatch):
+    encoded = []
+    encode = engine.encode_cover_image
+    monkeypatch.setattr(engine, 'encode_cover_image', lambda *args: encoded.append(1) or encode(*args))
+    cover = Image.effect_noise((64, 64), 40).convert('RGB')
+    files = [add_track(engine, tmp_path / f"{n:02d}.mp3") for n in range(6)]
+    for n, file_data in enumerate(files):
+        # Half share the image object, half only have the same pixels
+        file_data['cover'] = cover if n % 2 else cover.copy()
+
+    assert engine.save_files(files) == len(files)
+    assert len(encoded) == 1
+    assert (engine.save_stats['encoded'], engine.save_stats['reused']) == (1, len(files) - 1)
+    datas = {ID3(file_data['path']).getall('APIC')[0].data for file_data in files}
+    assert len(datas) == 1
+
+
+def apic_fields(frame):
+    return frame.encoding, frame.mime, frame.type, frame.desc, frame.data
+
+
+@pytest.mark.parametrize('copy', [False, True])
+def test_untouched_cover_is_kept_byte_for_byte(engine, tmp_path, monkeypatch, copy):
+    monkeypatch.setattr(engine, 'encode_cover_image', lambda *args: pytest.fail("cover re-encoded"))
+    original = APIC(encoding=1, mime='image/png', type=4, desc='Back', data=b'\x89PNG\r\n\x1a\n' + bytes(range(256)) * 8)
+    (tmp_path / 'in').mkdir()
+    (tmp_path / 'out').mkdir()
+    file_data = add_track(engine, tmp_path / 'in' / 'a.mp3', apic=original)
+    assert file_data['cover'] is None and file_data['cover_ref']
+
+    assert engine.save_files([file_data], str(tmp_path / 'out') if copy else None) == 1
+    tags = ID3(file_data['path'])
+    assert tags['TIT2'].text == ['a']  # the tag was rewritten...
+    # ...but the picture frame is the same, field for field
+    assert [apic_fields(apic) for apic in tags.getall('APIC')] == [apic_fields(original)]
+
+
+def test_saving_again_keeps_the_cover_written_before(engine, tmp_path, monkeypatch):
+    encoded = []
+    encode = engine.encode_cover_image
+    monkeypatch.setattr(engine, 'encode_cover_image', lambda *args: encoded.append(1) or encode(*args))
+    file_data = add_track(engine, tmp_path / 'a.mp3')
+    file_data['cover'] = Image.effect_noise((64, 64), 40).convert('RGB')
+    engine.save_files([file_data])
+    [written] = ID3(file_data['path']).getall('APIC')
+
+    file_data['title'] = 'Edited'
+    engine.save_files([file_data])
+    tags = ID3(file_data['path'])
+    assert tags['TIT2'].text == ['Edited']
+    assert [apic_fields(apic) for apic in tags.getall('APIC')] == [apic_fields(written)]
+    assert len(encoded) == 1
+
+
+def entry(path):
+    name = os.path.basename(path)
+    return {'path': path, 'path_key': path, 'original': name, 'new': os.path.splitext(name)[0]}
+
+
+def test_partitions_keep_each_folder_in_order(engine, tmp_path):
+    a, b = str(tmp_path / 'a'), str(tmp_path / 'b')
+    files = [entry(os.path.join(a, '1.mp3')), entry(os.path.join(b, '1.mp3')),
+             entry(os.path.join(a, '2.mp3')), entry(os.path.join(b, '2.mp3')), entry(os.path.join(a, '3.mp3'))]
+    partitions = sorted([i for i, _ in partition] for partition in engine.save_partitions(files))
+    assert partitions == [[0, 2, 4], [1, 3]]
+
+    # Copies: only files with the same target name depend on each other
+    dest = str(tmp_path / 'out')
+    partitions = sorted([i for i, _ in partition] for partition in engine.save_partitions(files, dest))
+    assert partitions == [[0, 1], [2, 3], [4]]
+    # ...unless the destination holds files being saved: then it is one list
+    assert len(engine.save_partitions(files, a)) == 1
+
+
+def test_folders_are_saved_in_parallel_each_in_order(engine, tmp_path, monkeypatch):
+    engine.configure_save_workers({'local': 4, 'removable': 4, 'network': 4})
+    folders = [str(tmp_path / name) for name in 'abc']
+    files = [entry(os.path.join(folder, f"{n}.mp3")) for n in range(4) for folder in folders]
+    first_files = threading.Barrier(len(folders), timeout=5)
+    lock = threading.Lock()
+    saved, active = {}, {}
+
+    def save_file(file_data, destination=None):
+        folder = os.path.dirname(file_data['path'])
+        with lock:
+            active[folder] = active.get(folder, 0) + 1
+            assert active[folder] == 1, "two files of one folder saved at once"
+            saved.setdefault(folder, []).append(file_data['original'])
+        if len(saved[folder]) == 1:
+            # Every folder's first file must be in progress at the same time
+            first_files.wait()
+        time.sleep(0.001)
+        with lock:
+            active[folder] -= 1
+        return True
+
+    monkeypatch.setattr(engine, 'save_file', save_file)
+    reported = []
+    assert engine.save_files(files, on_saved=lambda i, file_data, ok, error: reported.append(error)) == len(files)
+    assert reported == [None] * len(files)
+    assert saved == {folder: [f"{n}.mp3" for n in range(4)] for folder in folders}
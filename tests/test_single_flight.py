@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+CALLERS = 8
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_concurrently(flight, fn):
+    """CALLERS threads call flight.do('key', fn); fn runs once all but the owner wait"""
+    results = []
+    release = threading.Event()
+
+    def owner_fn():
+        release.wait(5)
+        return fn()
+
+    def call():
+        try:
+            results.append(('ok', flight.do('key', owner_fn)))
+        except Exception as e:
+            results.append(('error', e))
+
+    threads = [threading.Thread(target=call) for _ in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: flight.coalesced == CALLERS - 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_same_key_runs_once_and_shares_the_result():
+    flight = SingleFlight()
+    runs = []
+    result = object()
+    results = run_concurrently(flight, lambda: runs.append(1) or result)
+    assert runs == [1]
+    assert results == [('ok', result)] * CALLERS
+    assert (flight.calls, flight.coalesced) == (1, CALLERS - 1)
+
+
+def test_exception_reaches_every_waiter_and_is_not_kept():
+    flight = SingleFlight()
+    error = RuntimeError("source down")
+
+    def fail():
+        raise error
+
+    results = run_concurrently(flight, fail)
+    assert results == [('error', error)] * CALLERS
+    # The key was released: the next call runs again
+    assert flight.do('key', lambda: 'fresh') == 'fresh'
+    assert flight.calls == 2
+
+
+def test_key_is_released_after_the_call():
+    flight = SingleFlight()
+    assert flight.do('key', lambda: 1) == 1
+    assert flight.do('key', lambda: 2) == 2
+    assert flight.calls == 2 and flight.coalesced == 0
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight()
+    inner = []
+    # A call for another key made while 'a' is in flight runs on its own
+    assert flight.do('a', lambda: flight.do('b', lambda: inner.append('b') or 'b')) == 'b'
+    assert inner == ['b']
+    with pytest.raises(KeyError):
+        flight.do('c', lambda: {}['missing'])
+    assert flight.do('c', lambda: 'c') == 'c'
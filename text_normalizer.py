@@ -0,0 +1,178 @@
+"""
+MP3 Album Tool - Text normalizer
+Memoized name/artist/album normalization, one file or a whole batch at a time
+"""
+
+import os
+import re
+from functools import lru_cache
+
+from unidecode import unidecode
+
+from filename_cleaner import clean_filename as _clean_filename
+
+# One entry per file name of a large library; artists and albums repeat a lot more
+NAME_CACHE_SIZE = 1 << 17
+WORD_CACHE_SIZE = 1 << 14
+
+_SPACES = re.compile(r'\s+')
+_ALBUM_SYMBOLS = re.compile(r'[^\w\s-]')
+_ALBUM_SUFFIXES = [re.compile(suffix, re.IGNORECASE) for suffix in (
+    r'\s*-\s*\d{4}$',  # Remove " - 2024"
+    r'\s*\(\d{4}\)$',  # Remove " (2024)"
+    r'\s*\[\d{4}\]$',  # Remove " [2024]"
+    r'\s*-\s*deluxe.*$',  # Remove " - deluxe edition"
+    r'\s*-\s*extended.*$',  # Remove " - extended"
+    r'\s*-\s*remaster.*$',  # Remove " - remastered"
+    r'\s*-\s*special.*$',  # Remove " - special edition"
+)]
+
+# Caracteres proibidos no Windows (e /) e seus substitutos seguros
+_FORBIDDEN_CHARS = str.maketrans({
+    '<': '(',
+    '>': ')',
+    ':': ' -',
+    '"': "'",
+    '|': '-',
+    '?': '',
+    '*': '',
+    '\\': '-',
+    '/': '-'
+})
+
+_ARTIST_TITLE_SEPARATORS = [" - ", " – ", " — ", " _ ", " by ", " BY "]
+
+_SMALL_WORDS = {
+    'de', 'do', 'da', 'dos', 'das', 'e', 'ou', 'com',
+    'sem', 'para', 'por', 'em', 'no', 'na', 'um', 'uma',
+    'o', 'a', 'os', 'as'
+}
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def clean_filename(name: str) -> str:
+    """filename_cleaner.clean_filename, memoized"""
+    return _clean_filename(name)
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def sanitize_filename(name: str) -> str:
+    """Remove caracteres especiais que causam problemas no Windows"""
+    if not name:
+        return name
+    sanitized = _SPACES.sub(' ', name.translate(_FORBIDDEN_CHARS)).strip()
+    # Remover pontos no final (problemático no Windows)
+    sanitized = sanitized.rstrip('.')
+    # Garantir que não está vazio
+    if not sanitized.strip():
+        sanitized = "arquivo_sem_nome"
+    return sanitized
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def extract_artist_title(name: str):
+    """Extrai (artista, título) do nome do arquivo, ou (None, None)"""
+    for sep in _ARTIST_TITLE_SEPARATORS:
+        if sep in name:
+            artist, title = name.split(sep, 1)
+            artist, title = artist.strip(), title.strip()
+            if len(artist) >= 2 and len(title) >= 2:
+                return artist, title
+
+    # Se não encontrou separador, tentar dividir no meio
+    words = name.split()
+    if len(words) >= 4:
+        mid = len(words) // 2
+        return ' '.join(words[:mid]), ' '.join(words[mid:])
+    return None, None
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def smart_capitalize(text: str) -> str:
+    """Capitalização inteligente (preposições em minúsculas, siglas mantidas)"""
+    if not text:
+        return text
+    words = text.split(' ')
+    for i, word in enumerate(words):
+        if word:
+            if i == 0 or word.lower() not in _SMALL_WORDS:
+                # Manter siglas (todas maiúsculas)
+                if not word.isupper():
+                    words[i] = word[0].upper() + word[1:].lower()
+            else:
+                words[i] = word.lower()
+    return ' '.join(words)
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def normalize_album_name(album_name: str) -> str:
+    """Normaliza nome do álbum removendo variações desnecessárias"""
+    if not album_name:
+        return ""
+    normalized = _SPACES.sub(' ', _ALBUM_SYMBOLS.sub('', album_name)).strip()
+    for suffix in _ALBUM_SUFFIXES:
+        normalized = suffix.sub('', normalized)
+    return normalized.strip()
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def transliterate(text: str) -> str:
+    """Translitera apenas se contém caracteres não-ASCII"""
+    if not text:
+        return ""
+    if text.isascii():
+        return text.strip()
+    return unidecode(text).strip()
+
+
+def normalize_names(names, albums=None, capitalize: bool = True):
+    """Every field derived from a list of file names, in one call.
+
+    Returns one dict per name: 'clean' (cleaned name without extension),
+    'artist' and 'title' (None if the name doesn't split), 'new' (the
+    "Artist - Title" name, or the cleaned name) and 'filename' (``new``
+    safe for Windows). With ``albums`` (one per name), 'album' holds the
+    normalized album name.
+    """
+    results = []
+    for i, name in enumerate(names):
+        clean = clean_filename(os.path.splitext(name)[0])
+        artist, title = extract_artist_title(clean)
+        if artist and title:
+            if capitalize:
+                artist, title = smart_capitalize(artist), smart_capitalize(title)
+            new = f"{artist} - {title}"
+        else:
+            new = clean
+        entry = {'clean': clean, 'artist': artist, 'title': title,
+                 'new': new, 'filename': sanitize_filename(new)}
+        if albums is not None:
+            entry['album'] = normalize_album_name(albums[i])
+        results.append(entry)
+    return results
+
+
+_CACHED = {
+    'clean': clean_filename,
+    'sanitize': sanitize_filename,
+    'artist_title': extract_artist_title,
+    'capitalize': smart_capitalize,
+    'album': normalize_album_name,
+    'transliterate': transliterate,
+}
+
+
+def cache_stats():
+    """{function: {'hits', 'misses', 'size', 'hit_rate'}} since start (or clear_caches())"""
+    stats = {}
+    for name, func in _CACHED.items():
+        info = func.cache_info()
+        calls = info.hits + info.misses
+        stats[name] = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize,
+                       'hit_rate': info.hits / calls if calls else 0.0}
+    return stats
+
+
+def clear_caches():
+    for func in _CACHED.values():
+        func.cache_clear()
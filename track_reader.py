@@ -0,0 +1,88 @@
+"""
+MP3 Album Tool - Track reader
+Single-pass ingest: text frames, embedded cover and audio info in one parse
+"""
+
+import hashlib
+import struct
+
+from mutagen.id3 import ID3, APIC
+from mutagen.mp3 import MP3
+
+from id3_reader import ID3Malformed, read_id3_fast
+
+
+def _first_text(tags, frame_id: str) -> str:
+    if frame_id in tags:
+        return str(tags[frame_id][0]).strip()
+    return ''
+
+
+def _first_apic(tags):
+    for frame in tags.values():
+        if isinstance(frame, APIC):
+            return frame
+    return None
+
+
+def read_track_info(path: str) -> dict:
+    """Read track info from the ID3 tag alone, falling back to mutagen.
+
+    The fast path leaves duration/bitrate/sample_rate as None; the full
+    parser is only used when the tag is malformed or uses features the
+    header-only reader doesn't support.
+    """
+    try:
+        return read_id3_fast(path)
+    except (ID3Malformed, struct.error):
+        return read_track_info_full(path)
+
+
+def read_track_info_full(path: str) -> dict:
+    """Open an MP3 once and return everything the file list needs.
+
+    Besides the fields kept in the library index (artist, title, album,
+    duration, cover_hash) the record carries the raw cover bytes and MIME
+    type, so callers don't have to parse the file a second time for APIC.
+    """
+    audio = MP3(path, ID3=ID3)
+    info = audio.info
+    record = {
+        'artist': '',
+        'title': '',
+        'album': '',
+        'track': '',
+        'duration': info.length if info else 0.0,
+        'bitrate': info.bitrate if info else 0,
+        'sample_rate': info.sample_rate if info else 0,
+        'cover_hash': None,
+        'cover_data': None,
+        'cover_mime': None,
+        'cover_offset': None,
+        'cover_length': None,
+    }
+
+    tags = audio.tags
+    if tags:
+        record['artist'] = _first_text(tags, 'TPE1')
+        record['title'] = _first_text(tags, 'TIT2')
+        record['album'] = _first_text(tags, 'TALB')
+        record['track'] = _first_text(tags, 'TRCK')
+        apic = _first_apic(tags)
+        if apic is not None:
+            record['cover_hash'] = hashlib.sha1(apic.data).hexdigest()
+            record['cover_data'] = apic.data
+            record['cover_mime'] = apic.mime
+    return record
+
+
+def read_cover_data(path: str):
+    """Return (bytes, mime) of the first embedded cover, or (None, None).
+
+    Only the ID3 tag is parsed; used when track info came from the index.
+    """
+    tags = ID3(path)
+    apic = _first_apic(tags)
+    if apic is None:
+        return None, None
+    return apic.data, apic.mime
@@ -0,0 +1,193 @@
+"""
+MP3 Album Tool - Virtual tree view
+Shows a window of a large row list in a ttk.Treeview, reusing a fixed set
+of items instead of inserting one item per row.
+"""
+
+from tkinter import ttk
+
+
+class VirtualTreeview:
+    """Virtualized row list on top of an existing ttk.Treeview.
+
+    Only the visible rows plus ``overscan`` extra rows below them exist as
+    Treeview items; scrolling re-fills those items from the model through
+    ``row_values(index)`` and ``row_image(index)``. ``on_render(start, end)``
+    is called after each render with the materialized index range.
+    """
+
+    SCROLL_KEYS = ('<Up>', '<Down>', '<Prior>', '<Next>', '<Home>', '<End>')
+
+    def __init__(self, tree, scrollbar, row_count, row_values, row_image=None,
+                 overscan: int = 2, on_render=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_count = row_count
+        self.row_values = row_values
+        self.row_image = row_image
+        self.overscan = overscan
+        self.on_render = on_render
+
+        self.top = 0
+        self.visible = 1
+        self.selected = None
+        self.slots = []       # Treeview item ids, top to bottom
+        self.slot_rows = {}   # item id -> model index currently shown
+
+        style = ttk.Style()
+        self.row_height = int(style.lookup(tree.cget('style') or 'Treeview', 'rowheight') or 20)
+
+        scrollbar.configure(command=self.on_scrollbar)
+        tree.configure(yscrollcommand=lambda first, last: None)
+        tree.bind('<Configure>', self.on_configure, add='+')
+        tree.bind('<<TreeviewSelect>>', self.on_select, add='+')
+        tree.bind('<MouseWheel>', self.on_mousewheel)
+        tree.bind('<Button-4>', lambda e: self.scroll_rows(-1) or 'break')
+        tree.bind('<Button-5>', lambda e: self.scroll_rows(1) or 'break')
+        for key in self.SCROLL_KEYS:
+            tree.bind(key, self.on_key)
+
+    # Model <-> view mapping
+
+    def index_of(self, item):
+        """Model index shown by a Treeview item (None if it isn't a row)"""
+        return self.slot_rows.get(item)
+
+    def selected_index(self):
+        return self.selected
+
+    def materialized_range(self):
+        """(start, end) of the model rows that currently have items"""
+        start = self.top
+        return start, min(start + len(self.slots), self.row_count())
+
+    # Rendering
+
+    def reset(self):
+        """Scroll back to the top and clear the selection (new model)"""
+        self.top = 0
+        self.selected = None
+        self.render()
+
+    def refresh(self):
+        """Re-render after the model changed (rows added, removed or sorted)"""
+        total = self.row_count()
+        if self.selected is not None and self.selected >= total:
+            self.selected = None
+        self.top = self._clamp(self.top)
+        self.render()
+
+    def update_row(self, index):
+        """Re-render one row if it is materialized; O(1)"""
+        offset = index - self.top
+        if 0 <= offset < len(self.slots) and index < self.row_count():
+            self._fill(self.slots[offset], index)
+
+    def scroll_to(self, index):
+        """Scroll so that index is visible"""
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.visible:
+            self.top = index - self.visible + 1
+        self.top = self._clamp(self.top)
+        self.render()
+
+    def render(self):
+        total = self.row_count()
+        wanted = min(self.visible + self.overscan, max(total - self.top, 0))
+
+        while len(self.slots) < wanted:
+            self.slots.append(self.tree.insert('', 'end'))
+        while len(self.slots) > wanted:
+            item = self.slots.pop()
+            self.slot_rows.pop(item, None)
+            self.tree.delete(item)
+
+        selected_item = None
+        for offset, item in enumerate(self.slots):
+            index = self.top + offset
+            self._fill(item, index)
+            if index == self.selected:
+                selected_item = item
+
+        # Keep the Treeview's own scrolling pinned; we scroll by re-filling
+        self.tree.yview_moveto(0)
+        current = self.tree.selection()
+        if selected_item:
+            if current != (selected_item,):
+                self.tree.selection_set(selected_item)
+        elif current:
+            self.tree.selection_remove(*current)
+
+        if total:
+            self.scrollbar.set(self.top / total, min(self.top + self.visible, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+        if self.on_render:
+            self.on_render(*self.materialized_range())
+
+    def _fill(self, item, index):
+        self.slot_rows[item] = index
+        image = self.row_image(index) if self.row_image else ''
+        self.tree.item(item, values=self.row_values(index), image=image or '')
+
+    def _clamp(self, top):
+        total = self.row_count()
+        return max(0, min(top, total - self.visible))
+
+    # Events
+
+    def on_configure(self, event):
+        heading = 30 if 'headings' in str(self.tree.cget('show')) else 0
+        visible = max(1, (event.height - heading) // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
+
+    def on_select(self, event):
+        items = self.tree.selection()
+        if items and items[0] in self.slot_rows:
+            self.selected = self.slot_rows[items[0]]
+
+    def on_scrollbar(self, *args):
+        total = self.row_count()
+        if args[0] == 'moveto':
+            top = int(float(args[1]) * total)
+        elif args[2] == 'pages':
+            top = self.top + int(args[1]) * self.visible
+        else:
+            top = self.top + int(args[1])
+        top = self._clamp(top)
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def on_mousewheel(self, event):
+        if event.delta:
+            steps = -event.delta // 120 if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1)
+            self.scroll_rows(steps)
+        return 'break'
+
+    def scroll_rows(self, rows):
+        self.on_scrollbar('scroll', rows, 'units')
+
+    def on_key(self, event):
+        total = self.row_count()
+        if not total:
+            return 'break'
+        current = self.selected if self.selected is not None else self.top
+        moves = {
+            'Up': current - 1,
+            'Down': current + 1,
+            'Prior': current - self.visible,
+            'Next': current + self.visible,
+            'Home': 0,
+            'End': total - 1,
+        }
+        index = max(0, min(moves.get(event.keysym, current), total - 1))
+        self.selected = index
+        self.scroll_to(index)
+        self.tree.focus(self.slots[index - self.top])
+        self.tree.event_generate('<<TreeviewSelect>>')
+        return 'break'